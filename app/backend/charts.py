@@ -9,6 +9,7 @@ import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 
 from app.backend.grade_monitor import GradeMonitor
+from app.backend.theme import GRADE_PIE_COLORS, chart_colors
 
 matplotlib.rcParams["toolbar"] = "none"
 
@@ -27,9 +28,7 @@ class StatisticsManager:
         Method that calculates the average subject grade
         :return: Dictionary containing subject and the average subject grade
         """
-        subjects_averages: dict[str, float] = {
-            grade.name: self.monitor.calculate_subject_average(grade.name) for grade in self.monitor.subject_table
-        }
+        subjects_averages: dict[str, float] = self.monitor.subjects_averages()
         subjects_averages["All subjects"] = self.monitor.calculate_total_grade_average()
 
         return subjects_averages
@@ -51,12 +50,9 @@ def _configure_theme(theme: str) -> tuple[str, str]:
     :param theme: 'light' or 'dark'
     :return: Tuple containing colors
     """
-    if theme == "dark":
-        plt.rcParams["axes.facecolor"] = "#242424"
-        return "white", "white"
-    else:
-        plt.rcParams["axes.facecolor"] = "white"
-        return "black", "black"
+    background, text = chart_colors(theme)
+    plt.rcParams["axes.facecolor"] = background
+    return text, text
 
 
 def _setup_axes(ax: plt.Axes, color: str) -> None:
@@ -112,8 +108,6 @@ def all_grades_pie_plot(grades: dict[float, int], theme: str) -> Figure:
     :param theme: 'light' or 'dark'
     :return: Figure that can be displayed in application GUI
     """
-    colors: list[str] = ["seagreen", "darkgreen", "green", "forestgreen", "limegreen", "lime"]
-
     values = list(grades.values())
 
     color = _configure_theme(theme)[1]
@@ -132,7 +126,7 @@ def all_grades_pie_plot(grades: dict[float, int], theme: str) -> Figure:
         labels=[str(k) for k in grades.keys()],
         autopct=make_autopct(values),
         startangle=90,
-        colors=colors,
+        colors=GRADE_PIE_COLORS,
         textprops=dict(color=color),
     )
 
@@ -1,17 +1,21 @@
+import concurrent.futures
 import json
+import queue
+import sqlite3
 import threading
-import time
+from collections import deque
 import asyncio
 import websockets
 
 from app.backend.session import Session
 
 
-def make_payload(recipient: str, msg: str) -> bytes:
+def make_payload(recipient: str, msg: str, **fields) -> bytes:
     """
     Function to create a payload for a message
     :param recipient: recipient of the message
     :param msg: message to be sent
+    :param fields: additional fields of control messages
     :return: bytes
     """
     return json.dumps(
@@ -20,40 +24,86 @@ def make_payload(recipient: str, msg: str) -> bytes:
             "sender": Session.uuid,
             "recipient": recipient,
             "msg": msg,
+            **fields,
         }
     ).encode("utf-8")
 
 
-async def send(recipient: str, msg: str):
+class Client:
     """
-    Function to send a message
-    :param recipient: recipient of the message
-    :param msg: message to be sent
-    :return: None
+    Chat client class. Manages all client process.
+    All networking runs on one event loop in a dedicated thread, which keeps a single
+    connection open for both receiving and sending messages.
     """
-    async with websockets.connect("ws://localhost:6789") as ws:
-        await ws.send(make_payload(recipient, msg))
 
+    url = "ws://localhost:6789"
+    ui_queue: queue.SimpleQueue | None = None
+    queue_size = 10_000
+    msg_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    thread: threading.Thread | None = None
+    stop_event = threading.Event()
+    min_reconnect_delay = 0.5
+    max_reconnect_delay = 30.0
+    send_timeout = 10.0
+    connected_once = False
+    last_seq = 0
+    loop: asyncio.AbstractEventLoop | None = None
+    connection: websockets.ClientConnection | None = None
+    connected = asyncio.Event()
+    stopping = asyncio.Event()
+    message_fields = ("name", "sender", "recipient", "msg")
 
-class Client:
-    """
-    Chat client class. Manages all client process
-    """
+    @staticmethod
+    def start() -> None:
+        """
+        Function to start the client thread and its event loop, does nothing when it already runs
+        :return: None
+        """
+        if Client.thread is not None and Client.thread.is_alive():
+            return
+        Client.stop_event.clear()
+        Client.connected = asyncio.Event()
+        Client.stopping = asyncio.Event()
+        Client.loop = asyncio.new_event_loop()
+        Client.thread = threading.Thread(target=Client.run, args=(Client.loop,), daemon=True)
+        Client.thread.start()
 
     @staticmethod
-    def run() -> None:
+    def run(loop: asyncio.AbstractEventLoop) -> None:
         """
-        Function to run client listener
+        Function to run the client event loop until the client is stopped
+        :param loop: event loop owned by the client thread
         :return: None
         """
-        while not Client.stop_event.is_set():
-            time.sleep(1)
-            asyncio.run(Client.receive())
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(Client.main())
+        finally:
+            loop.close()
+            if Client.loop is loop:
+                Client.loop = None
 
-    chat_display = None
-    msg_queue: asyncio.queues.Queue = asyncio.Queue()
-    thread = threading.Thread(target=run, daemon=True)
-    stop_event = threading.Event()
+    @staticmethod
+    async def main() -> None:
+        """
+        Function to keep the connection open, reconnecting with exponential backoff
+        when the server is not reachable
+        :return: None
+        """
+        delay = Client.min_reconnect_delay
+        while not Client.stop_event.is_set():
+            try:
+                await Client.receive()
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+                pass
+            if Client.connected_once:
+                Client.connected_once = False
+                delay = Client.min_reconnect_delay
+            try:
+                await asyncio.wait_for(Client.stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, Client.max_reconnect_delay)
 
     @staticmethod
     def stop() -> None:
@@ -62,48 +112,225 @@ class Client:
         :return: None
         """
         Client.stop_event.set()
-        if Client.thread.is_alive():
+        loop = Client.loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(Client._shutdown)
+            except RuntimeError:
+                pass
+        if Client.thread is not None and Client.thread.is_alive():
             Client.thread.join()
 
     @staticmethod
-    async def listen(ws) -> dict | None:
+    def _shutdown() -> None:
         """
-        Function to listen for messages
-        :param ws: websocket object
-        :return: dict | None
+        Function run on the client loop to wake it up and close the connection
+        :return: None
+        """
+        Client.stopping.set()
+        if Client.connection is not None:
+            asyncio.ensure_future(Client.connection.close())
+
+    @staticmethod
+    def send(recipient: str, msg: str) -> concurrent.futures.Future:
+        """
+        Function to send a message over the client connection without blocking the calling thread
+        :param recipient: recipient of the message
+        :param msg: message to be sent
+        :return: future completed when the message is sent
         """
-        async for msg in ws:
-            return json.loads(msg)
-        return None
+        Client.start()
+        loop = Client.loop
+        if loop is None:
+            raise RuntimeError("Chat client is not running")
+        future = asyncio.run_coroutine_threadsafe(Client.send_async(recipient, msg), loop)
+        future.add_done_callback(Client._report_send_error)
+        return future
 
     @staticmethod
-    def send(recipient: str, msg: str) -> None:
+    async def send_async(recipient: str, msg: str) -> None:
         """
-        Wrapper for send function
+        Function to send a message, waiting up to send_timeout for the connection
         :param recipient: recipient of the message
-        :param msg:  to be sent
+        :param msg: message to be sent
+        :return: None
+        """
+        await asyncio.wait_for(Client.connected.wait(), Client.send_timeout)
+        if Client.connection is None:
+            raise ConnectionError("Chat connection is closed")
+        await Client.connection.send(make_payload(recipient, msg))
+
+    @staticmethod
+    def _report_send_error(future: concurrent.futures.Future) -> None:
+        """
+        Function to print why sending a message failed
+        :param future: future of the sent message
         :return: None
         """
-        asyncio.run(send(recipient, msg))
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Message could not be sent: {future.exception()!r}")
+
+    @staticmethod
+    def parse_batch(frame: str | bytes) -> list[dict]:
+        """
+        Function to decode a batch pushed by the server, malformed frames and messages are reported and skipped
+        so a single bad payload does not stop the client
+        :param frame: websocket frame with a JSON list of messages
+        :return: list of well-formed messages
+        """
+        try:
+            results = json.loads(frame)
+        except ValueError as e:
+            print(f"Skipping malformed chat frame: {e}")
+            return []
+        if not isinstance(results, list):
+            print("Skipping chat frame which is not a list of messages")
+            return []
+
+        messages = []
+        for result in results:
+            if (
+                isinstance(result, dict)
+                and all(isinstance(result.get(field), str) for field in Client.message_fields)
+                and isinstance(result.get("seq", 0), int)
+            ):
+                messages.append(result)
+            else:
+                print(f"Skipping malformed chat message: {result!r}")
+        return messages
 
     @staticmethod
     async def receive() -> None:
         """
-        Function to receive a message
+        Function to subscribe for messages and receive batches pushed by the server
+        until the connection is closed
+        :return: None
+        """
+        async with websockets.connect(Client.url) as ws:
+            Client.connection = ws
+            try:
+                await ws.send(make_payload("-1", "subscribe", after=Client.last_seq))
+                Client.connected_once = True
+                Client.connected.set()
+                async for batch in ws:
+                    results = Client.parse_batch(batch)
+                    for result in results:
+                        seq = result.get("seq", 0)
+                        if seq and seq <= Client.last_seq:
+                            continue
+                        Client.last_seq = max(Client.last_seq, seq)
+                        try:
+                            Client.msg_queue.put_nowait(result)
+                        except queue.Full:
+                            await asyncio.to_thread(Client.msg_queue.put, result)
+                        if Client.ui_queue is not None:
+                            Client.ui_queue.put(result)
+                    if results and results[-1].get("seq"):
+                        await ws.send(make_payload("-1", "ack", seq=Client.last_seq))
+            except websockets.exceptions.ConnectionClosed:
+                pass
+            finally:
+                Client.connected.clear()
+                Client.connection = None
+
+
+class MessageLog:
+    """
+    Append-only SQLite log of messages passing through the server. Every message gets a sequence number,
+    recipients catch up by reading everything after the last sequence number they have seen.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS message_log (
+                    "seq"	INTEGER PRIMARY KEY AUTOINCREMENT,
+                    "recipient"	TEXT NOT NULL,
+                    "payload"	TEXT NOT NULL
+                )
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_message_log_recipient_seq ON message_log (recipient, seq)"
+            )
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS delivery_cursors (
+                    "recipient"	TEXT PRIMARY KEY,
+                    "seq"	INTEGER NOT NULL
+                )
+                """
+            )
+
+    def append(self, recipient: str, message: dict) -> int:
+        """
+        Function to store a message and give it a sequence number
+        :param recipient: uuid of the recipient
+        :param message: message to store, its "seq" key is set to the sequence number
+        :return: sequence number of the message
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO message_log (recipient, payload) VALUES (?, ?)", (recipient, json.dumps(message))
+            )
+        seq = cursor.lastrowid or 0
+        message["seq"] = seq
+        return seq
+
+    def read_after(self, recipient: str, seq: int, limit: int = -1) -> list[dict]:
+        """
+        Function to read messages of a recipient stored after a sequence number
+        :param recipient: uuid of the recipient
+        :param seq: last sequence number already seen by the recipient
+        :param limit: maximal number of messages, -1 for no limit
+        :return: list of messages in sequence order
+        """
+        rows = self.connection.execute(
+            "SELECT seq, payload FROM message_log WHERE recipient = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (recipient, seq, limit),
+        ).fetchall()
+        messages = []
+        for row_seq, payload in rows:
+            message = json.loads(payload)
+            message["seq"] = row_seq
+            messages.append(message)
+        return messages
+
+    def cursor(self, recipient: str) -> int:
+        """
+        Function to get the last sequence number acknowledged by a recipient
+        :param recipient: uuid of the recipient
+        :return: sequence number, 0 if nothing was acknowledged
+        """
+        row = self.connection.execute("SELECT seq FROM delivery_cursors WHERE recipient = ?", (recipient,)).fetchone()
+        return row[0] if row else 0
+
+    def ack(self, recipient: str, seq: int) -> None:
+        """
+        Function to move the delivery cursor of a recipient forward
+        :param recipient: uuid of the recipient
+        :param seq: last sequence number received by the recipient
         :return: None
         """
-        async with websockets.connect("ws://localhost:6789") as ws:
-            while not Client.stop_event.is_set():
-                await ws.send(make_payload("-1", "check"))
-                result = await asyncio.wait_for(Client.listen(ws), timeout=1.0)
-                if result and result["msg"] != "none":
-                    await Client.msg_queue.put(result)
-                if Client.chat_display is not None and result["msg"] != "none":
-                    Client.chat_display.configure(state="normal")
-                    Client.chat_display.insert("end", f"{result["name"]}: {result["msg"]}\n")
-                    Client.chat_display.configure(state="disabled")
-                if result and result["msg"] == "none":
-                    break
+        with self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO delivery_cursors (recipient, seq) VALUES (?, ?)
+                ON CONFLICT(recipient) DO UPDATE SET seq = MAX(seq, excluded.seq)
+                """,
+                (recipient, seq),
+            )
+
+    def close(self) -> None:
+        """
+        Function to close the log
+        :return: None
+        """
+        self.connection.close()
 
 
 class Server:
@@ -120,58 +347,156 @@ class Server:
             Server.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(Server.loop)
             Server.stop_event = asyncio.Event()
+            Server.message_log = MessageLog(Server.log_path) if Server.log_path else None
             Server.loop.run_until_complete(Server.main())
         except OSError as e:
             if e.errno != 98:
                 raise
+        finally:
+            if Server.message_log is not None:
+                Server.message_log.close()
+                Server.message_log = None
 
+    host = "localhost"
+    port = 6789
+    loop: asyncio.AbstractEventLoop | None = None
+    log_path: str | None = "./app/database/server.sqlite3"
+    message_log: MessageLog | None = None
     clients: set = set()
-    messages: list = []
-    thread = threading.Thread(target=run, daemon=True)
+    subscribers: dict = {}
+    mailboxes: dict[str, deque] = {}
+    mailbox_size = 10_000
+    batch_size = 500
+    dropped_messages = 0
+    thread: threading.Thread | None = None
     stop_event = asyncio.Event()
 
+    @staticmethod
+    def start() -> None:
+        """
+        Function to start the server thread, does nothing when it already runs
+        :return: None
+        """
+        if Server.thread is not None and Server.thread.is_alive():
+            return
+        Server.thread = threading.Thread(target=Server.run, daemon=True)
+        Server.thread.start()
+
     @staticmethod
     def stop() -> None:
         """
         Function to stop the server
         :return: None
         """
-        Server.stop_event.set()
+        if Server.loop is not None and Server.loop.is_running():
+            Server.loop.call_soon_threadsafe(Server.stop_event.set)
+        else:
+            Server.stop_event.set()
 
     @staticmethod
     async def handle(ws) -> None:
         """
-        Function to process incoming messages and replies
+        Function to process incoming messages. Messages are pushed to subscribed recipients
+        right away and queued for the others until they subscribe.
         :param ws: websocket object
         :return: None
         """
         Server.clients.add(ws)
+        subscribed_as = None
         try:
             async for msg in ws:
                 data = json.loads(msg)
-                if data["msg"] != "check":
-                    result = [row for row in Server.messages if row[0] == data["recipient"]] or None
-                    if result:
-                        result[0][1].append(data)
-                    else:
-                        Server.messages.append([data["recipient"], [data]])
-                elif data["msg"] == "check":
-                    result = [row for row in Server.messages if row[0] == data["sender"]] or None
-                    if result and len(result[0][1]):
-                        message = result[0][1].pop(0)
-                        await asyncio.wait_for(ws.send(json.dumps(message).encode("utf-8")), timeout=1.0)
-                    else:
-                        new_msg = {
-                            "name": "srwr",
-                            "sender": -1,
-                            "recipient": -1,
-                            "msg": "none",
-                        }
-                        await asyncio.wait_for(ws.send(json.dumps(new_msg).encode("utf-8")), timeout=1.0)
+                if data["recipient"] == "-1" and data["msg"] == "subscribe":
+                    subscribed_as = data["sender"]
+                    await Server.catch_up(ws, subscribed_as, int(data.get("after", 0)))
+                    Server.subscribers.setdefault(subscribed_as, set()).add(ws)
+                elif data["recipient"] == "-1" and data["msg"] == "ack":
+                    if Server.message_log is not None:
+                        Server.message_log.ack(data["sender"], int(data["seq"]))
+                else:
+                    if Server.message_log is not None:
+                        Server.message_log.append(data["recipient"], data)
+                    if not await Server.push(data["recipient"], [data]) and Server.message_log is None:
+                        Server.enqueue(data["recipient"], data)
         except websockets.exceptions.ConnectionClosed:
             pass
         finally:
             Server.clients.remove(ws)
+            if subscribed_as is not None:
+                Server.subscribers[subscribed_as].discard(ws)
+                if not Server.subscribers[subscribed_as]:
+                    del Server.subscribers[subscribed_as]
+
+    @staticmethod
+    async def catch_up(ws, recipient: str, after: int) -> None:
+        """
+        Function to send messages a recipient missed while offline, in batches of batch_size.
+        With a message log everything after the later of the client's and the acknowledged cursor is sent,
+        otherwise the in-memory mailbox is drained.
+        :param ws: websocket object of the recipient
+        :param recipient: uuid of the recipient
+        :param after: last sequence number the client has seen
+        :return: None
+        """
+        if Server.message_log is None:
+            while pending := Server.drain(recipient, Server.batch_size):
+                await ws.send(json.dumps(pending).encode("utf-8"))
+            return
+
+        cursor = max(after, Server.message_log.cursor(recipient))
+        while pending := Server.message_log.read_after(recipient, cursor, Server.batch_size):
+            await ws.send(json.dumps(pending).encode("utf-8"))
+            cursor = pending[-1]["seq"]
+
+    @staticmethod
+    def enqueue(recipient: str, message: dict) -> None:
+        """
+        Function to put a message into the recipient's mailbox. A full mailbox drops its oldest message
+        :param recipient: uuid of the recipient
+        :param message: message to queue
+        :return: None
+        """
+        mailbox = Server.mailboxes.get(recipient)
+        if mailbox is None:
+            mailbox = Server.mailboxes[recipient] = deque(maxlen=Server.mailbox_size)
+        elif len(mailbox) == mailbox.maxlen:
+            Server.dropped_messages += 1
+        mailbox.append(message)
+
+    @staticmethod
+    def drain(recipient: str, limit: int | None = None) -> list[dict]:
+        """
+        Function to take queued messages out of the recipient's mailbox in arrival order
+        :param recipient: uuid of the recipient
+        :param limit: maximal number of messages to take, all of them if None
+        :return: list of messages
+        """
+        mailbox = Server.mailboxes.get(recipient)
+        if not mailbox:
+            return []
+        count = len(mailbox) if limit is None else min(limit, len(mailbox))
+        batch = [mailbox.popleft() for _ in range(count)]
+        if not mailbox:
+            del Server.mailboxes[recipient]
+        return batch
+
+    @staticmethod
+    async def push(recipient: str, batch: list[dict]) -> bool:
+        """
+        Function to push a batch of messages to every connection subscribed as recipient
+        :param recipient: uuid of the recipient
+        :param batch: list of messages
+        :return: True if at least one connection received the batch
+        """
+        payload = json.dumps(batch).encode("utf-8")
+        delivered = False
+        for subscriber in list(Server.subscribers.get(recipient, ())):
+            try:
+                await subscriber.send(payload)
+                delivered = True
+            except websockets.exceptions.ConnectionClosed:
+                pass
+        return delivered
 
     @staticmethod
     async def main() -> None:
@@ -179,6 +504,6 @@ class Server:
         Function to run the server
         :return: None
         """
-        async with websockets.serve(Server.handle, "localhost", 6789):
-            print("Server running at ws://localhost:6789")
+        async with websockets.serve(Server.handle, Server.host, Server.port):
+            print(f"Server running at ws://{Server.host}:{Server.port}")
             await Server.stop_event.wait()
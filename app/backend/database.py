@@ -2,153 +2,580 @@
 The file creates a database and operates on it.
 """
 
+import json
 import sqlite3
-import asyncio
+import queue
+import threading
+import time
+import weakref
 
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Callable, Iterator
 
 from app.backend.chat import Client
 
 
-class Db:
-    @staticmethod
-    def connect_to_database(conn: sqlite3.Connection) -> sqlite3.Cursor:
+def _create_base_schema(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 1: creates application tables and adds columns missing from early databases.
+    :param cursor: cursor of the migrated connection
+    :return None
+    """
+    cursor.execute(
+        """
+           CREATE TABLE IF NOT EXISTS "grades" (
+                "id"	INTEGER PRIMARY KEY AUTOINCREMENT,
+                "value"	REAL NOT NULL,
+                "weight"	REAL,
+                "type"	INTEGER NOT NULL,
+                "semester"	TEXT NOT NULL,
+                "subject_id"	INTEGER NOT NULL,
+                "user_id"	INTEGER NOT NULL
+            )
+           """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS "notes" (
+            "id"	INTEGER,
+            "title"	TEXT,
+            "content"	TEXT,
+            "created_at"	TEXT,
+            "user_id"	INTEGER,
+            "associated_date"   DATETIME,
+            "color" TEXT,
+            PRIMARY KEY("id")
+        )
         """
-        The function checks whether the database exists, and if not, it creates it.
-        :param conn: connection to database
-        :return sqlite3.Cursor:
+    )
+    cursor.execute(
         """
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-               CREATE TABLE IF NOT EXISTS "grades" (
-                    "id"	INTEGER PRIMARY KEY AUTOINCREMENT,
-                    "value"	REAL NOT NULL,
-                    "weight"	REAL,
-                    "type"	INTEGER NOT NULL,
-                    "semester"	TEXT NOT NULL,
-                    "subject_id"	INTEGER NOT NULL,
-                    "user_id"	INTEGER NOT NULL
-                )
-               """
+        CREATE TABLE IF NOT EXISTS "events" (
+            "id"	INTEGER NOT NULL,
+            "title"	TEXT NOT NULL,
+            "description"	TEXT NOT NULL,
+            "date"	TEXT NOT NULL,
+            "user_id"	INTEGER NOT NULL,
+            PRIMARY KEY("id")
         )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS "notes" (
-                "id"	INTEGER,
-                "title"	TEXT,
-                "content"	TEXT,
-                "created_at"	TEXT,
-                "user_id"	INTEGER,
-                "associated_date"   DATETIME,
-                "color" TEXT,
-                PRIMARY KEY("id")
-            )
-            """
-        )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS "events" (
-                "id"	INTEGER NOT NULL,
-                "title"	TEXT NOT NULL,
-                "description"	TEXT NOT NULL,
-                "date"	TEXT NOT NULL,
-                "user_id"	INTEGER NOT NULL,
-                PRIMARY KEY("id")
-            )
-            """
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS "messages" (
+            "id"	INTEGER NOT NULL,
+            "content"	TEXT NOT NULL,
+            "user_uuid"	TEXT NOT NULL,
+            "recipient_uuid"	TEXT,
+            PRIMARY KEY("id")
         )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS "messages" (
-                "id"	INTEGER NOT NULL,
-                "content"	TEXT NOT NULL,
-                "user_id"	INTEGER NOT NULL,
-                "incoming"	INTEGER NOT NULL,
-                PRIMARY KEY("id")
-            )
-            """
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS "users" (
+            "id"	INTEGER NOT NULL,
+            "name"	TEXT NOT NULL,
+            "uuid"	TEXT NOT NULL,
+            "password"	TEXT NOT NULL,
+            PRIMARY KEY("id")
         )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS "users" (
-                "id"	INTEGER NOT NULL,
-                "name"	TEXT NOT NULL,
-                "uuid"	TEXT NOT NULL,
-                "password"	TEXT NOT NULL,
-                PRIMARY KEY("id")
-            )
-            """
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS "notifications" (
+            "id"	INTEGER UNIQUE,
+            "user_id"	TEXT,
+            "message"	TEXT,
+            "notification_type"	INTEGER,
+            "is_read"	INTEGER,
+            "associated_time"	TEXT,
+            PRIMARY KEY("id")
         )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS "notifications" (
-                "id"	INTEGER UNIQUE,
-                "user_id"	TEXT,
-                "message"	TEXT,
-                "notification_type"	INTEGER,
-                "is_read"	INTEGER,
-                "associated_time"	TEXT,
-                PRIMARY KEY("id")
-            )
-            """
+        """
+    )
+    cursor.execute("PRAGMA table_info(users)")
+    columns = [col[1] for col in cursor.fetchall()]
+    if "password" not in columns:
+        cursor.execute("ALTER TABLE users ADD COLUMN password TEXT NOT NULL DEFAULT ''")
+        print("Added missing 'password' column to 'users' table.")
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS "subjects" (
+            "id"	INTEGER PRIMARY KEY AUTOINCREMENT,
+            "name"	TEXT,
+            "ects"	INTEGER
         )
-        cursor.execute("PRAGMA table_info(users)")
-        columns = [col[1] for col in cursor.fetchall()]
-        if "password" not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN password TEXT NOT NULL DEFAULT ''")
-            print("Added missing 'password' column to 'users' table.")
+        """
+    )
 
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS "subjects" (
-                "id"	INTEGER PRIMARY KEY AUTOINCREMENT,
-                "name"	TEXT,
-                "ects"	INTEGER
-            )
-            """
+
+def _upgrade_messages_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 2: rebuilds a legacy "messages" table (user_id, incoming) into the
+    (user_uuid, recipient_uuid) layout used by Db.insert_message.
+    :param cursor: cursor of the migrated connection
+    :return None
+    """
+    cursor.execute("PRAGMA table_info(messages)")
+    columns = [col[1] for col in cursor.fetchall()]
+    if "user_uuid" in columns:
+        return
+    cursor.execute('ALTER TABLE "messages" RENAME TO "messages_legacy"')
+    cursor.execute(
+        """
+        CREATE TABLE "messages" (
+            "id"	INTEGER NOT NULL,
+            "content"	TEXT NOT NULL,
+            "user_uuid"	TEXT NOT NULL,
+            "recipient_uuid"	TEXT,
+            PRIMARY KEY("id")
         )
-        conn.commit()
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO messages (id, content, user_uuid, recipient_uuid)
+        SELECT id, content, CAST(user_id AS TEXT), NULL FROM messages_legacy
+        """
+    )
+    cursor.execute('DROP TABLE "messages_legacy"')
+
+
+def _create_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 3: adds secondary indexes used by lookups and filtered fetches.
+    :param cursor: cursor of the migrated connection
+    :return None
+    """
+    cursor.execute('CREATE INDEX IF NOT EXISTS "idx_grades_subject_id" ON "grades" ("subject_id")')
+    cursor.execute('CREATE INDEX IF NOT EXISTS "idx_grades_user_id" ON "grades" ("user_id")')
+    cursor.execute('CREATE INDEX IF NOT EXISTS "idx_notes_user_id_date" ON "notes" ("user_id", "associated_date")')
+    cursor.execute('CREATE INDEX IF NOT EXISTS "idx_notes_associated_date" ON "notes" ("associated_date")')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS "idx_notifications_read_time" ON "notifications" ("is_read", "associated_time")'
+    )
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS "idx_messages_conversation" ON "messages" ("user_uuid", "recipient_uuid", "id")'
+    )
+    cursor.execute('CREATE INDEX IF NOT EXISTS "idx_users_name" ON "users" ("name")')
+
+
+def _create_user_uuid_index(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 4: adds an index for looking users up by uuid.
+    :param cursor: cursor of the migrated connection
+    :return None
+    """
+    cursor.execute('CREATE INDEX IF NOT EXISTS "idx_users_uuid" ON "users" ("uuid")')
+
+
+class _ConnectionOwner:
+    """
+    Marker kept only in the thread local storage of Db. It is released when its thread exits,
+    which lets Db close the connection of that thread.
+    """
+
+
+class Db:
+    migrations: tuple[Callable[[sqlite3.Cursor], None], ...] = (
+        _create_base_schema,
+        _upgrade_messages_table,
+        _create_indexes,
+        _create_user_uuid_index,
+    )
+
+    @staticmethod
+    def connect_to_database(conn: sqlite3.Connection) -> sqlite3.Cursor:
+        """
+        The function checks whether the database exists, and if not, it creates it.
+        Pending schema migrations are applied afterwards and incremental auto vacuum is switched on.
+        :param conn: connection to database
+        :return sqlite3.Cursor:
+        """
+        cursor = conn.cursor()
+        Db.migrate(conn)
+        Db.enable_incremental_vacuum(conn)
         return cursor
 
-    conn = sqlite3.connect("./app/database/db.sqlite3")
-    cursor = connect_to_database(conn)
+    @staticmethod
+    def enable_incremental_vacuum(conn: sqlite3.Connection) -> None:
+        """
+        Switches the database to incremental auto vacuum, so Db.compact can return free pages
+        without rewriting the whole file. Changing the mode of an existing database needs a full VACUUM,
+        which runs once at startup, outside of any transaction.
+        :param conn: connection to database
+        :return None
+        """
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+
+    @staticmethod
+    def migrate(conn: sqlite3.Connection) -> int:
+        """
+        Applies numbered migrations newer than the database's PRAGMA user_version.
+        Every migration runs in its own transaction together with the version bump,
+        so each one is applied exactly once.
+        :param conn: connection to database
+        :return int: schema version after migrating
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(Db.migrations, start=1):
+            if number <= version:
+                continue
+            cursor = conn.cursor()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {number}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            version = number
+        return version
+
+    db_path: str = "./app/database/db.sqlite3"
+    _local = threading.local()
+    _pool: list[sqlite3.Connection] = []
+    _pool_lock = threading.Lock()
+    _pool_generation: int = 0
+    _initialised_paths: set[str] = set()
 
     @staticmethod
-    def dequeue_messages() -> None:
+    def configure(db_path: str) -> None:
         """
-        Insert all data from async queue to db
+        Points Db at another database file, e.g. a temporary one for tests and benchmarks.
+        Connections opened for the previous file are closed.
+        :param db_path: path to sqlite database file
         :return None
         """
-        while Client.msg_queue.qsize():
-            result = asyncio.run(Client.msg_queue.get())
-            Db.insert_message(result["msg"], result["sender"], result["recipient"])
+        Db.close_connections()
+        Db._initialised_paths.discard(db_path)
+        Db.db_path = db_path
+
+    @staticmethod
+    def get_connection() -> sqlite3.Connection:
+        """
+        Returns the connection owned by the calling thread, opening it on first use.
+        Every thread gets its own connection, so the chat listener, notification checks
+        and GUI callbacks can query the database at the same time. The connection is closed
+        when its thread exits.
+        :return sqlite3.Connection: connection of the current thread
+        """
+        conn = getattr(Db._local, "conn", None)
+        if conn is not None and Db._local.generation == Db._pool_generation:
+            return conn
+
+        conn = sqlite3.connect(Db.db_path, timeout=10.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with Db._pool_lock:
+            if Db.db_path not in Db._initialised_paths:
+                Db.connect_to_database(conn)
+                Db._initialised_paths.add(Db.db_path)
+            Db._pool.append(conn)
+            generation = Db._pool_generation
+        owner = _ConnectionOwner()
+        weakref.finalize(owner, Db._release_connection, conn).atexit = False
+        Db._local.conn = conn
+        Db._local.generation = generation
+        Db._local.owner = owner
+        return conn
+
+    @staticmethod
+    def _release_connection(conn: sqlite3.Connection) -> None:
+        """
+        Commits and closes the connection of a thread that has exited or opened a new one.
+        Connections already closed by close_connections are skipped.
+        :param conn: connection owned by the thread
+        :return None
+        """
+        with Db._pool_lock:
+            if conn not in Db._pool:
+                return
+            Db._pool.remove(conn)
+        try:
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            print(e)
+
+    @staticmethod
+    def close_connections() -> None:
+        """
+        Commits and closes every pooled connection. Threads transparently reopen
+        a connection on their next query.
+        :return None
+        """
+        with Db._pool_lock:
+            for conn in Db._pool:
+                try:
+                    conn.commit()
+                    conn.close()
+                except sqlite3.Error as e:
+                    print(e)
+            Db._pool.clear()
+            Db._pool_generation += 1
+
+    @staticmethod
+    @contextmanager
+    def transaction() -> Iterator[sqlite3.Connection]:
+        """
+        Groups several writes into a single transaction which is committed once on exit
+        and rolled back when an exception escapes. Per-row insert, update and delete methods
+        called inside take part in the open transaction instead of committing on their own.
+        Nested calls join the outermost transaction.
+        :return Iterator[sqlite3.Connection]: connection of the current thread
+        """
+        conn = Db.get_connection()
+        depth = getattr(Db._local, "transaction_depth", 0)
+        if depth == 0 and not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        Db._local.transaction_depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            Db._local.transaction_depth = depth
+            if depth == 0:
+                conn.rollback()
+            raise
+        Db._local.transaction_depth = depth
+        if depth == 0:
+            conn.commit()
+
+    @staticmethod
+    def commit() -> None:
+        """
+        Commits pending changes of the current thread unless a Db.transaction() is open,
+        in which case the changes are committed together with the whole batch.
+        :return None
+        """
+        if not getattr(Db._local, "transaction_depth", 0):
+            Db.get_connection().commit()
+
+    @staticmethod
+    def _to_db_time(value: datetime | str) -> str:
+        """
+        Converts a date to the text format in which dates are stored in the database.
+        :param value: datetime or already formatted string
+        :return str: date formatted as YYYY-MM-DD HH:MM:SS
+        """
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        return value
+
+    @staticmethod
+    def parse_db_time(value: str) -> datetime:
+        """
+        Converts a date stored in the database back to datetime.
+        Dates in the canonical YYYY-MM-DD HH:MM:SS form take the fast fromisoformat path,
+        anything else falls back to strptime.
+        :param value: date formatted as YYYY-MM-DD HH:MM:SS
+        :return datetime: parsed date
+        :raises ValueError: if the value is not a valid date
+        """
+        if len(value) == 19 and value[10] == " ":
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                pass
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def _fetch_filtered(
+        query: str,
+        conditions: list[str],
+        params: list,
+        order_by: str,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list:
+        """
+        Runs a SELECT query with its filters, ordering and paging pushed into SQL.
+        :param query: SELECT ... FROM ... part of the query
+        :param conditions: SQL conditions joined with AND
+        :param params: parameters of the conditions
+        :param order_by: ORDER BY clause body
+        :param limit: maximal number of rows, None for all rows
+        :param offset: number of rows to skip
+        :return list of tuple: fetched rows
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {order_by}"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params = [*params, -1 if limit is None else limit, offset or 0]
+        return Db.get_connection().execute(query, params).fetchall()
+
+    message_batch_size: int = 1000
+    message_flush_interval: float = 0.05
+    _writer_thread: threading.Thread | None = None
+    _writer_stop = threading.Event()
+
+    @staticmethod
+    def start_message_writer() -> None:
+        """
+        Starts a background thread which saves messages received by Client in batches
+        :return None
+        """
+        if Db._writer_thread is not None and Db._writer_thread.is_alive():
+            return
+        Db._writer_stop.clear()
+        Db._writer_thread = threading.Thread(target=Db._write_messages, daemon=True)
+        Db._writer_thread.start()
+
+    @staticmethod
+    def stop_message_writer() -> None:
+        """
+        Saves pending messages and stops the background writer
+        :return None
+        """
+        if Db._writer_thread is None:
+            return
+        Db._writer_stop.set()
+        Client.msg_queue.put(threading.Event())
+        Db._writer_thread.join()
+        Db._writer_thread = None
+
+    @staticmethod
+    def _write_messages() -> None:
+        """
+        Background writer loop. Collects messages until message_batch_size is reached or
+        message_flush_interval passes since the first one, then saves them in one transaction.
+        Events put into the queue by request_message_flush are set once everything before them is saved.
+        :return None
+        """
+        while not Db._writer_stop.is_set():
+            item = Client.msg_queue.get()
+            batch: list[dict] = []
+            flushed: list[threading.Event] = []
+            deadline = time.monotonic() + Db.message_flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    flushed.append(item)
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= Db.message_batch_size or remaining <= 0:
+                    break
+                try:
+                    item = Client.msg_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                Db.insert_received_messages(batch)
+            for event in flushed:
+                event.set()
+
+    @staticmethod
+    def request_message_flush() -> threading.Event:
+        """
+        Asks for all messages received so far to be saved without waiting for it. With a running writer
+        the returned event is set once the writer has saved them, otherwise the queue is drained here
+        in a single transaction and the event is already set.
+        :return threading.Event: event set when the messages are saved
+        """
+        flushed = threading.Event()
+        if Db._writer_thread is not None and Db._writer_thread.is_alive():
+            Client.msg_queue.put(flushed)
+            return flushed
+
+        batch: list[dict] = []
+        while True:
+            try:
+                item = Client.msg_queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            else:
+                batch.append(item)
+        if batch:
+            Db.insert_received_messages(batch)
+        flushed.set()
+        return flushed
+
+    @staticmethod
+    def dequeue_messages(timeout: float | None = 5.0) -> None:
+        """
+        Saves all messages received so far, waiting until they are saved.
+        :param timeout: maximal number of seconds to wait for the writer
+        :return None
+        """
+        Db.request_message_flush().wait(timeout)
 
     @staticmethod
     def close() -> None:
         """
-        Commit all data to db and close connection
+        Commit all data to db and close all connections
         :return None
         """
         Db.dequeue_messages()
-        Db.conn.commit()
-        Db.conn.close()
+        Db.stop_message_writer()
+        Db.close_connections()
+
+    @staticmethod
+    def compact() -> bool:
+        """
+        Returns free pages of the database file to the file system and refreshes query planner statistics.
+        Only incremental vacuum is used, the database is switched to it once by Db.enable_incremental_vacuum.
+        Refuses to run inside an open transaction of the calling thread.
+        :return success status: whether compaction was successful or not
+        """
+        try:
+            conn = Db.get_connection()
+            if getattr(Db._local, "transaction_depth", 0) or conn.in_transaction:
+                raise RuntimeError("Database cannot be compacted inside an open transaction")
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+            conn.execute("PRAGMA optimize")
+            return True
+        except Exception as e:
+            print(e)
+            return False
 
     # region grades
     @staticmethod
-    def fetch_grades() -> list[tuple[float, str, int, float, int, int]] | None:
+    def fetch_grades(
+        user_id: int | None = None,
+        subject_id: int | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[tuple[float, str, int, float, int, int]] | None:
         """
         This function fetches the grades from the database.
+        :param user_id: optional filter, only grades of this user
+        :param subject_id: optional filter, only grades of this subject
+        :param limit: optional maximal number of grades
+        :param offset: optional number of grades to skip
         :return list of tuple: list of tuple representing grades
         """
         try:
-            Db.cursor.execute(
+            conditions: list[str] = []
+            params: list = []
+            if user_id is not None:
+                conditions.append("g.user_id = ?")
+                params.append(user_id)
+            if subject_id is not None:
+                conditions.append("g.subject_id = ?")
+                params.append(subject_id)
+            return Db._fetch_filtered(
                 """
                         SELECT g.value, s.name, s.ects, g.weight, g.type, g.id
                         FROM grades AS g JOIN subjects AS s ON g.subject_id = s.id
-                           """
+                           """,
+                conditions,
+                params,
+                "g.id",
+                limit,
+                offset,
             )
-            return Db.cursor.fetchall()
         except Exception as e:
             print(e)
             return None
@@ -160,14 +587,16 @@ class Db:
         :return: grades ids.
         """
         try:
-            Db.cursor.execute("SELECT id FROM grades")
-            return Db.cursor.fetchall()
+            cursor = Db.get_connection().execute("SELECT id FROM grades")
+            return cursor.fetchall()
         except Exception as e:
             print(e)
             return None
 
     @staticmethod
-    def insert_grade(value: float, weight: float, sub_type: int, semester: int, subject_id: int, user_id: int) -> bool:
+    def insert_grade(
+        value: float, weight: float, sub_type: int, semester: int, subject_id: int, user_id: int
+    ) -> int | None:
         """
         This function inserts grades into the database.
         :param value: grade value
@@ -176,21 +605,21 @@ class Db:
         :param semester: corresponding semester id
         :param subject_id: subject id
         :param user_id: user id
-        :return success status: whether insert was successful or not
+        :return row id: id of the inserted row or None if insert failed
         """
         try:
-            Db.cursor.execute(
+            cursor = Db.get_connection().execute(
                 """
                        INSERT INTO grades (value, weight, type, semester, subject_id, user_id)
                        VALUES (?, ?, ?, ?, ?, ?)
                    """,
                 (value, weight, sub_type, semester, subject_id, user_id),
             )
-            Db.conn.commit()
-            return True
+            Db.commit()
+            return cursor.lastrowid
         except Exception as e:
             print(f"Error in insert_grade: {e}")
-            return False
+            return None
 
     @staticmethod
     def update_grade(
@@ -208,7 +637,7 @@ class Db:
         :return success status: whether update was successful or not
         """
         try:
-            Db.cursor.execute(
+            Db.get_connection().execute(
                 """
                        UPDATE grades
                        SET value       = ?,
@@ -221,7 +650,7 @@ class Db:
                        """,
                 (value, weight, sub_type, semester, subject_id, user_id, grade_id),
             )
-            Db.conn.commit()
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -235,25 +664,72 @@ class Db:
         :return success status: whether delete was successful or not
         """
         try:
-            Db.cursor.execute("DELETE FROM grades WHERE id = ?", (grade_id,))
-            Db.conn.commit()
+            Db.get_connection().execute("DELETE FROM grades WHERE id = ?", (grade_id,))
+            Db.commit()
             return True
         except Exception as e:
             print(e)
             return False
 
+    @staticmethod
+    def insert_grades_bulk(grades: list[tuple[float, float, int, int, int, int]]) -> bool:
+        """
+        This function inserts many grades into the database in a single transaction.
+        :param grades: list of (value, weight, sub_type, semester, subject_id, user_id) tuples
+        :return success status: whether insert was successful or not
+        """
+        try:
+            with Db.transaction() as conn:
+                conn.executemany(
+                    """
+                           INSERT INTO grades (value, weight, type, semester, subject_id, user_id)
+                           VALUES (?, ?, ?, ?, ?, ?)
+                       """,
+                    grades,
+                )
+            return True
+        except Exception as e:
+            print(f"Error in insert_grades_bulk: {e}")
+            return False
+
     # endregion
 
     # region notes
     @staticmethod
-    def fetch_notes() -> list[tuple[int, str, str, str, int, str, str]] | None:
+    def fetch_notes(
+        user_id: int | None = None,
+        date_from: datetime | str | None = None,
+        date_to: datetime | str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        after_id: int | None = None,
+    ) -> list[tuple[int, str, str, str, int, str, str]] | None:
         """
         This function fetches notes from the database.
+        :param user_id: optional filter, only notes of this user
+        :param date_from: optional filter, only notes associated with this date or later
+        :param date_to: optional filter, only notes associated with a date before this one
+        :param limit: optional maximal number of notes
+        :param offset: optional number of notes to skip
+        :param after_id: optional keyset filter, only notes with a greater id
         :return list of tuple: list of tuple representing notes
         """
         try:
-            Db.cursor.execute("SELECT * FROM notes")
-            return Db.cursor.fetchall()
+            conditions: list[str] = []
+            params: list = []
+            if after_id is not None:
+                conditions.append("id > ?")
+                params.append(after_id)
+            if user_id is not None:
+                conditions.append("user_id = ?")
+                params.append(user_id)
+            if date_from is not None:
+                conditions.append("associated_date >= ?")
+                params.append(Db._to_db_time(date_from))
+            if date_to is not None:
+                conditions.append("associated_date < ?")
+                params.append(Db._to_db_time(date_to))
+            return Db._fetch_filtered("SELECT * FROM notes", conditions, params, "id", limit, offset)
         except Exception as e:
             print(e)
             return None
@@ -261,7 +737,7 @@ class Db:
     @staticmethod
     def insert_note(
         title: str, content: str, created_at: str, user_id: int, associated_date: datetime, color: str
-    ) -> bool:
+    ) -> int | None:
         """
         This function inserts note into the database.
         :param title: note title
@@ -270,21 +746,21 @@ class Db:
         :param user_id: user id
         :param associated_date: note association date
         :param color: note color
-        :return success status: whether insert was successful or not
+        :return row id: id of the inserted row or None if insert failed
         """
         try:
-            Db.cursor.execute(
+            cursor = Db.get_connection().execute(
                 """
                        INSERT INTO notes (title, content, created_at, user_id, associated_date, color)
                        VALUES (?, ?, ?, ?, ?, ?)
                        """,
-                (title, content, created_at, user_id, associated_date, color),
+                (title, content, created_at, user_id, Db._to_db_time(associated_date), color),
             )
-            Db.conn.commit()
-            return True
+            Db.commit()
+            return cursor.lastrowid
         except Exception as e:
             print(e)
-            return False
+            return None
 
     @staticmethod
     def update_note(
@@ -302,7 +778,7 @@ class Db:
         :return success status: whether update was successful or not
         """
         try:
-            Db.cursor.execute(
+            Db.get_connection().execute(
                 """
                        UPDATE notes
                        SET title      = ?,
@@ -313,9 +789,9 @@ class Db:
                            color = ?
                        WHERE id       = ?
                    """,
-                (title, content, created_at, user_id, associated_date, color, note_id),
+                (title, content, created_at, user_id, Db._to_db_time(associated_date), color, note_id),
             )
-            Db.conn.commit()
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -329,7 +805,29 @@ class Db:
         :return success status: whether delete was successful or not
         """
         try:
-            Db.cursor.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+            Db.get_connection().execute("DELETE FROM notes WHERE id = ?", (note_id,))
+            Db.commit()
+            return True
+        except Exception as e:
+            print(e)
+            return False
+
+    @staticmethod
+    def insert_notes_bulk(notes: list[tuple[str, str, str, int, datetime | str, str]]) -> bool:
+        """
+        This function inserts many notes into the database in a single transaction.
+        :param notes: list of (title, content, created_at, user_id, associated_date, color) tuples
+        :return success status: whether insert was successful or not
+        """
+        try:
+            with Db.transaction() as conn:
+                conn.executemany(
+                    """
+                           INSERT INTO notes (title, content, created_at, user_id, associated_date, color)
+                           VALUES (?, ?, ?, ?, ?, ?)
+                           """,
+                    [(*note[:4], Db._to_db_time(note[4]), note[5]) for note in notes],
+                )
             return True
         except Exception as e:
             print(e)
@@ -345,33 +843,33 @@ class Db:
         :return list of tuple: list of tuple representing subjects
         """
         try:
-            Db.cursor.execute("SELECT * FROM subjects")
-            return Db.cursor.fetchall()
+            cursor = Db.get_connection().execute("SELECT * FROM subjects")
+            return cursor.fetchall()
         except Exception as e:
             print(e)
             return None
 
     @staticmethod
-    def insert_subject(name: str, ects: int) -> bool:
+    def insert_subject(name: str, ects: int) -> int | None:
         """
         This function inserts subject into the database.
         :param name: subject name
         :param ects: subject ects
-        :return success status: whether insert was successful or not
+        :return row id: id of the inserted row or None if insert failed
         """
         try:
-            Db.cursor.execute(
+            cursor = Db.get_connection().execute(
                 """
                        INSERT INTO subjects (name, ects)
                        VALUES (?, ?)
                    """,
                 (name, ects),
             )
-            Db.conn.commit()
-            return True
+            Db.commit()
+            return cursor.lastrowid
         except Exception as e:
             print(f"Error in insert_subject: {e}")
-            return False
+            return None
 
     @staticmethod
     def update_subject(subject_id: int, name: str, ects: int) -> bool:
@@ -383,7 +881,7 @@ class Db:
         :return success status: whether update was successful or not
         """
         try:
-            Db.cursor.execute(
+            Db.get_connection().execute(
                 """
                        UPDATE subjects
                        SET name   = ?,
@@ -392,7 +890,7 @@ class Db:
                    """,
                 (name, ects, subject_id),
             )
-            Db.conn.commit()
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -406,52 +904,94 @@ class Db:
         :return success status: whether delete was successful or not
         """
         try:
-            Db.cursor.execute("DELETE FROM subjects WHERE id = ?", (subject_id,))
-            Db.conn.commit()
+            Db.get_connection().execute("DELETE FROM subjects WHERE id = ?", (subject_id,))
+            Db.commit()
             return True
         except Exception as e:
             print(e)
             return False
 
+    @staticmethod
+    def insert_subjects_bulk(subjects: list[tuple[str, int]]) -> bool:
+        """
+        This function inserts many subjects into the database in a single transaction.
+        :param subjects: list of (name, ects) tuples
+        :return success status: whether insert was successful or not
+        """
+        try:
+            with Db.transaction() as conn:
+                conn.executemany(
+                    """
+                           INSERT INTO subjects (name, ects)
+                           VALUES (?, ?)
+                       """,
+                    subjects,
+                )
+            return True
+        except Exception as e:
+            print(f"Error in insert_subjects_bulk: {e}")
+            return False
+
     # endregion
 
     # region events
     @staticmethod
-    def fetch_events() -> list[tuple[int, str, str, str, int]] | None:
+    def fetch_events(
+        user_id: int | None = None,
+        date_from: datetime | str | None = None,
+        date_to: datetime | str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[tuple[int, str, str, str, int]] | None:
         """
         This function fetches events from the database.
+        :param user_id: optional filter, only events of this user
+        :param date_from: optional filter, only events on this date or later
+        :param date_to: optional filter, only events before this date
+        :param limit: optional maximal number of events
+        :param offset: optional number of events to skip
         :return list of tuple: list of tuple representing events
         """
         try:
-            Db.cursor.execute("SELECT * FROM events")
-            return Db.cursor.fetchall()
+            conditions: list[str] = []
+            params: list = []
+            if user_id is not None:
+                conditions.append("user_id = ?")
+                params.append(user_id)
+            if date_from is not None:
+                conditions.append("date >= ?")
+                params.append(Db._to_db_time(date_from))
+            if date_to is not None:
+                conditions.append("date < ?")
+                params.append(Db._to_db_time(date_to))
+            return Db._fetch_filtered("SELECT * FROM events", conditions, params, "id", limit, offset)
         except Exception as e:
             print(e)
             return None
 
     @staticmethod
-    def insert_event(title: str, description: str, date: str, user_id: int) -> bool:
+    def insert_event(title: str, description: str, date: str, user_id: int) -> int | None:
         """
         This function inserts event into the database.
         :param title: event title
         :param description: event description
         :param date: event date
         :param user_id: user id
-        :return success status: whether insert was successful or not
+        :return row id: id of the inserted row or None if insert failed
         """
         try:
-            Db.cursor.execute(
+            cursor = Db.get_connection().execute(
                 """
                        INSERT INTO events (title, description, date, user_id)
                        VALUES (?, ?, ?, ?)
                    """,
                 (title, description, date, user_id),
             )
-            Db.conn.commit()
-            return True
+            Db.commit()
+            return cursor.lastrowid
         except Exception as e:
             print(e)
-            return False
+            return None
 
     @staticmethod
     def update_event(title: str, description: str, date: str, event_id: int) -> bool:
@@ -464,7 +1004,7 @@ class Db:
         :return success status: whether update was successful or not
         """
         try:
-            Db.cursor.execute(
+            Db.get_connection().execute(
                 """
                        UPDATE events
                        SET title       = ?,
@@ -475,7 +1015,7 @@ class Db:
                    """,
                 (title, description, date, event_id),
             )
-            Db.conn.commit()
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -489,8 +1029,8 @@ class Db:
         :return success status: whether delete was successful or not
         """
         try:
-            Db.cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
-            Db.conn.commit()
+            Db.get_connection().execute("DELETE FROM events WHERE id = ?", (event_id,))
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -501,39 +1041,138 @@ class Db:
     # region messages
 
     @staticmethod
-    def fetch_messages() -> list[tuple[int, str, int, int]] | None:
+    def fetch_messages(
+        user_uuid: str | None = None,
+        peer_uuid: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[tuple[int, str, str, str | None]] | None:
         """
         This function fetches messages from the database.
+        :param user_uuid: optional filter, only messages sent or received by this user
+        :param peer_uuid: optional filter, together with user_uuid only the conversation of both users
+        :param limit: optional maximal number of messages
+        :param offset: optional number of messages to skip
         :return list of tuple: list of tuple representing messages
         """
         try:
-            Db.cursor.execute("SELECT * FROM messages")
-            return Db.cursor.fetchall()
+            conditions: list[str] = []
+            params: list = []
+            if user_uuid is not None and peer_uuid is not None:
+                conditions.append("((user_uuid = ? AND recipient_uuid = ?) OR (user_uuid = ? AND recipient_uuid = ?))")
+                params.extend((user_uuid, peer_uuid, peer_uuid, user_uuid))
+            elif user_uuid is not None:
+                conditions.append("(user_uuid = ? OR recipient_uuid = ?)")
+                params.extend((user_uuid, user_uuid))
+            return Db._fetch_filtered("SELECT * FROM messages", conditions, params, "id", limit, offset)
+        except Exception as e:
+            print(e)
+            return None
+
+    @staticmethod
+    def fetch_conversation(
+        user_uuid: str, peer_uuid: str, before_id: int | None = None, limit: int = 50
+    ) -> list[tuple[int, str, str, str | None]] | None:
+        """
+        This function fetches a page of the most recent messages of a conversation, using keyset pagination.
+        Each direction of the conversation is read from the conversation index separately,
+        so the cost depends on the page size and not on the conversation length.
+        :param user_uuid: uuid of one user of the conversation
+        :param peer_uuid: uuid of the other user of the conversation
+        :param before_id: optional id, only messages older than it are fetched
+        :param limit: maximal number of messages
+        :return list of tuple: list of tuple representing messages, oldest first
+        """
+        try:
+            keyset = "" if before_id is None else "AND id < ?"
+            direction = f"""
+                SELECT * FROM (
+                    SELECT * FROM messages
+                    WHERE user_uuid = ? AND recipient_uuid = ? {keyset}
+                    ORDER BY id DESC LIMIT ?
+                )
+            """
+            directions = [(user_uuid, peer_uuid)]
+            if peer_uuid != user_uuid:
+                directions.append((peer_uuid, user_uuid))
+            query = " UNION ALL ".join(direction for _ in directions) + " ORDER BY id DESC LIMIT ?"
+            params: list = []
+            for sender, recipient in directions:
+                params.extend((sender, recipient) if before_id is None else (sender, recipient, before_id))
+                params.append(limit)
+            params.append(limit)
+            rows = Db.get_connection().execute(query, params).fetchall()
+            rows.reverse()
+            return rows
         except Exception as e:
             print(e)
             return None
 
     @staticmethod
-    def insert_message(content: str, user_uuid: str, recipient_uuid: str) -> bool:
+    def insert_message(content: str, user_uuid: str, recipient_uuid: str) -> int | None:
         """
         This function inserts event into the database.
         :param recipient_uuid: recipient uuid
         :param content: message content
         :param user_uuid: user universally unique identifier
-        :return success status: whether insert was successful or not
+        :return row id: id of the inserted row or None if insert failed
         """
         try:
-            Db.cursor.execute(
+            cursor = Db.get_connection().execute(
                 """
                        INSERT INTO messages (content, user_uuid, recipient_uuid)
                        VALUES (?, ?, ?)
                    """,
                 (content, user_uuid, recipient_uuid),
             )
-            Db.conn.commit()
-            return True
+            Db.commit()
+            return cursor.lastrowid
         except Exception as e:
             print(e)
+            return None
+
+    @staticmethod
+    def insert_messages_bulk(messages: list[tuple[str, str, str]]) -> bool:
+        """
+        This function inserts many messages into the database in a single transaction.
+        :param messages: list of (content, user_uuid, recipient_uuid) tuples
+        :return success status: whether insert was successful or not
+        """
+        try:
+            with Db.transaction() as conn:
+                conn.executemany(
+                    """
+                           INSERT INTO messages (content, user_uuid, recipient_uuid)
+                           VALUES (?, ?, ?)
+                       """,
+                    messages,
+                )
+            return True
+        except Exception as e:
+            print(f"Error in insert_messages_bulk: {e}")
+            return False
+
+    @staticmethod
+    def insert_received_messages(results: list[dict]) -> bool:
+        """
+        This function inserts messages received by the chat client in a single transaction.
+        Every message gets the "id" of its row before the transaction is committed,
+        so anyone who can read the row can also tell the message was saved.
+        :param results: list of received messages with "msg", "sender" and "recipient" keys
+        :return success status: whether insert was successful or not
+        """
+        try:
+            with Db.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO messages (content, user_uuid, recipient_uuid) VALUES (?, ?, ?)",
+                    [(result["msg"], result["sender"], result["recipient"]) for result in results],
+                )
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                for offset, result in enumerate(reversed(results)):
+                    result["id"] = last_id - offset
+            return True
+        except Exception as e:
+            print(f"Error in insert_received_messages: {e}")
             return False
 
     @staticmethod
@@ -547,7 +1186,7 @@ class Db:
         :return success status: whether update was successful or not
         """
         try:
-            Db.cursor.execute(
+            Db.get_connection().execute(
                 """
                        UPDATE messages
                        SET content        = ?,
@@ -557,7 +1196,7 @@ class Db:
                    """,
                 (content, user_uuid, message_id, recipient_uuid),
             )
-            Db.conn.commit()
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -571,13 +1210,46 @@ class Db:
         :return success status: whether delete was successful or not
         """
         try:
-            Db.cursor.execute("DELETE FROM messages WHERE id = ?", (message_id,))
-            Db.conn.commit()
+            Db.get_connection().execute("DELETE FROM messages WHERE id = ?", (message_id,))
+            Db.commit()
             return True
         except Exception as e:
             print(e)
             return False
 
+    @staticmethod
+    def prune_messages(keep_per_conversation: int) -> int | None:
+        """
+        This function deletes the oldest messages of every conversation beyond the newest keep_per_conversation ones
+        with a single statement. A conversation is the unordered pair of sender and recipient.
+        :param keep_per_conversation: number of newest messages kept in every conversation
+        :return row count: number of deleted messages or None if delete failed
+        """
+        try:
+            cursor = Db.get_connection().execute(
+                """
+                DELETE FROM messages
+                WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY MIN(user_uuid, COALESCE(recipient_uuid, '')),
+                                                MAX(user_uuid, COALESCE(recipient_uuid, ''))
+                                   ORDER BY id DESC
+                               ) AS position
+                        FROM messages
+                    )
+                    WHERE position > ?
+                )
+                """,
+                (keep_per_conversation,),
+            )
+            Db.commit()
+            return cursor.rowcount
+        except Exception as e:
+            print(e)
+            return None
+
     # endregion
 
     # region users
@@ -589,8 +1261,22 @@ class Db:
         :return: a tuple representing the user
         """
         try:
-            Db.cursor.execute("SELECT * FROM users WHERE name = ?", (name,))
-            return Db.cursor.fetchone()
+            cursor = Db.get_connection().execute("SELECT * FROM users WHERE name = ?", (name,))
+            return cursor.fetchone()
+        except Exception as e:
+            print(e)
+            return None
+
+    @staticmethod
+    def fetch_user_by_uuid(uuid: str) -> tuple[int, str, str, str] | None:
+        """
+        This function fetches a single user from the database by their uuid.
+        :param uuid: user uuid
+        :return: a tuple representing the user
+        """
+        try:
+            cursor = Db.get_connection().execute("SELECT * FROM users WHERE uuid = ?", (uuid,))
+            return cursor.fetchone()
         except Exception as e:
             print(e)
             return None
@@ -602,34 +1288,34 @@ class Db:
         :return list of tuple: list of tuple representing users
         """
         try:
-            Db.cursor.execute("SELECT * FROM users")
-            return Db.cursor.fetchall()
+            cursor = Db.get_connection().execute("SELECT * FROM users")
+            return cursor.fetchall()
         except Exception as e:
             print(e)
             return None
 
     @staticmethod
-    def insert_users(name: str, uuid: str, password: str) -> bool:
+    def insert_users(name: str, uuid: str, password: str) -> int | None:
         """
         This function inserts user into the database.
         :param name: username
         :param uuid: user uuid
         :param password: password
-        :return success status: whether insert was successful or not
+        :return row id: id of the inserted row or None if insert failed
         """
         try:
-            Db.cursor.execute(
+            cursor = Db.get_connection().execute(
                 """
                        INSERT INTO users (name, uuid, password)
                        VALUES (?, ?, ?)
                    """,
                 (name, uuid, password),
             )
-            Db.conn.commit()
-            return True
+            Db.commit()
+            return cursor.lastrowid
         except Exception as e:
             print(e)
-            return False
+            return None
 
     @staticmethod
     def update_user(user_id: int, name: str, uuid: str) -> bool:
@@ -641,7 +1327,7 @@ class Db:
         :return success status: whether update was successful or not
         """
         try:
-            Db.cursor.execute(
+            Db.get_connection().execute(
                 """
                        UPDATE users
                        SET name = ?,
@@ -650,7 +1336,7 @@ class Db:
                    """,
                 (name, uuid, user_id),
             )
-            Db.conn.commit()
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -664,8 +1350,8 @@ class Db:
         :return success status: whether delete was successful or not
         """
         try:
-            Db.cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
-            Db.conn.commit()
+            Db.get_connection().execute("DELETE FROM users WHERE id = ?", (user_id,))
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -679,8 +1365,8 @@ class Db:
         :return: success status
         """
         try:
-            Db.cursor.execute("SELECT password FROM users where id = ?", (user_id,))
-            return Db.cursor.fetchone()
+            cursor = Db.get_connection().execute("SELECT password FROM users where id = ?", (user_id,))
+            return cursor.fetchone()
         except Exception as e:
             print(e)
             return None
@@ -694,7 +1380,7 @@ class Db:
         :return: success status
         """
         try:
-            Db.cursor.execute(
+            Db.get_connection().execute(
                 """
                        UPDATE users
                        SET password = ?
@@ -702,7 +1388,7 @@ class Db:
                    """,
                 (new_password, user_id),
             )
-            Db.conn.commit()
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -713,14 +1399,132 @@ class Db:
     # region notifications
 
     @staticmethod
-    def fetch_notifications() -> list[tuple[int, str, str, int, int, str]] | None:
+    def fetch_notifications(
+        user_id: str | None = None,
+        is_read: bool | None = None,
+        notification_type: int | None = None,
+        due_before: datetime | str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[tuple[int, str, str, int, int, str]] | None:
         """
         This function fetches notifications from the database.
+        :param user_id: optional filter, only notifications of this user
+        :param is_read: optional filter, only read (True) or unread (False) notifications
+        :param notification_type: optional filter, only notifications of this type
+        :param due_before: optional filter, only notifications associated with this time or earlier
+        :param limit: optional maximal number of notifications
+        :param offset: optional number of notifications to skip
         :return list of tuple: list of tuple representing notifications
         """
         try:
-            Db.cursor.execute("SELECT * FROM notifications")
-            return Db.cursor.fetchall()
+            conditions, params = Db._notification_conditions(
+                user_id=user_id, is_read=is_read, notification_type=notification_type, due_before=due_before
+            )
+            return Db._fetch_filtered("SELECT * FROM notifications", conditions, params, "id", limit, offset)
+        except Exception as e:
+            print(e)
+            return None
+
+    @staticmethod
+    def _notification_conditions(
+        notification_ids: list[int] | None = None,
+        user_id: str | None = None,
+        is_read: bool | None = None,
+        notification_type: int | None = None,
+        due_before: datetime | str | None = None,
+        older_than: datetime | str | None = None,
+    ) -> tuple[list[str], list]:
+        """
+        Builds SQL conditions shared by queries filtering notifications.
+        :param notification_ids: optional filter, only notifications with these ids
+        :param user_id: optional filter, only notifications of this user
+        :param is_read: optional filter, only read (True) or unread (False) notifications
+        :param notification_type: optional filter, only notifications of this type
+        :param due_before: optional filter, only notifications associated with this time or earlier
+        :param older_than: optional filter, only notifications associated with a time before this one
+        :return tuple: list of conditions and list of their parameters
+        """
+        conditions: list[str] = []
+        params: list = []
+        if notification_ids is not None:
+            conditions.append("id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(notification_ids))
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if is_read is not None:
+            conditions.append("is_read = ?")
+            params.append(int(is_read))
+        if notification_type is not None:
+            conditions.append("notification_type = ?")
+            params.append(notification_type)
+        if due_before is not None:
+            conditions.append("associated_time <= ?")
+            params.append(Db._to_db_time(due_before))
+        if older_than is not None:
+            conditions.append("associated_time < ?")
+            params.append(Db._to_db_time(older_than))
+        return conditions, params
+
+    @staticmethod
+    def mark_notifications_read(
+        notification_ids: list[int] | None = None,
+        notification_type: int | None = None,
+        due_before: datetime | str | None = None,
+    ) -> int | None:
+        """
+        This function marks unread notifications matching the filters as read with a single statement.
+        Without filters every unread notification is marked.
+        :param notification_ids: optional filter, only notifications with these ids
+        :param notification_type: optional filter, only notifications of this type
+        :param due_before: optional filter, only notifications associated with this time or earlier
+        :return row count: number of marked notifications or None if update failed
+        """
+        try:
+            conditions, params = Db._notification_conditions(
+                notification_ids=notification_ids,
+                is_read=False,
+                notification_type=notification_type,
+                due_before=due_before,
+            )
+            cursor = Db.get_connection().execute(
+                "UPDATE notifications SET is_read = 1 WHERE " + " AND ".join(conditions), params
+            )
+            Db.commit()
+            return cursor.rowcount
+        except Exception as e:
+            print(e)
+            return None
+
+    @staticmethod
+    def delete_notifications(
+        notification_ids: list[int] | None = None,
+        is_read: bool | None = None,
+        notification_type: int | None = None,
+        older_than: datetime | str | None = None,
+    ) -> int | None:
+        """
+        This function deletes notifications matching the filters with a single statement.
+        At least one filter is required, so the whole table cannot be deleted by accident.
+        :param notification_ids: optional filter, only notifications with these ids
+        :param is_read: optional filter, only read (True) or unread (False) notifications
+        :param notification_type: optional filter, only notifications of this type
+        :param older_than: optional filter, only notifications associated with a time before this one
+        :return row count: number of deleted notifications or None if delete failed
+        """
+        try:
+            conditions, params = Db._notification_conditions(
+                notification_ids=notification_ids,
+                is_read=is_read,
+                notification_type=notification_type,
+                older_than=older_than,
+            )
+            if not conditions:
+                raise ValueError("delete_notifications requires at least one filter")
+            cursor = Db.get_connection().execute("DELETE FROM notifications WHERE " + " AND ".join(conditions), params)
+            Db.commit()
+            return cursor.rowcount
         except Exception as e:
             print(e)
             return None
@@ -732,7 +1536,7 @@ class Db:
         notification_type: int,
         is_read: int,
         associated_time: str,
-    ) -> bool:
+    ) -> int | None:
         """
         This function inserts notification into the database.
         :param user_id: user id
@@ -740,21 +1544,21 @@ class Db:
         :param notification_type: notification type
         :param is_read: is read
         :param associated_time: associated time
-        :return success status: whether insert was successful or not
+        :return row id: id of the inserted row or None if insert failed
         """
         try:
-            Db.cursor.execute(
+            cursor = Db.get_connection().execute(
                 """
                 INSERT INTO notifications (user_id, message, notification_type, is_read, associated_time)
                 VALUES (?, ?, ?, ?, ?)
                 """,
                 (user_id, message, notification_type, is_read, associated_time),
             )
-            Db.conn.commit()
-            return True
+            Db.commit()
+            return cursor.lastrowid
         except Exception as e:
             print(e)
-            return False
+            return None
 
     @staticmethod
     def update_notification(
@@ -776,7 +1580,7 @@ class Db:
         :return success status: whether update was successful or not
         """
         try:
-            Db.cursor.execute(
+            Db.get_connection().execute(
                 """
                 UPDATE notifications
                 SET user_id          = ?,
@@ -788,7 +1592,7 @@ class Db:
                 """,
                 (user_id, message, notification_type, is_read, associated_time, notification_id),
             )
-            Db.conn.commit()
+            Db.commit()
             return True
         except Exception as e:
             print(e)
@@ -802,12 +1606,58 @@ class Db:
         :return success status: whether delete was successful or not
         """
         try:
-            Db.cursor.execute(
+            Db.get_connection().execute(
                 "DELETE FROM notifications WHERE id = ?",
                 (notification_id,),
             )
-            Db.conn.commit()
+            Db.commit()
+            return True
+        except Exception as e:
+            print(e)
+            return False
+
+    @staticmethod
+    def insert_notifications_bulk(notifications: list[tuple[str, str, int, int, str]]) -> bool:
+        """
+        This function inserts many notifications into the database in a single transaction.
+        :param notifications: list of (user_id, message, notification_type, is_read, associated_time) tuples
+        :return success status: whether insert was successful or not
+        """
+        try:
+            with Db.transaction() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO notifications (user_id, message, notification_type, is_read, associated_time)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    notifications,
+                )
             return True
         except Exception as e:
             print(e)
             return False
+
+    @staticmethod
+    def insert_notifications_returning_ids(notifications: list[tuple[str, str, int, int, str]]) -> list[int] | None:
+        """
+        This function inserts many notifications into the database in a single transaction
+        and collects ids of the inserted rows.
+        :param notifications: list of (user_id, message, notification_type, is_read, associated_time) tuples
+        :return row ids: ids of the inserted rows in the order of notifications or None if insert failed
+        """
+        try:
+            with Db.transaction() as conn:
+                return [
+                    conn.execute(
+                        """
+                        INSERT INTO notifications (user_id, message, notification_type, is_read, associated_time)
+                        VALUES (?, ?, ?, ?, ?)
+                        RETURNING id
+                        """,
+                        notification,
+                    ).fetchone()[0]
+                    for notification in notifications
+                ]
+        except Exception as e:
+            print(e)
+            return None
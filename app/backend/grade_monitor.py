@@ -4,6 +4,8 @@ File contains definition for GradeMonitor class, its functionality and definitio
 
 import math
 
+import numpy as np
+
 from app.backend.database import Db
 from enum import Enum
 
@@ -24,6 +26,8 @@ class Subject:
     Class stores information about a Subject
     """
 
+    __slots__ = ("name", "ects_value", "grade_types")
+
     def __init__(self, name: str, ects_value: int) -> None:
         self.name: str = name
         self.ects_value: int = ects_value
@@ -35,6 +39,8 @@ class Grade:
     Class stores information about a Grade
     """
 
+    __slots__ = ("value", "subject", "weight", "type", "id")
+
     def __init__(self, grade_id: int, value: float, subject: Subject, weight: float = 1, grade_type: int = 1) -> None:
         self.value: float = value
         self.subject: Subject = subject
@@ -43,57 +49,431 @@ class Grade:
         self.id = grade_id
 
 
+class SubjectStatistics:
+    """
+    Class keeps running sums of a subject's grades, so averages do not require rescanning all grades
+    """
+
+    def __init__(self) -> None:
+        self.type_grades: dict[GradeType, list[Grade]] = {}
+        self.type_value_sums: dict[GradeType, float] = {}
+        self.type_min_weights: dict[GradeType, float] = {}
+        self.weighted_sum: float = 0
+        self.weight_total: float = 0
+        self.value_counts: dict[float, int] = {}
+
+    @staticmethod
+    def regular_weight(grade: Grade) -> float:
+        """
+        Method returns weight used by the regular average, invalid weights count as 1
+        :param grade: Grade which weight is checked
+        :return: Weight of the grade
+        """
+        if grade.weight <= 0 or not isinstance(grade.weight, float):
+            return 1
+        return grade.weight
+
+    def add(self, grade: Grade) -> None:
+        """
+        Method includes a grade in running sums
+        :param grade: Grade to include
+        :return: Nothing
+        """
+        bucket = self.type_grades.setdefault(grade.type, [])
+        bucket.append(grade)
+        self.type_value_sums[grade.type] = self.type_value_sums.get(grade.type, 0.0) + grade.value
+        self.type_min_weights[grade.type] = min(self.type_min_weights.get(grade.type, grade.weight), grade.weight)
+
+        weight = self.regular_weight(grade)
+        self.weighted_sum += grade.value * weight
+        self.weight_total += weight
+        self.value_counts[grade.value] = self.value_counts.get(grade.value, 0) + 1
+
+    def remove(self, grade: Grade) -> None:
+        """
+        Method excludes a grade from running sums, only the grade's type bucket is rescanned
+        :param grade: Grade to exclude
+        :return: Nothing
+        """
+        bucket = self.type_grades[grade.type]
+        bucket.remove(grade)
+        if bucket:
+            self.type_value_sums[grade.type] -= grade.value
+            self.type_min_weights[grade.type] = min(g.weight for g in bucket)
+        else:
+            del self.type_grades[grade.type]
+            del self.type_value_sums[grade.type]
+            del self.type_min_weights[grade.type]
+
+        weight = self.regular_weight(grade)
+        self.weighted_sum -= grade.value * weight
+        self.weight_total -= weight
+        self.value_counts[grade.value] -= 1
+        if self.value_counts[grade.value] == 0:
+            del self.value_counts[grade.value]
+
+    def is_empty(self) -> bool:
+        """
+        Method checks whether any grade is left in statistics
+        :return: True if subject has no grades
+        """
+        return not self.type_grades
+
+    def type_averages(self) -> dict[GradeType, tuple[float, float]]:
+        """
+        Method returns average and weight of each grade type
+        :return: Dictionary of a grade type and a tuple containing its average and weight
+        """
+        return {
+            tp: (self.type_value_sums[tp] / len(grades), self.type_min_weights[tp])
+            for tp, grades in self.type_grades.items()
+        }
+
+
+class GradeColumns:
+    """
+    Class stores grades column-wise in a NumPy structured array and computes grouped
+    statistics with vectorized reductions. Results match the object based GradeMonitor path.
+    """
+
+    dtype = np.dtype(
+        [
+            ("value", np.float64),
+            ("weight", np.float64),
+            ("regular_weight", np.float64),
+            ("type", np.int64),
+            ("subject", np.int64),
+        ]
+    )
+
+    def __init__(self, grades: list[Grade], subjects: list[Subject]) -> None:
+        self.subject_names: list[str] = [subject.name for subject in subjects]
+        self.subject_codes: dict[str, int] = {name: code for code, name in enumerate(self.subject_names)}
+        self.ects: np.ndarray = np.array([float(subject.ects_value) for subject in subjects], dtype=np.float64)
+
+        self.table: np.ndarray = np.empty(len(grades), dtype=self.dtype)
+        self.table["value"] = [grade.value for grade in grades]
+        self.table["weight"] = [grade.weight for grade in grades]
+        self.table["regular_weight"] = [SubjectStatistics.regular_weight(grade) for grade in grades]
+        self.table["type"] = [grade.type.value - 1 for grade in grades]
+        self.table["subject"] = [self.subject_codes[grade.subject.name] for grade in grades]
+
+        self._compute_group_statistics()
+
+    def _compute_group_statistics(self) -> None:
+        """
+        Method computes per subject and per (subject, grade type) reductions in a single pass.
+        :return: Nothing
+        """
+        subjects_count = len(self.subject_names)
+        types_count = len(GradeType)
+        groups_count = subjects_count * types_count
+        values = self.table["value"]
+        subjects = self.table["subject"]
+        groups = subjects * types_count + self.table["type"]
+
+        self.type_counts = np.bincount(groups, minlength=groups_count)
+        self.type_sums = np.bincount(groups, weights=values, minlength=groups_count)
+        self.type_min_weights = np.full(groups_count, np.inf)
+        np.minimum.at(self.type_min_weights, groups, self.table["weight"])
+        self.type_first_index = np.full(groups_count, len(values))
+        np.minimum.at(self.type_first_index, groups, np.arange(len(values)))
+
+        regular_weights = self.table["regular_weight"]
+        self.weighted_sums = np.bincount(subjects, weights=values * regular_weights, minlength=subjects_count)
+        self.weight_totals = np.bincount(subjects, weights=regular_weights, minlength=subjects_count)
+
+        present = np.flatnonzero(self.type_counts)
+        self.type_averages = np.zeros(groups_count)
+        self.type_averages[present] = self.type_sums[present] / self.type_counts[present]
+
+        order = np.lexsort((self.type_first_index[present], present // types_count))
+        self.present_groups = present[order]
+        weighted = self.type_averages[self.present_groups] * self.type_min_weights[self.present_groups]
+        group_subjects = self.present_groups // types_count
+        self.type_weighted_sums = np.zeros(subjects_count)
+        self.type_weight_sums = np.zeros(subjects_count)
+        if len(self.present_groups):
+            starts = np.flatnonzero(np.r_[True, group_subjects[1:] != group_subjects[:-1]])
+            self.type_weighted_sums[group_subjects[starts]] = np.add.reduceat(weighted, starts)
+            self.type_weight_sums[group_subjects[starts]] = np.add.reduceat(
+                self.type_min_weights[self.present_groups], starts
+            )
+
+    def subject_averages(self, ignore_ects: bool) -> list[float]:
+        """
+        Method calculates averages of all subjects at once.
+        :param ignore_ects: If true a regular weighted average is used
+        :return: List of subject averages in subject order
+        """
+        if ignore_ects:
+            numerators, denominators = self.weighted_sums, self.weight_totals
+        else:
+            numerators, denominators = self.type_weighted_sums, self.type_weight_sums
+        if np.any(denominators == 0):
+            raise ZeroDivisionError("Subject grade weights sum up to zero")
+        return [round(average, 2) for average in (numerators / denominators).tolist()]
+
+    def subject_average(self, subject_name: str, ignore_ects: bool) -> float:
+        """
+        Method calculates average grade for specified subject.
+        :param subject_name: Name of a subject which average is calculated
+        :param ignore_ects: If true a regular weighted average is used
+        :return: Average subject grade as a float value
+        """
+        code = self.subject_codes.get(subject_name)
+        if code is None:
+            raise ZeroDivisionError(f"No grades for subject {subject_name}")
+        if ignore_ects:
+            numerator, denominator = self.weighted_sums[code], self.weight_totals[code]
+        else:
+            numerator, denominator = self.type_weighted_sums[code], self.type_weight_sums[code]
+        if denominator == 0:
+            raise ZeroDivisionError(f"Grade weights of subject {subject_name} sum up to zero")
+        return round(float(numerator / denominator), 2)
+
+    def total_average(self, ignore_ects: bool) -> float:
+        """
+        Method calculates ects weighted average grade of all subjects.
+        :param ignore_ects: If true every subject has the same weight
+        :return: Total average grade as float value
+        """
+        if ignore_ects:
+            ects = np.ones(len(self.subject_names))
+        else:
+            ects = np.floor(np.abs(self.ects))
+        if not len(ects) or ects.sum() == 0:
+            raise ZeroDivisionError("Total ects value is zero")
+        averages = np.array(self.subject_averages(ignore_ects))
+        # cumulative sums add values left to right, like the object based path does
+        grade_total = float(np.cumsum(averages * ects)[-1])
+        total_ects = float(np.cumsum(ects)[-1])
+        return round(grade_total / total_ects, 2)
+
+    def subject_type_average(self, subject_name: str) -> dict[GradeType, tuple[float, float]]:
+        """
+        Method returns averages of each grade type of a subject with weight of type attached.
+        :param subject_name: Name of a subject of which grade type averages are calculated
+        :return: Dictionary of a subject grade type and a tuple containing its average and weight
+        """
+        code = self.subject_codes.get(subject_name)
+        if code is None:
+            return {}
+        types_count = len(GradeType)
+        groups = self.present_groups[self.present_groups // types_count == code]
+        return {
+            GradeType(int(group) % types_count + 1): (
+                float(self.type_averages[group]),
+                float(self.type_min_weights[group]),
+            )
+            for group in groups
+        }
+
+    def grade_counts(self, subject_names=None) -> dict[float, int]:
+        """
+        Method counts quantity of each grade, possible filtering by subject name.
+        :param subject_names: Optional parameter - names of subjects to count grades from
+        :return: Dictionary containing counts of each grade in order of first occurrence
+        """
+        values = self.table["value"]
+        if subject_names is not None and len(subject_names) != 0:
+            codes = [code for name, code in self.subject_codes.items() if name in subject_names]
+            values = values[np.isin(self.table["subject"], codes)]
+        unique, first_index, counts = np.unique(values, return_index=True, return_counts=True)
+        order = np.argsort(first_index, kind="stable")
+        return dict(zip(unique[order].tolist(), counts[order].tolist()))
+
+
 class GradeMonitor:
     """
     Purpose of the class is to collect, manage and operate on grade data from the database.
+    Grades are indexed by subject and averages come from running sums, which are updated
+    incrementally by add_grade, update_grade and remove_grade.
+    The default "object" backend answers statistics queries from these running sums.
+    The "numpy" backend computes averages and counts with GradeColumns instead. The columns are rebuilt
+    in full after any change, so it suits bulk analysis of a fixed set of grades, not interactive editing.
     """
 
-    def __init__(self, grades_list: list[tuple[float, str, int, float, int, int]], ignore_ects: bool = False) -> None:
-        self.grade_table: list[Grade] = []
+    backends: tuple[str, ...] = ("object", "numpy")
+    default_backend: str = "object"
+
+    def __init__(
+        self,
+        grades_list: list[tuple[float, str, int, float, int, int]],
+        ignore_ects: bool = False,
+        backend: str | None = None,
+    ) -> None:
         self.subject_table: list[Subject] = []
+        self.subjects: dict[str, Subject] = {}
+        self.statistics: dict[str, SubjectStatistics] = {}
+        self.grades: dict[int, Grade] = {}
+        self.value_counts: dict[float, int] = {}
+        self.backend: str = GradeMonitor.default_backend if backend is None else backend
+        if self.backend not in GradeMonitor.backends:
+            raise ValueError(f"Unknown statistics backend: {self.backend}")
+        self._columns: GradeColumns | None = None
         self.fill_monitor_tables(grades_list)
         self.ignore_ects: bool = ignore_ects
 
+    @property
+    def columns(self) -> GradeColumns | None:
+        """
+        Column-wise copy of grades used by the numpy backend, built on first use after a change
+        :return: GradeColumns instance or None when the object backend is used
+        """
+        if self.backend != "numpy":
+            return None
+        if self._columns is None:
+            self._columns = GradeColumns(self.grade_table, self.subject_table)
+        return self._columns
+
+    @property
+    def grade_table(self) -> list[Grade]:
+        """
+        List of all grades in the monitor
+        :return: List of grades
+        """
+        return list(self.grades.values())
+
+    @grade_table.setter
+    def grade_table(self, grades: list[Grade]) -> None:
+        """
+        Replaces all grades of the monitor and rebuilds its indexes
+        :param grades: New list of grades
+        :return: Nothing
+        """
+        self.subject_table = []
+        self.subjects = {}
+        self.statistics = {}
+        self.grades = {}
+        self.value_counts = {}
+        self._columns = None
+        for grade in grades:
+            self._index_grade(grade)
+
     def fill_monitor_tables(self, grades_list: list[tuple[float, str, int, float, int, int]]) -> None:
         """
         Method fills monitor's tables with data fetched from database.
         :param grades_list: Table of grades data fetched from database
         :return: Nothing
         """
-        current_subject: Subject = Subject("", 0)
-
         for row in grades_list:
-            if len(self.subject_table) == 0:
-                current_subject.name = row[1]
-                current_subject.ects_value = row[2]
-                self.subject_table.append(current_subject)
-
-            else:
-                subject_in_table = False
-                for subject in self.subject_table:
-                    if subject.name == row[1]:
-                        current_subject = subject
-                        subject_in_table = True
-                        break
-
-                if not subject_in_table:
-                    current_subject = Subject(row[1], int(row[2]))
-                    self.subject_table.append(current_subject)
+            self.add_grade(int(row[5]), float(row[0]), row[1], int(row[2]), float(row[3]), int(row[4]))
 
-            new_grade = Grade(int(row[5]), float(row[0]), current_subject, float(row[3]), int(row[4]))
-
-            if new_grade.type not in current_subject.grade_types:
-                current_subject.grade_types.append(new_grade.type)
-            self.grade_table.append(new_grade)
-
-        for subject in self.subject_table:
+    def add_grade(
+        self, grade_id: int, value: float, subject_name: str, ects_value: int, weight: float = 1, grade_type: int = 1
+    ) -> Grade:
+        """
+        Method adds a grade and updates running sums of its subject.
+        :param grade_id: Id of the grade
+        :param value: Grade value
+        :param subject_name: Name of the grade's subject, a new subject is created when missing
+        :param ects_value: Ects value used when a new subject is created
+        :param weight: Grade weight
+        :param grade_type: Grade type number
+        :return: Added grade
+        """
+        subject = self.subjects.get(subject_name)
+        if subject is None:
+            subject = Subject(subject_name, ects_value)
+        grade = Grade(grade_id, value, subject, weight, grade_type)
+        self._index_grade(grade)
+        return grade
+
+    def update_grade(
+        self,
+        grade_id: int,
+        value: float | None = None,
+        weight: float | None = None,
+        grade_type: int | None = None,
+        subject_name: str | None = None,
+        ects_value: int = 0,
+    ) -> Grade | None:
+        """
+        Method changes a grade and updates running sums of affected subjects.
+        :param grade_id: Id of the grade to update
+        :param value: New grade value or None to keep current one
+        :param weight: New grade weight or None to keep current one
+        :param grade_type: New grade type number or None to keep current one
+        :param subject_name: New subject name or None to keep current one
+        :param ects_value: Ects value used when a new subject is created
+        :return: Updated grade or None if grade does not exist
+        """
+        old_grade = self.remove_grade(grade_id)
+        if old_grade is None:
+            return None
+        return self.add_grade(
+            grade_id,
+            old_grade.value if value is None else value,
+            old_grade.subject.name if subject_name is None else subject_name,
+            old_grade.subject.ects_value if subject_name is None else ects_value,
+            old_grade.weight if weight is None else weight,
+            old_grade.type.value if grade_type is None else grade_type,
+        )
+
+    def remove_grade(self, grade_id: int) -> Grade | None:
+        """
+        Method removes a grade and updates running sums of its subject.
+        Subjects left without grades are removed as well.
+        :param grade_id: Id of the grade to remove
+        :return: Removed grade or None if grade does not exist
+        """
+        grade = self.grades.pop(grade_id, None)
+        if grade is None:
+            return None
+        self._columns = None
+
+        subject = grade.subject
+        statistics = self.statistics[subject.name]
+        statistics.remove(grade)
+        if grade.type not in statistics.type_grades:
+            subject.grade_types.remove(grade.type)
+        if statistics.is_empty():
+            del self.statistics[subject.name]
+            del self.subjects[subject.name]
+            self.subject_table.remove(subject)
+
+        self.value_counts[grade.value] -= 1
+        if self.value_counts[grade.value] == 0:
+            del self.value_counts[grade.value]
+        return grade
+
+    def _index_grade(self, grade: Grade) -> None:
+        """
+        Method puts a grade into monitor's indexes and running sums.
+        :param grade: Grade to index
+        :return: Nothing
+        """
+        if grade.id in self.grades:
+            self.remove_grade(grade.id)
+
+        subject = self.subjects.get(grade.subject.name)
+        if subject is None:
+            subject = grade.subject
+            self.subjects[subject.name] = subject
+            self.statistics[subject.name] = SubjectStatistics()
+            self.subject_table.append(subject)
+        grade.subject = subject
+
+        statistics = self.statistics[subject.name]
+        statistics.add(grade)
+        if grade.type not in subject.grade_types:
+            subject.grade_types.append(grade.type)
             subject.grade_types.sort(key=lambda x: x.value)
 
+        self.grades[grade.id] = grade
+        self.value_counts[grade.value] = self.value_counts.get(grade.value, 0) + 1
+        self._columns = None
+
     def calculate_total_grade_average(self) -> float:
         """
         Method calculates average grade of all subjects.
         :return: Total average grade as float value
         """
+        columns = self.columns
+        if columns is not None:
+            return columns.total_average(self.ignore_ects)
+
         grade_total: float = 0
         total_ects: float = 0
         ects_value: int
@@ -114,6 +494,10 @@ class GradeMonitor:
         :param subject_name: Name of a subject which average is calculated
         :return: Average subject grade as a float value
         """
+        columns = self.columns
+        if columns is not None:
+            return columns.subject_average(subject_name, self.ignore_ects)
+
         if self.ignore_ects:
             return self.calculate_subject_regular_average(subject_name)
         else:
@@ -131,18 +515,14 @@ class GradeMonitor:
         :param subject_name: Name of a subject which average is calculated
         :return: Average subject grade as a float value
         """
-        grade_total: float = 0
-        grade_total_weights: float = 0
-        grade_weight: float
-        for grade in self.grade_table:
-            if grade.subject.name == subject_name:
-                if grade.weight <= 0 or not isinstance(grade.weight, float):
-                    grade_weight = 1
-                else:
-                    grade_weight = grade.weight
-                grade_total += grade.value * grade_weight
-                grade_total_weights += grade_weight
-        return round(grade_total / grade_total_weights, 2)
+        columns = self.columns
+        if columns is not None:
+            return columns.subject_average(subject_name, ignore_ects=True)
+
+        statistics = self.statistics.get(subject_name)
+        if statistics is None:
+            raise ZeroDivisionError(f"No grades for subject {subject_name}")
+        return round(statistics.weighted_sum / statistics.weight_total, 2)
 
     def calculate_subject_type_average(self, subject_name: str) -> dict[GradeType, tuple[float, float]]:
         """
@@ -151,20 +531,14 @@ class GradeMonitor:
         :param subject_name: Name of a subject of which grade type averages are calculated
         :return: Dictionary of a subject grade type and a tuple containing its average and weight
         """
-        type_averages: dict[GradeType, tuple[float, float]] = {}
-        type_counts: dict[GradeType, int] = {}
+        columns = self.columns
+        if columns is not None:
+            return columns.subject_type_average(subject_name)
 
-        for grade in self.grade_table:
-            if grade.subject.name == subject_name:
-                averages = type_averages.get(grade.type, (0.0, grade.weight))
-                type_averages[grade.type] = (averages[0] + grade.value, min(averages[1], grade.weight))
-                type_counts[grade.type] = type_counts.get(grade.type, 0) + 1
-
-        for tp in type_averages:
-            averages = type_averages[tp]
-            type_averages[tp] = (averages[0] / type_counts[tp], averages[1])
-
-        return type_averages
+        statistics = self.statistics.get(subject_name)
+        if statistics is None:
+            return {}
+        return statistics.type_averages()
 
     def grade_counts(self, subject_names=None) -> dict[float, int]:
         """
@@ -172,18 +546,31 @@ class GradeMonitor:
         :param subject_names: Optional parameter - names of subjects to count grades from
         :return: Dictionary containing counts of each grade
         """
-        if subject_names is None:
-            subject_names = []
+        columns = self.columns
+        if columns is not None:
+            return columns.grade_counts(subject_names)
+
+        if subject_names is None or len(subject_names) == 0:
+            return dict(self.value_counts)
 
         grade_count: dict[float, int] = {}
-        for grade in self.grade_table:
-            if len(subject_names) == 0:
-                grade_count[grade.value] = grade_count.get(grade.value, 0) + 1
-            elif grade.subject.name in subject_names:
-                grade_count[grade.value] = grade_count.get(grade.value, 0) + 1
+        for name, statistics in self.statistics.items():
+            if name in subject_names:
+                for value, count in statistics.value_counts.items():
+                    grade_count[value] = grade_count.get(value, 0) + count
 
         return grade_count
 
+    def subjects_averages(self) -> dict[str, float]:
+        """
+        Method calculates averages of all subjects in one go.
+        :return: Dictionary of subject names and their average grades
+        """
+        columns = self.columns
+        if columns is not None:
+            return dict(zip(columns.subject_names, columns.subject_averages(self.ignore_ects)))
+        return {subject.name: self.calculate_subject_average(subject.name) for subject in self.subject_table}
+
 
 def initiate_grade_monitor(ignore_ects: bool = False) -> GradeMonitor | None:
     """
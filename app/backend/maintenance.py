@@ -0,0 +1,125 @@
+"""
+File contains retention policy and background maintenance of the database
+"""
+
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.backend.database import Db
+
+
+class RetentionPolicy:
+    """
+    Class describes how long data is kept in the database.
+    A limit set to None disables the corresponding cleanup.
+    """
+
+    def __init__(self, read_notification_days: int | None = 90, messages_per_conversation: int | None = 5000) -> None:
+        self.read_notification_days = read_notification_days
+        self.messages_per_conversation = messages_per_conversation
+
+    def notifications_cutoff(self, now: datetime | None = None) -> datetime | None:
+        """
+        Returns the date before which read notifications are deleted.
+        :param now: Current time, datetime.now() if not given
+        :return: Cutoff date or None if read notifications are kept forever
+        """
+        if self.read_notification_days is None:
+            return None
+        return (now or datetime.now()) - timedelta(days=self.read_notification_days)
+
+
+class MaintenanceJob:
+    """
+    Class runs the retention policy and database compaction in a background thread.
+    The job runs at most once per interval and only after the user has been idle for idle_after seconds.
+    When notification_cutoffs is set, read notifications are not deleted by the job itself,
+    the cutoff is put into the queue so the GUI thread can remove them through the notification manager.
+    """
+
+    policy: RetentionPolicy = RetentionPolicy()
+    interval: float = 6 * 60 * 60
+    idle_after: float = 60.0
+    poll_interval: float = 5.0
+    last_activity: float = time.monotonic()
+    last_run: float | None = None
+    thread: threading.Thread | None = None
+    stop_event = threading.Event()
+    notification_cutoffs: queue.SimpleQueue[datetime] | None = None
+
+    @staticmethod
+    def start() -> None:
+        """
+        Starts the background maintenance thread unless it is already running.
+        :return: Nothing
+        """
+        if MaintenanceJob.thread is not None and MaintenanceJob.thread.is_alive():
+            return
+        MaintenanceJob.stop_event.clear()
+        MaintenanceJob.thread = threading.Thread(target=MaintenanceJob.run, daemon=True)
+        MaintenanceJob.thread.start()
+
+    @staticmethod
+    def stop() -> None:
+        """
+        Stops the background maintenance thread, waiting for a running cleanup to finish.
+        :return: Nothing
+        """
+        MaintenanceJob.stop_event.set()
+        if MaintenanceJob.thread is not None:
+            MaintenanceJob.thread.join()
+            MaintenanceJob.thread = None
+
+    @staticmethod
+    def note_activity(event=None) -> None:
+        """
+        Records user activity, maintenance is postponed until the user is idle again.
+        :param event: Optional tkinter event, allows binding the method to input events
+        :return: Nothing
+        """
+        MaintenanceJob.last_activity = time.monotonic()
+
+    @staticmethod
+    def is_due() -> bool:
+        """
+        Checks whether the interval since the last run has passed and the user is idle.
+        :return: Whether maintenance should run now
+        """
+        now = time.monotonic()
+        if MaintenanceJob.last_run is not None and now - MaintenanceJob.last_run < MaintenanceJob.interval:
+            return False
+        return now - MaintenanceJob.last_activity >= MaintenanceJob.idle_after
+
+    @staticmethod
+    def run() -> None:
+        """
+        Background loop checking every poll_interval seconds whether maintenance is due.
+        :return: Nothing
+        """
+        while not MaintenanceJob.stop_event.wait(MaintenanceJob.poll_interval):
+            if MaintenanceJob.is_due():
+                MaintenanceJob.run_once()
+
+    @staticmethod
+    def run_once() -> dict[str, int]:
+        """
+        Applies the retention policy and compacts the database.
+        :return: Dictionary with numbers of deleted notifications and messages,
+        notifications handed over to notification_cutoffs are not counted
+        """
+        MaintenanceJob.last_run = time.monotonic()
+        policy = MaintenanceJob.policy
+        removed = {"notifications": 0, "messages": 0}
+
+        cutoff = policy.notifications_cutoff()
+        if cutoff is not None and MaintenanceJob.notification_cutoffs is not None:
+            MaintenanceJob.notification_cutoffs.put(cutoff)
+        elif cutoff is not None:
+            removed["notifications"] = Db.delete_notifications(is_read=True, older_than=cutoff) or 0
+        if policy.messages_per_conversation is not None:
+            removed["messages"] = Db.prune_messages(policy.messages_per_conversation) or 0
+
+        Db.compact()
+        return removed
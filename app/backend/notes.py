@@ -1,10 +1,12 @@
 """
-File contains definition of Note and NoteManager class
+File contains definition of Note, NoteManager and NoteCache class
 """
 
 from datetime import datetime
+from typing import Iterable
 
 from app.backend.database import Db
+from app.backend.theme import DEFAULT_NOTE_COLORS
 
 
 class Note:
@@ -12,21 +14,44 @@ class Note:
     Class stores information about a Note
     """
 
+    __slots__ = ("id", "user_id", "title", "content", "created_at", "associated_date", "color")
+
+    default_colors: tuple[str, ...] = DEFAULT_NOTE_COLORS
+
     def __init__(
-        self, id: int, user_id: int, title: str, content: str, color: str = "", associated_date: datetime | None = None
+        self,
+        id: int,
+        user_id: int,
+        title: str,
+        content: str,
+        color: str = "",
+        associated_date: datetime | None = None,
+        created_at: str | None = None,
     ) -> None:
         self.id = id
         self.user_id = user_id
         self.title = title
         self.content = content
-        self.created_at = str(datetime.now().strftime("%Y-%m-%d %H:%M"))
+        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M") if created_at is None else created_at
         self.associated_date = associated_date
         if color == "":
-            colors: list[str] = ["#ada132", "#2d7523", "#1e6a6e"]
-            self.color = colors[id % len(colors)]
+            self.color = Note.default_colors[id % len(Note.default_colors)]
         else:
             self.color = color
 
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, str, str, str, int, str, str]]) -> list["Note"]:
+        """
+        Creates notes from rows fetched from the database.
+        :param rows: Rows of the notes table
+        :return: List of notes
+        """
+        parse = Db.parse_db_time
+        return [
+            cls(note_id, user_id, title, content, color, parse(associated_date), created_at)
+            for note_id, title, content, created_at, user_id, associated_date, color in rows
+        ]
+
     def update_title(self, new_title: str) -> None:
         """
         Updates the title of the note
@@ -67,13 +92,7 @@ class NoteManager:
         :param notes_list: List of tuples representing notes
         :return: Nothing
         """
-        for row in notes_list:
-            note_id, title, content, created_at, user_id, associated_date, color = row
-            note = Note(
-                note_id, user_id, title, content, color, datetime.strptime(associated_date, "%Y-%m-%d " "%H:%M:%S")
-            )
-            note.created_at = created_at
-            self.notes.append(note)
+        self.notes.extend(Note.from_rows(notes_list))
 
     def get_all_notes(self) -> list[Note]:
         """
@@ -107,3 +126,99 @@ def initiate_note_manager() -> NoteManager | None:
     except TypeError:
         print("Notes could not be fetched from database")
         return None
+
+
+class NoteCache:
+    """
+    Class caches notes of whole months, indexed by the day of their associated date.
+    A month is read from the database once with a date range query and served from memory afterward,
+    until a change to notes invalidates it.
+    """
+
+    months: dict[tuple[int, int], dict[int, list[Note]]] = {}
+
+    @staticmethod
+    def month_range(year: int, month: int) -> tuple[datetime, datetime]:
+        """
+        Returns the bounds of a month usable as a date range filter.
+        :param year: Year of the month
+        :param month: Month number
+        :return: First moment of the month and first moment of the following month
+        """
+        if month == 12:
+            return datetime(year, 12, 1), datetime(year + 1, 1, 1)
+        return datetime(year, month, 1), datetime(year, month + 1, 1)
+
+    @staticmethod
+    def index_by_day(notes: Iterable[Note]) -> dict[int, list[Note]]:
+        """
+        Groups notes by the day of their associated date, notes without a date are skipped.
+        :param notes: Notes to group
+        :return: Dictionary mapping day of the month to its notes
+        """
+        days: dict[int, list[Note]] = {}
+        for note in notes:
+            if note.associated_date is not None:
+                days.setdefault(note.associated_date.day, []).append(note)
+        return days
+
+    @staticmethod
+    def get_month(year: int, month: int) -> dict[int, list[Note]]:
+        """
+        Returns notes of a given month indexed by day, reading them from the database only on a cache miss.
+        :param year: Year of the month
+        :param month: Month number
+        :return: Dictionary mapping day of the month to its notes
+        """
+        days = NoteCache.months.get((year, month))
+        if days is not None:
+            return days
+
+        date_from, date_to = NoteCache.month_range(year, month)
+        rows = Db.fetch_notes(date_from=date_from, date_to=date_to)
+        if rows is None:
+            return {}
+        try:
+            days = NoteCache.index_by_day(Note.from_rows(rows))
+        except (TypeError, ValueError):
+            print("Notes could not be fetched from database")
+            return {}
+        NoteCache.months[(year, month)] = days
+        return days
+
+    @staticmethod
+    def get_notes(year: int, month: int) -> list[Note]:
+        """
+        Returns notes of a given month ordered by day.
+        :param year: Year of the month
+        :param month: Month number
+        :return: List of notes
+        """
+        days = NoteCache.get_month(year, month)
+        return [note for day in sorted(days) for note in days[day]]
+
+    @staticmethod
+    def add(note: Note) -> None:
+        """
+        Adds a newly created note to its month if the month is cached, other months read it from the database later.
+        :param note: Note saved in the database
+        :return: Nothing
+        """
+        if note.associated_date is None:
+            return
+        days = NoteCache.months.get((note.associated_date.year, note.associated_date.month))
+        if days is not None:
+            days.setdefault(note.associated_date.day, []).append(note)
+
+    @staticmethod
+    def invalidate(year: int | None = None, month: int | None = None) -> None:
+        """
+        Drops cached notes so they are read again on the next access.
+        :param year: Year of the month to drop, all months are dropped if year or month is not given
+        :param month: Month number of the month to drop
+        :return: Nothing
+        """
+        if year is None or month is None:
+            NoteCache.months.clear()
+        else:
+            NoteCache.months.pop((year, month), None)
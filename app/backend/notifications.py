@@ -1,7 +1,11 @@
+import heapq
+import itertools
+import time
+from collections import deque
 from datetime import datetime
 from enum import Enum
 import customtkinter as ctk
-from typing import Callable
+from typing import Callable, Iterable
 
 from app.backend.tooltip import NotificationPopUp
 from app.backend.database import Db
@@ -24,6 +28,10 @@ class Notification:
     Class representing a notification, possessing data relevant to a notification.
     """
 
+    __slots__ = ("id", "user_id", "message", "notification_type", "is_read", "associated_time")
+
+    fallback_time: datetime = datetime(2026, 1, 1)
+
     def __init__(
         self,
         id: int,
@@ -40,6 +48,23 @@ class Notification:
         self.is_read: bool = is_read
         self.associated_time: datetime | None = associated_time
 
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, str, str, int, int, str]]) -> list["Notification"]:
+        """
+        Creates notifications from rows fetched from the database.
+        Rows with an invalid date get fallback_time as their associated time.
+        :param rows: Rows of the notifications table
+        :return: List of notifications
+        """
+        notifications: list[Notification] = []
+        for notification_id, user_id, message, notification_type, is_read, associated_time in rows:
+            try:
+                parsed_time = Db.parse_db_time(associated_time)
+            except ValueError:
+                parsed_time = cls.fallback_time
+            notifications.append(cls(notification_id, user_id, message, notification_type, bool(is_read), parsed_time))
+        return notifications
+
     def mark_as_read(self) -> None:
         """
         Marks notification as read.
@@ -59,15 +84,35 @@ class Notification:
 class NotificationManager:
     """
     Class responsible for managing notifications.
+    Notifications are stored in a dictionary indexed by id, with secondary indexes by type
+    and of unread notifications, so lookups, marking and deleting do not scan the whole list.
+    Unread notifications are kept in a heap ordered by their associated time and a single
+    timer is armed for the earliest one. Deleted or read notifications are dropped lazily
+    when they reach the top of the heap.
+    Due notifications are moved to a pop-up queue in one pass. The queue is shown as a single
+    pop-up, batched into a summary when several notifications wait, and pop-ups are rate limited.
     """
 
     def __init__(self, notifications_list: list[tuple[int, str, str, int, int, str]], app: ctk.CTk) -> None:
-        self.notifications: list[Notification] = []
+        self.by_id: dict[int, Notification] = {}
+        self.by_type: dict[NotificationType, dict[int, Notification]] = {
+            notification_type: {} for notification_type in NotificationType
+        }
+        self.unread: dict[int, Notification] = {}
+        self.schedule: list[tuple[datetime, int, Notification]] = []
+        self._schedule_counter = itertools.count()
         self.fill_notifications_table(notifications_list)
         self.app = app
-        self.check_interval_ms = 500
+        self.max_wait_ms = 60_000
         self.popup_window: NotificationPopUp | None = None
-        self.check_id = None
+        self.pending_popups: deque[Notification] = deque()
+        self.batch_threshold = 2
+        self.batch_preview = 3
+        self.min_popup_interval_ms = 1500
+        self.last_popup_time: float | None = None
+        self.popup_id: str | None = None
+        self.check_id: str | None = None
+        self.checking = True
         self.notifications_updated: None | Callable = None
 
         self.check_notifications()
@@ -78,22 +123,75 @@ class NotificationManager:
         :param notifications_list: List of tuples representing notifications data
         :return: Nothing
         """
-        for row in notifications_list:
-            notification_id, user_id, message, notification_type, is_read, associated_time = row
-            try:
-                datetime.strptime(associated_time, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                associated_time = "2026-1-1 00:00:00"
-
-            notification = Notification(
-                notification_id,
-                user_id=user_id,
-                message=message,
-                notification_type=notification_type,
-                is_read=bool(is_read),
-                associated_time=datetime.strptime(associated_time, "%Y-%m-%d %H:%M:%S"),
-            )
-            self.notifications.append(notification)
+        notifications = Notification.from_rows(notifications_list)
+        for notification in notifications:
+            self.register(notification)
+            if not notification.is_read and notification.associated_time is not None:
+                self.schedule.append((notification.associated_time, next(self._schedule_counter), notification))
+        heapq.heapify(self.schedule)
+
+    def schedule_notification(self, notification: Notification) -> None:
+        """
+        Method puts an unread notification into the schedule and re-arms the timer if it is due earlier.
+        :param notification: Notification to schedule
+        :return: Nothing
+        """
+        if notification.is_read or notification.associated_time is None:
+            return
+        entry = (notification.associated_time, next(self._schedule_counter), notification)
+        heapq.heappush(self.schedule, entry)
+        if self.schedule[0] is entry:
+            self.arm_timer()
+
+    def is_pending(self, notification: Notification) -> bool:
+        """
+        Method checks whether a scheduled or queued notification should still be shown.
+        Notifications are compared by identity, so an entry left behind by a deleted notification
+        stays dead even when its id is reused by a new one.
+        :param notification: Notification taken from the schedule or the pop-up queue
+        :return: Whether the notification is still stored in manager and unread
+        """
+        return self.by_id.get(notification.id) is notification and not notification.is_read
+
+    @property
+    def notifications(self) -> list[Notification]:
+        """
+        All notifications in the order they were added.
+        :return: List of notifications
+        """
+        return list(self.by_id.values())
+
+    def register(self, notification: Notification) -> None:
+        """
+        Method adds a notification to the store and its indexes, a notification with the same id is replaced.
+        :param notification: Notification to add
+        :return: Nothing
+        """
+        self.unregister(notification.id)
+        self.by_id[notification.id] = notification
+        self.by_type[notification.notification_type][notification.id] = notification
+        if not notification.is_read:
+            self.unread[notification.id] = notification
+
+    def unregister(self, notification_id: int) -> Notification | None:
+        """
+        Method removes a notification from the store and its indexes.
+        :param notification_id: Id of the notification
+        :return: Removed notification or None if there was no such notification
+        """
+        notification = self.by_id.pop(notification_id, None)
+        if notification is not None:
+            self.by_type[notification.notification_type].pop(notification_id, None)
+            self.unread.pop(notification_id, None)
+        return notification
+
+    def get_notification(self, notification_id: int) -> Notification | None:
+        """
+        Method returns a notification by its id.
+        :param notification_id: Id of the notification
+        :return: Notification or None if there is no such notification
+        """
+        return self.by_id.get(notification_id)
 
     def get_all_notifications(self) -> list[Notification]:
         """
@@ -107,7 +205,26 @@ class NotificationManager:
         Method returns unread notifications.
         :return: List of unread notifications
         """
-        return [n for n in self.notifications if not n.is_read]
+        return list(self.unread.values())
+
+    def get_notifications(
+        self, notification_type: NotificationType | None = None, unread_only: bool = False
+    ) -> list[Notification]:
+        """
+        Method returns notifications matching the filters, only the smaller matching index is walked.
+        :param notification_type: Optional filter, only notifications of this type
+        :param unread_only: Whether to return only unread notifications
+        :return: List of notifications in the order they were added
+        """
+        if notification_type is None:
+            return self.get_unread_notifications() if unread_only else self.notifications
+        of_type = self.by_type[notification_type]
+        if not unread_only:
+            return list(of_type.values())
+        if len(of_type) <= len(self.unread):
+            return [notification for notification_id, notification in of_type.items() if notification_id in self.unread]
+        matching_ids = {notification_id for notification_id in self.unread if notification_id in of_type}
+        return [notification for notification_id, notification in of_type.items() if notification_id in matching_ids]
 
     def delete_notification(self, notification_id: int) -> None:
         """
@@ -115,113 +232,277 @@ class NotificationManager:
         :param notification_id: Id of a notification to delete
         :return: Nothing
         """
-        notification_to_delete = None
-        for notification in self.notifications:
-            if notification.id == notification_id:
-                notification_to_delete = notification
+        notification_to_delete = self.unregister(notification_id)
         if notification_to_delete is not None:
-            self.notifications.remove(notification_to_delete)
             Db.delete_notification(notification_to_delete.id)
+            if self.schedule and self.schedule[0][2] is notification_to_delete:
+                self.arm_timer()
 
-    def mark_as_read(self, notification_id: int):
-        notification_to_update = None
-        for notification in self.notifications:
-            if notification.id == notification_id:
-                notification_to_update = notification
+    def mark_as_read(self, notification_id: int) -> None:
+        """
+        Marks notification as read in database and manager
+        :param notification_id: Id of a notification to mark
+        :return: Nothing
+        """
+        notification_to_update = self.by_id.get(notification_id)
         if notification_to_update is not None:
+            was_next = bool(self.schedule) and self.schedule[0][2] is notification_to_update
             notification_to_update.mark_as_read()
-            Db.update_notification(
-                notification_id=notification_to_update.id,
-                is_read=True,
-                user_id=notification_to_update.user_id,
-                associated_time=str(notification_to_update.associated_time),
-                message=notification_to_update.message,
-                notification_type=notification_to_update.notification_type.value,
-            )
+            self.unread.pop(notification_id, None)
+            if was_next:
+                self.arm_timer()
+            Db.mark_notifications_read(notification_ids=[notification_id])
 
-    def add_notification(self, message: str, notification_type: int, associated_time: str) -> None:
+    def mark_all_read(self, notification_type: NotificationType | None = None) -> int:
+        """
+        Marks all unread notifications, optionally only of one type, as read with a single database statement.
+        Ids of the marked notifications are taken from the manager indexes and passed to the database,
+        so both always change the same rows.
+        :param notification_type: Optional filter, only notifications of this type
+        :return: Number of notifications marked in manager
+        """
+        to_mark = self.get_notifications(notification_type, unread_only=True)
+        if not to_mark:
+            return 0
+        if Db.mark_notifications_read(notification_ids=[notification.id for notification in to_mark]) is None:
+            return 0
+
+        next_notification = self.schedule[0][2] if self.schedule else None
+        for notification in to_mark:
+            notification.mark_as_read()
+            self.unread.pop(notification.id, None)
+        if next_notification is not None and next_notification.is_read:
+            self.arm_timer()
+        return len(to_mark)
+
+    def delete_read_older_than(self, date: datetime) -> int:
+        """
+        Deletes read notifications associated with a time before the given date with a single database statement.
+        Notifications are selected in the manager and deleted from the database by their ids,
+        so both always remove the same rows.
+        :param date: Notifications older than this date are deleted
+        :return: Number of notifications deleted from manager
+        """
+        to_delete = [
+            notification.id
+            for notification in self.by_id.values()
+            if notification.is_read and notification.associated_time is not None and notification.associated_time < date
+        ]
+        if not to_delete:
+            return 0
+        if Db.delete_notifications(notification_ids=to_delete) is None:
+            return 0
+        for notification_id in to_delete:
+            self.unregister(notification_id)
+        return len(to_delete)
+
+    def add_notification(self, message: str, notification_type: int, associated_time: str) -> Notification | None:
         """
         Adds new notification to database and manager
         :param message: Notification message
         :param notification_type: Notification type
         :param associated_time: Notification date
-        :return: Nothing
+        :return: Added notification or None if it could not be saved
         """
-        Db.insert_notification(
+        notification_id = Db.insert_notification(
             message=message,
             notification_type=notification_type,
             associated_time=associated_time,
             is_read=False,
             user_id="1",
         )
-        db_notifications = Db.fetch_notifications()
-        notification_to_add = None
-        if db_notifications is not None:
-            for notification in db_notifications:
-                if (
-                    notification[2] == message
-                    and notification[3] == notification_type
-                    and associated_time == notification[5]
-                ):
-                    notification_to_add = notification
-            if notification_to_add is not None:
-                self.notifications.append(
-                    Notification(
-                        notification_to_add[0],
-                        user_id=notification_to_add[1],
-                        message=notification_to_add[2],
-                        notification_type=notification_to_add[3],
-                        is_read=bool(notification_to_add[4]),
-                        associated_time=datetime.strptime(notification_to_add[5], "%Y-%m-%d %H:%M:%S"),
-                    )
+        if notification_id is None:
+            return None
+        new_notification = Notification.from_rows(
+            [(notification_id, "1", message, notification_type, 0, associated_time)]
+        )[0]
+        self.register(new_notification)
+        self.schedule_notification(new_notification)
+        return new_notification
+
+    def add_notifications(self, notifications: list[tuple[str, int, str]]) -> list[Notification]:
+        """
+        Adds many notifications to database in a single transaction and to manager
+        :param notifications: List of (message, notification_type, associated_time) tuples
+        :return: Added notifications, an empty list if they could not be saved
+        """
+        rows = [
+            ("1", message, notification_type, 0, associated_time)
+            for message, notification_type, associated_time in notifications
+        ]
+        notification_ids = Db.insert_notifications_returning_ids(rows)
+        if notification_ids is None:
+            return []
+
+        previous_next = self.schedule[0] if self.schedule else None
+        new_notifications = Notification.from_rows(
+            (notification_id, *row) for notification_id, row in zip(notification_ids, rows)
+        )
+        for notification in new_notifications:
+            self.register(notification)
+            if notification.associated_time is not None:
+                heapq.heappush(
+                    self.schedule, (notification.associated_time, next(self._schedule_counter), notification)
                 )
+        if self.schedule and self.schedule[0] is not previous_next:
+            self.arm_timer()
+        return new_notifications
 
     def check_notifications(self) -> None:
         """
-        Method which cyclically checks whether a notification should be displayed
+        Method moves every due notification to the pop-up queue, displays the queue
+        and arms the timer for the next notification.
+        Only notifications at the top of the schedule are looked at, so each one costs O(log n).
         :return: Nothing
         """
-
         now = datetime.now()
+        due_found = False
+
+        while self.schedule and self.schedule[0][0] <= now:
+            notification = heapq.heappop(self.schedule)[2]
+            if not self.is_pending(notification):
+                continue
+            self.pending_popups.append(notification)
+            due_found = True
+
+        if due_found:
+            self.display_pending()
+        self.arm_timer()
+
+    def display_pending(self) -> None:
+        """
+        Method shows queued notifications as one pop-up and marks them as read.
+        Nothing is shown while a pop-up is visible, the queue is displayed again when it closes.
+        Pop-ups shown sooner than min_popup_interval_ms after the previous one are delayed.
+        :return: Nothing
+        """
+        if not self.checking or self.popup_id is not None:
+            return
+        if self.popup_window is not None and self.popup_window.active:
+            return
+
+        pending = [notification for notification in self.pending_popups if self.is_pending(notification)]
+        self.pending_popups.clear()
+        if not pending:
+            return
+
+        if self.last_popup_time is not None:
+            elapsed_ms = (time.monotonic() - self.last_popup_time) * 1000
+            if elapsed_ms < self.min_popup_interval_ms:
+                self.pending_popups.extend(pending)
+                self.popup_id = self.app.after(int(self.min_popup_interval_ms - elapsed_ms) + 1, self._popup_timer)
+                return
+
+        if len(pending) >= self.batch_threshold:
+            shown = self.show_popup(self.batch_text(pending))
+        else:
+            shown = self.show_notification(pending[0])
+        if not shown:
+            self.pending_popups.extend(pending)
+            return
+
+        self.last_popup_time = time.monotonic()
+        self.mark_displayed(pending)
+
+    def _popup_timer(self) -> None:
+        """
+        Method called by the rate limiting timer, displays the queued notifications.
+        :return: Nothing
+        """
+        self.popup_id = None
+        self.display_pending()
 
-        for notification in self.get_unread_notifications():
-            if notification.associated_time is not None and now >= notification.associated_time:
-                if self.show_notification(notification):
-                    notification.is_read = True
-                    Db.update_notification(
-                        notification_id=notification.id,
-                        is_read=True,
-                        user_id=notification.user_id,
-                        associated_time=str(notification.associated_time),
-                        message=notification.message,
-                        notification_type=notification.notification_type.value,
-                    )
-                    if self.notifications_updated is not None:
-                        self.notifications_updated()
-
-        self.check_id = self.app.after(self.check_interval_ms, self.check_notifications)
+    def _on_popup_closed(self) -> None:
+        """
+        Method called when a pop-up closes, displays notifications queued in the meantime.
+        :return: Nothing
+        """
+        self.popup_window = None
+        if self.pending_popups:
+            self.display_pending()
+
+    def batch_text(self, notifications: list[Notification]) -> str:
+        """
+        Method creates the text of a pop-up summarising several notifications.
+        :param notifications: Notifications to summarise
+        :return: Text listing the first batch_preview messages and the number of remaining ones
+        """
+        lines = [f"{len(notifications)} reminders due"]
+        lines.extend(
+            f"- {notification.message}" for notification in itertools.islice(notifications, self.batch_preview)
+        )
+        if len(notifications) > self.batch_preview:
+            lines.append(f"and {len(notifications) - self.batch_preview} more")
+        return "\n".join(lines)
+
+    def mark_displayed(self, notifications: list[Notification]) -> None:
+        """
+        Method marks displayed notifications as read with a single database statement.
+        :param notifications: Displayed notifications
+        :return: Nothing
+        """
+        for notification in notifications:
+            notification.is_read = True
+            self.unread.pop(notification.id, None)
+        Db.mark_notifications_read(notification_ids=[notification.id for notification in notifications])
+        if self.notifications_updated is not None:
+            self.notifications_updated()
+
+    def arm_timer(self, delay_ms: int | None = None) -> None:
+        """
+        Method replaces the pending timer with one firing at the next due notification.
+        No timer is armed when nothing is scheduled or checking was stopped.
+        :param delay_ms: Optional delay overriding the one computed from the schedule
+        :return: Nothing
+        """
+        if not self.checking:
+            return
+        if self.check_id:
+            self.app.after_cancel(self.check_id)
+            self.check_id = None
+
+        while self.schedule and not self.is_pending(self.schedule[0][2]):
+            heapq.heappop(self.schedule)
+
+        if delay_ms is None:
+            if not self.schedule:
+                return
+            seconds_left = (self.schedule[0][0] - datetime.now()).total_seconds()
+            delay_ms = min(max(int(seconds_left * 1000) + 1, 0), self.max_wait_ms)
+        self.check_id = self.app.after(delay_ms, self.check_notifications)
 
     def stop_checking(self) -> None:
         """
         Method that stops notification checking process
         :return: Nothing
         """
+        self.checking = False
         if self.check_id:
             self.app.after_cancel(self.check_id)
             self.check_id = None
+        if self.popup_id:
+            self.app.after_cancel(self.popup_id)
+            self.popup_id = None
 
     def show_notification(self, notification: Notification) -> bool:
         """
         Method responsible for displaying a notification
         :param notification: Notification to be displayed
-        :return: Whether the notification is still active
-        """
-        if self.popup_window:
-            if not self.popup_window.active:
-                del self.popup_window
-                self.popup_window = None
-            return False
-        self.popup_window = NotificationPopUp(self.app, notification.message)
+        :return: Whether the notification was displayed
+        """
+        return self.show_popup(notification.message)
+
+    def show_popup(self, text: str) -> bool:
+        """
+        Method displays a pop-up unless another one is still visible
+        :param text: Text of the pop-up
+        :return: Whether the pop-up was displayed
+        """
+        if self.popup_window is not None:
+            if self.popup_window.active:
+                return False
+            self.popup_window = None
+        self.popup_window = NotificationPopUp(self.app, text, on_close=self._on_popup_closed)
         return True
 
 
@@ -0,0 +1,66 @@
+"""
+File contains colors shared by notes, calendar and charts
+"""
+
+from functools import lru_cache
+
+NOTE_COLORS: dict[str, str] = {
+    "red": "#FF6B6B",
+    "green": "#55EFC4",
+    "blue": "#74B9FF",
+    "brown": "#B08968",
+    "purple": "#A29BFE",
+}
+FALLBACK_NOTE_COLOR: str = NOTE_COLORS["red"]
+DEFAULT_NOTE_COLORS: tuple[str, ...] = ("#ada132", "#2d7523", "#1e6a6e")
+HOVER_FACTOR: float = 0.8
+
+CHART_COLORS: dict[str, tuple[str, str]] = {
+    "dark": ("#242424", "white"),
+    "light": ("white", "black"),
+}
+GRADE_PIE_COLORS: tuple[str, ...] = ("seagreen", "darkgreen", "green", "forestgreen", "limegreen", "lime")
+
+
+def note_color(color_name: str) -> str:
+    """
+    Converts note color name to hex representation.
+    :param color_name: Name of a given color
+    :return: Hex code for a given color, FALLBACK_NOTE_COLOR for unknown names
+    """
+    return NOTE_COLORS.get(color_name, FALLBACK_NOTE_COLOR)
+
+
+@lru_cache(maxsize=256)
+def darken_color(hex_color: str, factor: float = HOVER_FACTOR) -> str:
+    """
+    Generates a new color code based on factor variable, results are memoized.
+    :param hex_color: Original color in #RRGGBB format
+    :param factor: Factor based on which the color is modified <1 - color is darker >1 color is lighter
+    :return: Modified color code
+    """
+    hex_color = hex_color.lstrip("#")
+    r = int(int(hex_color[0:2], 16) * factor)
+    g = int(int(hex_color[2:4], 16) * factor)
+    b = int(int(hex_color[4:6], 16) * factor)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+@lru_cache(maxsize=64)
+def note_palette(color_name: str) -> tuple[str, str]:
+    """
+    Returns colors used to draw a note, results are memoized.
+    :param color_name: Name of the note color
+    :return: Tuple of foreground color and hover color
+    """
+    color = note_color(color_name)
+    return color, darken_color(color)
+
+
+def chart_colors(theme: str) -> tuple[str, str]:
+    """
+    Returns colors of a chart for a given theme.
+    :param theme: 'light' or 'dark', anything else is treated as 'light'
+    :return: Tuple of background color and text color
+    """
+    return CHART_COLORS.get(theme, CHART_COLORS["light"])
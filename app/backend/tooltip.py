@@ -1,9 +1,103 @@
+import tkinter as tk
+from typing import Callable
+
 import customtkinter as ctk
 
 
+class TooltipManager:
+    """
+    Class keeps a single hidden toplevel window shared by all tooltips.
+    The window is moved and relabeled on hover instead of being created and destroyed,
+    labels inside it are pooled and reused.
+    """
+
+    window: ctk.CTkToplevel | None = None
+    labels: list[ctk.CTkLabel] = []
+    owner: "Tooltip | None" = None
+    transparent_color: str = "#010203"
+
+    @staticmethod
+    def _ensure_window(widget: tk.Misc) -> ctk.CTkToplevel:
+        """
+        Returns the shared tooltip window, creating it if it does not exist yet or was destroyed with its root.
+        :param widget: Widget whose toplevel owns a newly created window
+        :return: Shared tooltip window
+        """
+        window = TooltipManager.window
+        try:
+            if window is not None and window.winfo_exists():
+                return window
+        except tk.TclError:
+            pass
+
+        window = ctk.CTkToplevel(widget.winfo_toplevel())
+        window.withdraw()
+        window.overrideredirect(True)
+        window.configure(fg_color=TooltipManager.transparent_color)
+        try:
+            window.wm_attributes("-transparentcolor", TooltipManager.transparent_color)
+        except tk.TclError:
+            pass
+        TooltipManager.window = window
+        TooltipManager.labels = []
+        TooltipManager.owner = None
+        return window
+
+    @staticmethod
+    def show(tooltip: "Tooltip") -> None:
+        """
+        Method shows entries of a tooltip in the shared window below its widget.
+        :param tooltip: Tooltip to show
+        :return: Nothing
+        """
+        window = TooltipManager._ensure_window(tooltip.widget)
+        labels = TooltipManager.labels
+
+        for i, (text, color) in enumerate(tooltip.entries):
+            if i == len(labels):
+                labels.append(
+                    ctk.CTkLabel(
+                        window,
+                        text="",
+                        corner_radius=8,
+                        text_color=("black", "white"),
+                        padx=10,
+                        pady=6,
+                    )
+                )
+            labels[i].configure(text=text, fg_color=("black", color), wraplength=tooltip.wrap_length)
+            labels[i].pack(side="left", anchor="n", padx=(0, 15))
+        for i in range(len(tooltip.entries), len(labels)):
+            labels[i].pack_forget()
+
+        x = tooltip.widget.winfo_rootx() + tooltip.x_offset
+        y = tooltip.widget.winfo_rooty() + tooltip.widget.winfo_height() + tooltip.y_offset
+        window.geometry(f"+{int(x)}+{int(y)}")
+        window.deiconify()
+        window.lift()
+        TooltipManager.owner = tooltip
+
+    @staticmethod
+    def hide(tooltip: "Tooltip | None" = None) -> None:
+        """
+        Method hides the shared window if it shows the given tooltip.
+        :param tooltip: Tooltip to hide, any tooltip is hidden if not given
+        :return: Nothing
+        """
+        if TooltipManager.owner is None or (tooltip is not None and TooltipManager.owner is not tooltip):
+            return
+        TooltipManager.owner = None
+        try:
+            if TooltipManager.window is not None:
+                TooltipManager.window.withdraw()
+        except tk.TclError:
+            TooltipManager.window = None
+
+
 class Tooltip:
     """
-    Class manages creating, displaying and hiding a tooltip for a chosen widget
+    Class manages displaying and hiding a tooltip for a chosen widget.
+    A tooltip may hold several entries, every entry is shown as a separate label with its own color.
     """
 
     def __init__(
@@ -17,25 +111,64 @@ class Tooltip:
         y_offset: float = 0,
     ) -> None:
         self.widget = widget
-        self.text = text
         self.delay = delay
         self.wrap_length = wrap_length
-        self.color = color
         self.x_offset = x_offset
         self.y_offset = y_offset
+        self.entries: list[tuple[str, str]] = []
+        self.configure(text, color)
 
-        self.tooltip_window = None
         self.after_id = None
 
         widget.bind("<Enter>", self.on_enter)
         widget.bind("<Leave>", self.on_leave)
 
+    @property
+    def text(self) -> str:
+        """
+        Text of the first entry of the tooltip.
+        :return: Text or an empty string if the tooltip has no entries
+        """
+        return self.entries[0][0] if self.entries else ""
+
+    @property
+    def color(self) -> str:
+        """
+        Color of the first entry of the tooltip.
+        :return: Color or an empty string if the tooltip has no entries
+        """
+        return self.entries[0][1] if self.entries else ""
+
+    def configure(self, text: str | None = None, color: str | None = None) -> None:
+        """
+        Method replaces entries of the tooltip with a single one, an empty text disables the tooltip
+        :param text: New text of the tooltip
+        :param color: New background color of the tooltip
+        :return: Nothing
+        """
+        text = self.text if text is None else text
+        color = (self.color or "#3B8ED0") if color is None else color
+        self.set_entries([(text, color)] if text else [])
+
+    def set_entries(self, entries: list[tuple[str, str]]) -> None:
+        """
+        Method replaces entries of the tooltip, entries with an empty text are skipped
+        :param entries: List of tuples of text and background color
+        :return: Nothing
+        """
+        self.entries = [(text, color) for text, color in entries if text]
+        self.hide_tooltip()
+
     def on_enter(self, event=None) -> None:
         """
         Method defines an on enter event for widget
         :param event: Empty event required for compilation
         :return: Nothing
         """
+        if not self.entries:
+            return
+        if self.after_id:
+            self.widget.after_cancel(self.after_id)
         self.after_id = self.widget.after(self.delay, self.show_tooltip)
 
     def on_leave(self, event=None):
@@ -51,43 +184,19 @@ class Tooltip:
 
     def show_tooltip(self) -> None:
         """
-        Method creates tooltip for the widget
+        Method shows the tooltip in the shared tooltip window
         :return: Nothing
         """
-        if self.tooltip_window:
-            return
-
-        x = self.widget.winfo_rootx() + self.x_offset
-        y = self.widget.winfo_rooty() + self.widget.winfo_height() + self.y_offset
-
-        self.tooltip_window = tw = ctk.CTkToplevel(self.widget)
-        tw.overrideredirect(True)
-        tw.geometry(f"+{x}+{y}")
-
-        transparent_color = "#010203"
-        tw.configure(fg_color=transparent_color)
-        tw.wm_attributes("-transparentcolor", transparent_color)
-
-        label = ctk.CTkLabel(
-            tw,
-            text=self.text,
-            fg_color=("black", self.color),
-            corner_radius=8,
-            text_color=("black", "white"),
-            padx=10,
-            pady=6,
-            wraplength=self.wrap_length,
-        )
-        label.pack()
+        self.after_id = None
+        if self.entries:
+            TooltipManager.show(self)
 
     def hide_tooltip(self) -> None:
         """
-        Method hides and destroys tooltip of the widget
+        Method hides the tooltip if it is currently shown
         :return: Nothing
         """
-        if self.tooltip_window:
-            self.tooltip_window.destroy()
-            self.tooltip_window = None
+        TooltipManager.hide(self)
 
 
 class NotificationPopUp:
@@ -103,6 +212,7 @@ class NotificationPopUp:
         wrap_length: int = 250,
         x_offset: float = 10,
         y_offset: float = 10,
+        on_close: Callable[[], None] | None = None,
     ) -> None:
         self.widget = widget
         self.text = text
@@ -110,6 +220,7 @@ class NotificationPopUp:
         self.color = color
         self.x_offset = x_offset
         self.y_offset = y_offset
+        self.on_close = on_close
         self.active = True
 
         self.popup_window = None
@@ -168,3 +279,5 @@ class NotificationPopUp:
             self.popup_window.destroy()
             self.popup_window = None
             self.active = False
+            if self.on_close is not None:
+                self.on_close()
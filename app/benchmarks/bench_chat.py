@@ -0,0 +1,146 @@
+"""
+File contains a load test of the chat Server with many simulated clients.
+Run it with: python -m app.benchmarks.bench_chat [clients] [messages per client]
+"""
+
+import asyncio
+import json
+import socket
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import websockets
+
+from app.backend.chat import Server
+
+
+def _payload(sender: str, recipient: str, msg: str) -> bytes:
+    """
+    Builds a chat payload for a simulated client.
+    :param sender: uuid of the sender
+    :param recipient: uuid of the recipient
+    :param msg: message text
+    :return: Encoded payload
+    """
+    return json.dumps({"name": sender, "sender": sender, "recipient": recipient, "msg": msg}).encode("utf-8")
+
+
+def bench_mailboxes(users: int, messages: int) -> float:
+    """
+    Measures queueing and draining of messages for offline users, without networking.
+    :param users: Number of offline users
+    :param messages: Number of messages queued for each user
+    :return: Average microseconds per queued and drained message
+    """
+    Server.mailboxes.clear()
+    started = time.perf_counter()
+    for i in range(messages):
+        for user in range(users):
+            Server.enqueue(str(user), {"msg": i})
+    for user in range(users):
+        while Server.drain(str(user), Server.batch_size):
+            pass
+    return (time.perf_counter() - started) / (users * messages) * 1e6
+
+
+async def _simulate_clients(url: str, clients: int, messages: int) -> tuple[int, float]:
+    """
+    Connects subscribed clients which all send messages to each other.
+    :param url: Url of the server
+    :param clients: Number of simulated clients
+    :param messages: Number of messages sent by every client
+    :return: Tuple of received messages count and maximal delivery latency in milliseconds
+    """
+    connections = [await websockets.connect(url, max_queue=None) for _ in range(clients)]
+    for user, connection in enumerate(connections):
+        await connection.send(_payload(str(user), "-1", "subscribe"))
+    await asyncio.sleep(0.1)
+
+    expected = clients * messages
+    received = 0
+    max_latency = 0.0
+    done = asyncio.Event()
+
+    async def listen(connection) -> None:
+        nonlocal received, max_latency
+        async for batch in connection:
+            for message in json.loads(batch):
+                max_latency = max(max_latency, time.perf_counter() - float(message["msg"]))
+                received += 1
+            if received >= expected:
+                done.set()
+
+    listeners = [asyncio.create_task(listen(connection)) for connection in connections]
+    for i in range(messages):
+        for user, connection in enumerate(connections):
+            await connection.send(_payload(str(user), str((user + i + 1) % clients), str(time.perf_counter())))
+    try:
+        await asyncio.wait_for(done.wait(), timeout=60)
+    except asyncio.TimeoutError:
+        pass
+    for connection in connections:
+        await connection.close()
+    await asyncio.gather(*listeners, return_exceptions=True)
+    return received, max_latency * 1000
+
+
+def bench_clients(clients: int, messages: int) -> dict[str, float]:
+    """
+    Runs a server with a fresh message log on a free port and measures throughput of many connected clients.
+    :param clients: Number of simulated clients
+    :param messages: Number of messages sent by every client
+    :return: Dictionary of measured values
+    """
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        port = sock.getsockname()[1]
+    original_port, original_log_path = Server.port, Server.log_path
+    log_directory = tempfile.TemporaryDirectory()
+    Server.port = port
+    Server.log_path = os.path.join(log_directory.name, "server.sqlite3")
+    thread = threading.Thread(target=Server.run, daemon=True)
+    thread.start()
+    for _ in range(100):
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.1):
+                break
+        except OSError:
+            time.sleep(0.02)
+    try:
+        started = time.perf_counter()
+        received, max_latency = asyncio.run(_simulate_clients(f"ws://localhost:{port}", clients, messages))
+        elapsed = time.perf_counter() - started
+    finally:
+        Server.stop()
+        thread.join(timeout=5)
+        Server.port, Server.log_path = original_port, original_log_path
+        Server.mailboxes.clear()
+        log_directory.cleanup()
+    return {
+        "received": received,
+        "messages per second": received / elapsed,
+        "max latency ms": max_latency,
+    }
+
+
+def run(clients: int = 200, messages: int = 20) -> dict[str, float]:
+    """
+    Runs all chat benchmarks.
+    :param clients: Number of simulated clients
+    :param messages: Number of messages sent by every client
+    :return: Dictionary of measured values
+    """
+    results = bench_clients(clients, messages)
+    results["mailbox us per message (100 users)"] = bench_mailboxes(100, messages * 10)
+    results["mailbox us per message (5000 users)"] = bench_mailboxes(5000, messages * 10)
+    return results
+
+
+if __name__ == "__main__":
+    clients_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    messages_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    for name, value in run(clients_count, messages_count).items():
+        print(f"{name:<38} {value:12.2f}")
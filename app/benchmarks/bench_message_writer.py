@@ -0,0 +1,60 @@
+"""
+File contains a benchmark of saving a burst of received chat messages.
+Run it with: python -m app.benchmarks.bench_message_writer [messages]
+"""
+
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+
+from app.backend.chat import Client
+from app.backend.database import Db
+
+
+def _produce(messages: list[dict]) -> None:
+    """
+    Puts messages into the Client queue, blocking while it is full, like Client.receive does.
+    :param messages: Messages to put
+    :return: Nothing
+    """
+    for message in messages:
+        Client.msg_queue.put(message)
+
+
+def run(count: int = 10_000) -> dict[str, float]:
+    """
+    Pushes a burst of messages through the bounded queue and measures how long it takes
+    until the background writer has saved all of them.
+    :param count: Number of messages in the burst
+    :return: Dictionary of measured values
+    """
+    original_path, original_queue = Db.db_path, Client.msg_queue
+    directory = tempfile.TemporaryDirectory()
+    Db.configure(os.path.join(directory.name, "bench.sqlite3"))
+    Client.msg_queue = queue.Queue(maxsize=Client.queue_size)
+    Db.get_connection()
+    messages = [{"name": "A", "sender": "A", "recipient": "B", "msg": f"msg {i}", "seq": i + 1} for i in range(count)]
+    try:
+        Db.start_message_writer()
+        started = time.perf_counter()
+        producer = threading.Thread(target=_produce, args=(messages,))
+        producer.start()
+        producer.join()
+        Db.dequeue_messages(timeout=None)
+        elapsed = time.perf_counter() - started
+        saved = Db.get_connection().execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+    finally:
+        Db.stop_message_writer()
+        Db.configure(original_path)
+        Client.msg_queue = original_queue
+        directory.cleanup()
+    return {"saved": saved, "seconds": elapsed, "messages per second": saved / elapsed}
+
+
+if __name__ == "__main__":
+    messages_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    for name, value in run(messages_count).items():
+        print(f"{name:<22} {value:12.3f}")
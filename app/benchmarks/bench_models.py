@@ -0,0 +1,140 @@
+"""
+File contains a benchmark of loading model objects from database rows.
+Run it with: python -m app.benchmarks.bench_models [rows]
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable
+
+from app.backend.grade_monitor import GradeMonitor
+from app.backend.notes import Note
+from app.backend.notifications import Notification
+
+
+class LegacyNote:
+    """
+    Note model as it was before slots, used as a baseline
+    """
+
+    def __init__(
+        self, id: int, user_id: int, title: str, content: str, color: str = "", associated_date: datetime | None = None
+    ) -> None:
+        self.id = id
+        self.user_id = user_id
+        self.title = title
+        self.content = content
+        self.created_at = str(datetime.now().strftime("%Y-%m-%d %H:%M"))
+        self.associated_date = associated_date
+        self.color = color
+
+
+class LegacyNotification:
+    """
+    Notification model as it was before slots, used as a baseline
+    """
+
+    def __init__(
+        self, id: int, user_id: str, message: str, notification_type: int, is_read: bool, associated_time: datetime
+    ) -> None:
+        self.id = id
+        self.user_id = user_id
+        self.message = message
+        self.notification_type = notification_type
+        self.is_read = is_read
+        self.associated_time = associated_time
+
+
+def legacy_load_notes(rows: list[tuple[int, str, str, str, int, str, str]]) -> list[LegacyNote]:
+    """
+    Loads notes the way NoteManager did before bulk construction.
+    :param rows: Rows of the notes table
+    :return: List of notes
+    """
+    notes = []
+    for note_id, title, content, created_at, user_id, associated_date, color in rows:
+        note = LegacyNote(
+            note_id, user_id, title, content, color, datetime.strptime(associated_date, "%Y-%m-%d %H:%M:%S")
+        )
+        note.created_at = created_at
+        notes.append(note)
+    return notes
+
+
+def legacy_load_notifications(rows: list[tuple[int, str, str, int, int, str]]) -> list[LegacyNotification]:
+    """
+    Loads notifications the way NotificationManager did before bulk construction.
+    :param rows: Rows of the notifications table
+    :return: List of notifications
+    """
+    notifications = []
+    for notification_id, user_id, message, notification_type, is_read, associated_time in rows:
+        datetime.strptime(associated_time, "%Y-%m-%d %H:%M:%S")
+        notifications.append(
+            LegacyNotification(
+                notification_id,
+                user_id,
+                message,
+                notification_type,
+                bool(is_read),
+                datetime.strptime(associated_time, "%Y-%m-%d %H:%M:%S"),
+            )
+        )
+    return notifications
+
+
+def make_rows(count: int) -> dict[str, list]:
+    """
+    Generates rows shaped like the ones fetched from the database.
+    :param count: Number of rows of each kind
+    :return: Dictionary of row lists keyed by table name
+    """
+    start = datetime(2026, 1, 1)
+    dates = [(start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S") for i in range(count)]
+    return {
+        "notes": [(i, f"Title {i}", "Content", "2026-01-01 10:00", 1, dates[i], "#2d7523") for i in range(count)],
+        "notifications": [(i, "1", f"Message {i}", i % 5 + 1, i % 2, dates[i]) for i in range(count)],
+        "grades": [(float(i % 4 + 2), f"Subject {i % 40}", 5, 1.0, i % 4 + 1, i) for i in range(count)],
+    }
+
+
+def measure(loader: Callable[[], object]) -> tuple[float, float]:
+    """
+    Measures time and peak memory of a loader. Memory is traced in a separate run,
+    because tracing slows allocations down.
+    :param loader: Function building model objects
+    :return: Tuple of seconds and peak megabytes
+    """
+    started = time.perf_counter()
+    loader()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    loader()
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(count: int = 100_000) -> dict[str, tuple[float, float]]:
+    """
+    Runs all model loading benchmarks.
+    :param count: Number of rows of each kind
+    :return: Dictionary of benchmark names and their time and peak memory
+    """
+    rows = make_rows(count)
+    return {
+        "notes (legacy)": measure(lambda: legacy_load_notes(rows["notes"])),
+        "notes": measure(lambda: Note.from_rows(rows["notes"])),
+        "notifications (legacy)": measure(lambda: legacy_load_notifications(rows["notifications"])),
+        "notifications": measure(lambda: Notification.from_rows(rows["notifications"])),
+        "grades": measure(lambda: GradeMonitor(rows["grades"])),
+    }
+
+
+if __name__ == "__main__":
+    rows_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for name, (seconds, megabytes) in run(rows_count).items():
+        print(f"{name:<24} {seconds * 1000:9.1f} ms {megabytes:9.1f} MB")
@@ -2,9 +2,12 @@
 This file contains main window script.
 """
 
+import queue
+
 import customtkinter as ctk
 from PIL import Image
 
+from app.backend.maintenance import MaintenanceJob
 from app.backend.notifications import initiate_notification_manager, NotificationManager
 from app.frontend.buttons import ButtonsCreator as ButtonsCreator
 from app.frontend.icons import IconsHolder as IconsHolder
@@ -93,6 +96,7 @@ class AppGUI(ctk.CTk):
         self.geometry("961x541")
         self.minsize(961, 541)
         self.notifications_manager: NotificationManager | None = None
+        self.maintenance_id: str | None = None
 
         # Basic main app window setup
         self.grid_maker: GridMaker = GridMaker(self, rows=9, columns=24)
@@ -100,6 +104,8 @@ class AppGUI(ctk.CTk):
         self.login_view.pack(expand=True, fill="both")
 
         self.protocol("WM_DELETE_WINDOW", self.close_app)
+        self.bind_all("<Key>", MaintenanceJob.note_activity, add="+")
+        self.bind_all("<Button>", MaintenanceJob.note_activity, add="+")
 
     def show_main_app(self) -> None:
         """
@@ -109,6 +115,9 @@ class AppGUI(ctk.CTk):
         """
         self.login_view.pack_forget()
         self.notifications_manager = initiate_notification_manager(self)
+        if self.notifications_manager is not None:
+            MaintenanceJob.notification_cutoffs = queue.SimpleQueue()
+            self.apply_maintenance()
         self.btn_icons: IconsHolder = IconsHolder()
         self.left_frame: LeftFrame = LeftFrame(self, color=("#c7c7c7", "#444444"))
         self.right_frame: RightFrame = RightFrame(self, color=("#ebebeb", "#242424"))
@@ -227,11 +236,33 @@ class AppGUI(ctk.CTk):
                 self.buttons.create_buttons()
                 self.labels.resize_logo(new_font_img_size * 6)
 
+    def apply_maintenance(self) -> None:
+        """
+        Method removes read notifications expired by the maintenance job through the notification manager,
+        so the manager and the notifications view never show rows already deleted from database.
+        :return: Nothing, reschedules itself.
+        """
+        cutoffs = MaintenanceJob.notification_cutoffs
+        if cutoffs is None or self.notifications_manager is None:
+            return
+        removed = 0
+        while not cutoffs.empty():
+            removed += self.notifications_manager.delete_read_older_than(cutoffs.get())
+        if removed and self.notifications_manager.notifications_updated is not None:
+            self.notifications_manager.notifications_updated()
+        self.maintenance_id = self.after(1000, self.apply_maintenance)
+
     def close_app(self) -> None:
         """
         Method that manages closing all processes before terminating application
         :return:
         """
+        if self.maintenance_id is not None:
+            self.after_cancel(self.maintenance_id)
+            self.maintenance_id = None
+        MaintenanceJob.notification_cutoffs = None
+        self.unbind_all("<Key>")
+        self.unbind_all("<Button>")
         if self.notifications_manager is not None:
             self.notifications_manager.stop_checking()
         self.quit()
@@ -2,6 +2,8 @@
 This file contains views for all widgets.
 """
 
+import queue
+import threading
 import random
 import calendar
 import json
@@ -13,7 +15,6 @@ from abc import ABC, abstractmethod
 from CTkListbox import CTkListbox
 
 import customtkinter as ctk
-import tkinter.font as tkFont
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
@@ -26,10 +27,12 @@ from app.backend.charts import (
     all_grades_pie_plot,
 )
 from app.backend.database import Db
+from app.backend.maintenance import MaintenanceJob
 from app.backend.notifications import NotificationManager, NotificationType, Notification
 from app.backend.registration import Auth, get_all_users
-from app.backend.notes import initiate_note_manager
+from app.backend.notes import NoteCache
 from app.backend.notes import Note
+from app.backend.theme import HOVER_FACTOR, NOTE_COLORS, darken_color, note_color, note_palette
 from app.backend.tooltip import Tooltip
 from app.backend.chat import Client, Server
 from app.backend.session import Session
@@ -62,10 +65,16 @@ class CalendarView(BaseView):
     View for calendar widget.
     """
 
+    weeks_in_grid = 6
+    week_days = ("Mo", "Tu", "We", "Th", "Fr", "Sa", "Su")
+
     def __init__(self, parent: ctk.CTk) -> None:
         super().__init__(parent)
         self.current_date = datetime.now()
-        self.note_manager = initiate_note_manager()
+        self.day_cells: list[list[ctk.CTkButton]] = []
+        self.day_tooltips: list[list[Tooltip]] = []
+        self.cell_states: list[list[tuple[int, str | None, bool] | None]] = []
+        self.default_cell_colors: tuple[str | tuple[str, str], str | tuple[str, str]] = ("", "")
         self.create_frame_content()
         self.pack_propagate(False)
 
@@ -88,6 +97,7 @@ class CalendarView(BaseView):
 
         self.calendar_frame = ctk.CTkFrame(self)
         self.calendar_frame.pack(pady=10, padx=20, fill="both", expand=True)
+        self.create_calendar_grid()
 
         footer_frame = ctk.CTkFrame(self)
         footer_frame.pack(pady=5, padx=20)
@@ -107,62 +117,94 @@ class CalendarView(BaseView):
 
         self.update_calendar()
 
-    def update_calendar(self, notes: list[Note] | None = None) -> None:
+    def create_calendar_grid(self) -> None:
         """
-        This method updates the calendar view with the according month and a year destroying previous widgets
-        and creating new ones in their place
+        This method creates weekday labels and a pool of day cells covering the largest possible month.
+        The cells are reused by update_calendar, so switching months creates no widgets.
         :return: Nothing
         """
-        self.note_manager = initiate_note_manager()
+        for idx, day in enumerate(self.week_days):
+            lab = ctk.CTkLabel(self.calendar_frame, text=day, font=("Roboto", 20, "bold"))
+            lab.grid(row=0, column=idx, padx=self._cell_padx(idx), pady=(6, 3))
 
-        for widget in self.calendar_frame.winfo_children():
-            widget.destroy()
+        for r in range(self.weeks_in_grid):
+            row_cells: list[ctk.CTkButton] = []
+            for c in range(len(self.week_days)):
+                btn = ctk.CTkButton(self.calendar_frame, text="", width=40, height=30, font=("Roboto", 18, "bold"))
+                btn.configure(command=lambda b=btn: self.placeholder_action(b))
+                row_cells.append(btn)
+            self.day_cells.append(row_cells)
+            self.day_tooltips.append([Tooltip(btn, "") for btn in row_cells])
+            self.cell_states.append([None for _ in row_cells])
 
+        first_cell = self.day_cells[0][0]
+        self.default_cell_colors = (first_cell.cget("fg_color"), first_cell.cget("hover_color"))
+
+        for col in range(len(self.week_days)):
+            self.calendar_frame.grid_columnconfigure(col, weight=1)
+        self.calendar_frame.grid_rowconfigure(0, weight=1)
+
+    def _cell_padx(self, column: int) -> int | tuple[int, int]:
+        """
+        Returns horizontal padding of a calendar column, outer columns keep a wider margin.
+        :param column: Column index
+        :return: Padding usable as grid padx
+        """
+        if column == 0:
+            return 6, 3
+        if column == len(self.week_days) - 1:
+            return 3, 6
+        return 3
+
+    def update_calendar(self, notes: list[Note] | None = None) -> None:
+        """
+        This method updates the calendar view with the according month and a year, reconfiguring the pooled
+        day cells in place. Notes of the month come from NoteCache unless notes are given.
+        :param notes: Optional notes to display instead of the stored ones
+        :return: Nothing
+        """
         year, month = self.current_date.year, self.current_date.month
         self.header.configure(text=f"{calendar.month_name[month]} {year}")
 
-        week_days = ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]
-        for idx, day in enumerate(week_days):
-            lab = ctk.CTkLabel(self.calendar_frame, text=day, font=("Roboto", 20, "bold"))
-            lab.grid(row=0, column=idx, padx=3, pady=(6, 3))
-            if idx == 0:
-                lab.grid_configure(padx=(6, 3))
-            if idx == len(week_days) - 1:
-                lab.grid_configure(padx=(3, 6))
-
-        current_notes: list[Note]
+        notes_by_day: dict[int, list[Note]]
         if notes is None or len(notes) <= 0:
-            current_notes = self.get_notes_for_current_month()
+            notes_by_day = NoteCache.get_month(year, month)
         else:
-            current_notes = notes
+            notes_by_day = NoteCache.index_by_day(notes)
 
         cal = calendar.monthcalendar(year, month)
-        for r, w in enumerate(cal, start=1):
-            for c, d in enumerate(w):
-                if d == 0:
-                    continue
-                btn = ctk.CTkButton(self.calendar_frame, text=str(d), width=40, height=30, font=("Roboto", 18, "bold"))
-                btn.configure(command=lambda b=btn: self.placeholder_action(b))
-                btn.grid(row=r, column=c, padx=3, pady=3, sticky="nsew")
-                if c == 0:
-                    btn.grid_configure(padx=(6, 3))
-                if c == len(w) - 1:
-                    btn.grid_configure(padx=(3, 6))
-                if r == len(cal):
-                    btn.grid_configure(pady=(3, 6))
-                date_notes: list[Note] = [
-                    n for n in current_notes if n.associated_date is not None and n.associated_date.day == d
-                ]
-                for i, note in enumerate(date_notes):
-                    Tooltip(btn, note.content, self.get_color(note.color), x_offset=i * 265 + 10)
-                    btn.configure(
-                        fg_color=self.get_color(note.color), hover_color=self.darken_color(self.get_color(note.color))
-                    )
+        for r in range(self.weeks_in_grid):
+            week = cal[r] if r < len(cal) else [0] * len(self.week_days)
+            for c, d in enumerate(week):
+                self.update_day_cell(r, c, d, r == len(cal) - 1, notes_by_day.get(d, []) if d else [])
+
+        for row in range(1, self.weeks_in_grid + 1):
+            self.calendar_frame.grid_rowconfigure(row, weight=1 if row <= len(cal) else 0)
+
+    def update_day_cell(self, row: int, column: int, day: int, last_week: bool, notes: list[Note]) -> None:
+        """
+        This method shows a pooled day cell with its day number, color and tooltips or hides it if the day is 0.
+        Widgets are only reconfigured when their state differs from the previous month.
+        :param row: Week index of the cell
+        :param column: Weekday index of the cell
+        :param day: Day of the month, 0 for cells outside of the month
+        :param last_week: Whether the cell lies in the last week of the month
+        :param notes: Notes associated with the day, all of them are merged into the cell's tooltip
+        :return: Nothing
+        """
+        btn = self.day_cells[row][column]
+        state = (day, notes[-1].color if notes else None, last_week) if day != 0 else None
+        if state != self.cell_states[row][column]:
+            if state is None:
+                btn.grid_remove()
+            else:
+                fg_color, hover_color = note_palette(notes[-1].color) if notes else self.default_cell_colors
+                btn.configure(text=str(day), fg_color=fg_color, hover_color=hover_color)
+                pady = (3, 6) if last_week else 3
+                btn.grid(row=row + 1, column=column, padx=self._cell_padx(column), pady=pady, sticky="nsew")
+            self.cell_states[row][column] = state
 
-        for col in range(7):
-            self.calendar_frame.grid_columnconfigure(col, weight=1)
-        for row in range(len(cal) + 1):
-            self.calendar_frame.grid_rowconfigure(row, weight=1)
+        self.day_tooltips[row][column].set_entries([(note.content, note_color(note.color)) for note in notes])
 
     def placeholder_action(self, btn: ctk.CTkButton) -> None:
         """
@@ -171,6 +213,9 @@ class CalendarView(BaseView):
         :return: Nothing
         """
         btn.configure(fg_color="#" + str(random.randint(100000, 999999)))
+        for row_cells, row_states in zip(self.day_cells, self.cell_states):
+            if btn in row_cells:
+                row_states[row_cells.index(btn)] = None
 
     def prev_month(self) -> None:
         """
@@ -199,39 +244,16 @@ class CalendarView(BaseView):
         Method gathers currently relevant notes pointing to dates in currently displayed month and year
         :return: List containing all relevant notes
         """
-        current_notes: list[Note] = []
-        if self.note_manager is not None:
-            current_notes = self.note_manager.get_all_notes()
-            if current_notes is not None:
-                current_notes = list(
-                    filter(
-                        lambda n: n.associated_date is not None
-                        and n.associated_date.year == self.current_date.year
-                        and n.associated_date.month == self.current_date.month,
-                        current_notes,
-                    )
-                )
-            else:
-                return []
-        return current_notes
+        return NoteCache.get_notes(self.current_date.year, self.current_date.month)
 
-    def darken_color(self, hex_color: str, factor: float = 0.8) -> str:
+    def darken_color(self, hex_color: str, factor: float = HOVER_FACTOR) -> str:
         """
         Method generates a new color code based on factor variable, used for button hover color
         :param hex_color: Original color
         :param factor: Factor based on which the color is modified <1 - color is darker >1 color is lighter
         :return: Modified color code
         """
-        hex_color = hex_color.lstrip("#")
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-
-        r = int(r * factor)
-        g = int(g * factor)
-        b = int(b * factor)
-
-        return f"#{r:02x}{g:02x}{b:02x}"
+        return darken_color(hex_color, factor)
 
     def get_color(self, color_name: str) -> str:
         """
@@ -239,17 +261,7 @@ class CalendarView(BaseView):
         :param color_name: Name of a given color
         :return: Hex code for a given color
         """
-        if color_name == "red":
-            return "#FF6B6B"
-        if color_name == "green":
-            return "#55EFC4"
-        if color_name == "blue":
-            return "#74B9FF"
-        if color_name == "brown":
-            return "#B08968"
-        if color_name == "purple":
-            return "#A29BFE"
-        return "#FF6B6B"
+        return note_color(color_name)
 
     def calendar_to_json(self) -> str:
         """
@@ -314,6 +326,8 @@ class NotificationsView(BaseView):
     def __init__(self, parent: ctk.CTk, notification_manager: NotificationManager | None) -> None:
         super().__init__(parent)
         self.notification_manager = notification_manager
+        self.type_filter = "-"
+        self.displayed_ids: list[int] = []
         if notification_manager is not None:
             notification_manager.notifications_updated = self.populate_notifications
         self.create_frame_content()
@@ -359,20 +373,32 @@ class NotificationsView(BaseView):
         add_button = ctk.CTkButton(self, text="Add", command=self.show_form, height=50, width=90)
         add_button.grid(row=26, column=5, pady=10, rowspan=4)
 
+        mark_all_read_button = ctk.CTkButton(
+            self, text="Mark all as Read", command=self.mark_all_as_read, height=50, width=90
+        )
+        mark_all_read_button.grid(row=30, column=3, pady=10, rowspan=4)
+
+        clear_read_button = ctk.CTkButton(self, text="Clear Read", command=self.clear_read, height=50, width=90)
+        clear_read_button.grid(row=30, column=4, pady=10, rowspan=4)
+
         self.populate_notifications()
 
     def populate_notifications(self, type_filter: str | None = None) -> None:
         """
-        Populates notifications list box with fetched notifications
+        Populates notifications list box with fetched notifications. The type filter is remembered,
+        so the list stays filtered when it is refreshed after a change.
+        :param type_filter: Optional name of the notification type to show, "-" shows all types
         :return: Nothing
         """
         self.notifications_listbox.delete(0, ctk.END)
+        self.displayed_ids = []
+        if type_filter is not None:
+            self.type_filter = type_filter
 
         if self.notification_manager is not None:
-            notifications: list[Notification]
-            notifications = self.notification_manager.get_all_notifications()
-            if type_filter is not None and type_filter != "-":
-                notifications = [n for n in notifications if n.notification_type.name == type_filter]
+            selected_type = NotificationType.__members__.get(self.type_filter)
+            notifications: list[Notification] = self.notification_manager.get_notifications(selected_type)
+            self.displayed_ids = [notification.id for notification in notifications]
 
             for notification in notifications:
                 notification_type = notification.notification_type.name
@@ -391,12 +417,39 @@ class NotificationsView(BaseView):
         :return: Nothing
         """
         if self.notification_manager is not None:
-            selected_index = self.notifications_listbox.curselection()
-            if selected_index is not None:
-                selected_notification = self.notification_manager.get_all_notifications()[selected_index]
-                self.notification_manager.mark_as_read(selected_notification.id)
+            selected_id = self.selected_notification_id()
+            if selected_id is not None:
+                self.notification_manager.mark_as_read(selected_id)
                 self.populate_notifications()
 
+    def selected_notification_id(self) -> int | None:
+        """
+        Maps the selected list box row to the id of the notification displayed in it
+        :return: Id of the selected notification or None if nothing is selected
+        """
+        selected_index = self.notifications_listbox.curselection()
+        if selected_index is None or not 0 <= selected_index < len(self.displayed_ids):
+            return None
+        return self.displayed_ids[selected_index]
+
+    def mark_all_as_read(self) -> None:
+        """
+        Marks every unread notification of the filtered type as read
+        :return: Nothing
+        """
+        if self.notification_manager is not None and self.mode == "list":
+            self.notification_manager.mark_all_read(NotificationType.__members__.get(self.type_filter))
+            self.populate_notifications()
+
+    def clear_read(self) -> None:
+        """
+        Deletes read notifications whose time has already passed
+        :return: Nothing
+        """
+        if self.notification_manager is not None and self.mode == "list":
+            self.notification_manager.delete_read_older_than(datetime.now())
+            self.populate_notifications()
+
     def filter_notifications(self) -> None:
         """
         Filters notifications by type
@@ -410,10 +463,9 @@ class NotificationsView(BaseView):
         :return:  Nothing
         """
         if self.notification_manager is not None and self.mode == "list":
-            selected_index = self.notifications_listbox.curselection()
-            if selected_index is not None:
-                selected_notification = self.notification_manager.get_all_notifications()[selected_index]
-                self.notification_manager.delete_notification(selected_notification.id)
+            selected_id = self.selected_notification_id()
+            if selected_id is not None:
+                self.notification_manager.delete_notification(selected_id)
                 self.populate_notifications()
 
     def show_form(self) -> None:
@@ -502,13 +554,18 @@ class NotesView(BaseView):
             "Edit note",
         )
 
-        self.note_colors = ("red", "green", "blue", "brown", "purple")
+        self.note_colors = tuple(NOTE_COLORS)
 
         self.note_id_data = self._update_options_data()
 
         self.labels_container: dict[str, ctk.CTkLabel] = {}
         self.options_container: dict[str, ctk.CTkOptionMenu] = {}
 
+        self.notes_page_size = 100
+        self.loaded_notes: list[tuple] = []
+        self.has_more_notes = False
+        self.appending_notes = False
+
         self.create_frame_content()
 
         self.note_views = {
@@ -521,37 +578,6 @@ class NotesView(BaseView):
         self.show_view(self.note_views["edit_note"])
         self.show_view(self.note_views["show_notes"])
 
-    def _get_separator_line(self) -> str:
-        """
-        Method generates separator line for separate line
-        :return: Nothing
-        """
-        self.update_idletasks()
-
-        try:
-            real_widget = self.notes_textbox._textbox
-        except AttributeError:
-            real_widget = self.notes_textbox
-
-        width_px = real_widget.winfo_width()
-
-        if width_px <= 1:
-            width_px = real_widget.winfo_reqwidth()
-
-        try:
-            font_spec = real_widget.cget("font")
-            font = tkFont.Font(font=font_spec)
-        except Exception:
-            font = tkFont.Font(family="Consolas", size=16)
-
-        dash_width = font.measure("-") or 10
-
-        width_px = max(1, width_px - 12)
-
-        count = max(1, int(width_px // dash_width))
-
-        return "-" * count
-
     @classmethod
     def _update_options_data(cls) -> tuple[str, ...]:
         """
@@ -677,7 +703,7 @@ class NotesView(BaseView):
             self.menu_label.configure(text="Invalid date format (YYYY-MM-DD)")
             return
 
-        succes = Db.insert_note(
+        note_id = Db.insert_note(
             title=title,
             content=content,
             created_at=created_at,
@@ -685,7 +711,8 @@ class NotesView(BaseView):
             associated_date=associated_date,
             color=color,
         )
-        if succes:
+        if note_id is not None:
+            NoteCache.add(Note(note_id, temp_user_id, title, content, color, associated_date, created_at))
             self.note_id_data = self._update_options_data()
             if hasattr(self, "note_id_optionmenu"):
                 self.note_id_optionmenu.configure(values=self.note_id_data)
@@ -751,6 +778,7 @@ class NotesView(BaseView):
             color=color,
         )
         if success:
+            NoteCache.invalidate()
             self.note_id_data = self._update_options_data()
             if hasattr(self, "note_id_optionmenu"):
                 self.note_id_optionmenu.configure(values=self.note_id_data)
@@ -779,6 +807,7 @@ class NotesView(BaseView):
 
         success = Db.delete_note(note_id=nid)
         if success:
+            NoteCache.invalidate()
             self.note_id_data = self._update_options_data()
             if hasattr(self, "note_id_optionmenu"):
                 self.note_id_optionmenu.configure(values=self.note_id_data)
@@ -918,17 +947,23 @@ class NotesView(BaseView):
 
         return frame
 
-    def _on_textbox_resize(self, event=None) -> None:
+    def _on_notes_scroll(self, first: str, last: str) -> None:
         """
-        This method is called when the text box is resized.
-        :param event: Object automatically passed by the bind
+        This method is called when the notes textbox view moves, next page of notes is appended
+        when the end of loaded notes becomes visible. Only one page is requested at a time.
+        :param first: Fraction of the text above the view
+        :param last: Fraction of the text up to the end of the view
         :return: Nothing
         """
-        self.refresh_notes_table()
+        self.notes_textbox._y_scrollbar.set(first, last)
+        if self.has_more_notes and not self.appending_notes and float(last) >= 0.9:
+            self.appending_notes = True
+            self.after_idle(self._append_notes_page)
 
     def _configure_color_tags(self) -> None:
         """
-        This method configures the color tags.
+        This method configures the color tags and the separator tag. The separator is an empty line
+        whose background spans the whole width of the textbox, so resizing needs no re-rendering.
         :return: Nothing
         """
         try:
@@ -936,11 +971,9 @@ class NotesView(BaseView):
         except AttributeError:
             textbox = self.notes_textbox
 
-        textbox.tag_configure("red", foreground="#FF6B6B")
-        textbox.tag_configure("green", foreground="#55EFC4")
-        textbox.tag_configure("blue", foreground="#74B9FF")
-        textbox.tag_configure("brown", foreground="#B08968")
-        textbox.tag_configure("purple", foreground="#A29BFE")
+        for color_name, color in NOTE_COLORS.items():
+            textbox.tag_configure(color_name, foreground=color)
+        textbox.tag_configure("separator", background="gray50", font=("Consolas", 1))
 
     def show_notes_gui(self) -> ctk.CTkFrame:
         """
@@ -952,9 +985,8 @@ class NotesView(BaseView):
         frame.grid_columnconfigure(0, weight=1)
 
         self.notes_textbox = ctk.CTkTextbox(frame, font=("Consolas", 16), fg_color=("white", "#242424"))
-        self.notes_textbox.bind("<Configure>", self._on_textbox_resize)
         try:
-            self.notes_textbox._textbox.bind("<Configure>", self._on_textbox_resize)
+            self.notes_textbox._textbox.configure(yscrollcommand=self._on_notes_scroll)
         except AttributeError:
             pass
         self._configure_color_tags()
@@ -966,48 +998,83 @@ class NotesView(BaseView):
 
     def refresh_notes_table(self) -> None:
         """
-        This method creates table for showing grades in database.
+        This method shows the first page of notes from the database, following pages are
+        appended when the user scrolls down.
         :return: Nothing.
         """
-        notes = Db.fetch_notes()
-
         if not hasattr(self, "notes_textbox"):
             return
 
-        try:
-            self.update_idletasks()
-        except Exception:
-            pass
+        self.loaded_notes = self._fetch_notes_page(None)
+        self._render_notes()
 
-        separator = self._get_separator_line()
+    def _fetch_notes_page(self, after_id: int | None) -> list[tuple]:
+        """
+        This method fetches a page of notes following the given id.
+        :param after_id: Id of the last loaded note or None for the first page
+        :return: List of notes.
+        """
+        notes = Db.fetch_notes(after_id=after_id, limit=self.notes_page_size) or []
+        self.has_more_notes = len(notes) == self.notes_page_size
+        return notes
 
+    def _append_notes_page(self) -> None:
+        """
+        This method appends the next page of notes at the end of the textbox, already shown notes are not touched.
+        :return: Nothing.
+        """
+        self.appending_notes = False
+        if not self.has_more_notes or not self.loaded_notes:
+            return
+        notes = self._fetch_notes_page(self.loaded_notes[-1][0])
+        self.loaded_notes.extend(notes)
+        self._insert_notes(notes)
+
+    def _render_notes(self) -> None:
+        """
+        This method renders all loaded notes, it is used only when the notes are reloaded from the database.
+        :return: Nothing.
+        """
         self.notes_textbox.configure(state="normal")
         self.notes_textbox.delete("1.0", "end")
-
-        if not notes:
+        if not self.loaded_notes:
             self.notes_textbox.insert("end", "No notes available\n")
-        else:
-            for note in notes:
-                title = note[1]
-                content = note[2]
-                associated_date = note[5]
-                color = note[6] if note[6] in self.note_colors else None
+        self.notes_textbox.configure(state="disabled")
+        self._insert_notes(self.loaded_notes)
 
-                tag = color if color else None
+    def _insert_notes(self, notes: list[tuple]) -> None:
+        """
+        This method inserts notes at the end of the textbox with a single multi-tag insert.
+        :param notes: Notes to insert
+        :return: Nothing.
+        """
+        chunks: list = []
+        for note in notes:
+            title = note[1]
+            content = note[2]
+            associated_date = note[5]
+            tag = note[6] if note[6] in self.note_colors else ()
 
-                self.notes_textbox.insert("end", f"Title: {title}\n", tag)
+            chunks.extend((f"Title: {title}\n", tag))
 
-                if associated_date is not None:
-                    if isinstance(associated_date, datetime):
-                        self.notes_textbox.insert("end", f"Associated Date: {associated_date.date()}\n", tag)
-                    elif isinstance(associated_date, str):
-                        self.notes_textbox.insert("end", f"Associated Date: {associated_date[:10]}\n", tag)
-                    else:
-                        self.notes_textbox.insert("end", f"Associated Date: {str(associated_date)}\n", tag)
+            if associated_date is not None:
+                if isinstance(associated_date, datetime):
+                    chunks.extend((f"Associated Date: {associated_date.date()}\n", tag))
+                elif isinstance(associated_date, str):
+                    chunks.extend((f"Associated Date: {associated_date[:10]}\n", tag))
+                else:
+                    chunks.extend((f"Associated Date: {str(associated_date)}\n", tag))
 
-                self.notes_textbox.insert("end", f"Content: {content}\n", tag)
-                self.notes_textbox.insert("end", separator + "\n")
+            chunks.extend((f"Content: {content}\n", tag, "\n", "separator"))
 
+        if not chunks:
+            return
+        try:
+            textbox = self.notes_textbox._textbox
+        except AttributeError:
+            textbox = self.notes_textbox
+        self.notes_textbox.configure(state="normal")
+        textbox.insert("end", *chunks)
         self.notes_textbox.configure(state="disabled")
 
     def create_frame_content(self) -> None:
@@ -1823,7 +1890,18 @@ class ChatView(BaseView):
         self.message_entry: ctk.CTkEntry | None = None
         self.send_button: ctk.CTkButton | None = None
         self.selected_user: str | None = None
+        self.users: dict[str, str] = {}
+        self.page_size = 50
+        self.oldest_message_id: int | None = None
+        self.newest_message_id: int | None = None
+        self.has_older_messages = False
+        self.loading_older = False
+        self.pending_flush: threading.Event | None = None
+        self.pending_results: list[dict] = []
+        self.ui_tick_ms = 33
+        self.ui_tick_id: str | None = None
         self.create_frame_content()
+        self.ui_tick_id = self.after(self.ui_tick_ms, self.process_incoming_messages)
 
     def create_frame_content(self) -> ctk.CTkFrame:
         """
@@ -1835,6 +1913,7 @@ class ChatView(BaseView):
         self.users_listbox.grid_columnconfigure(0, weight=1)
 
         users = get_all_users()
+        self.users = {str(user[2]): user[1] for user in users or []}
         for i, user in enumerate(users or []):
             if user[0] == Session.id:
                 continue
@@ -1846,8 +1925,12 @@ class ChatView(BaseView):
         self.chat_display = ctk.CTkTextbox(self, font=("Roboto", 14), wrap="word")
         self.chat_display.grid(row=0, rowspan=28, column=2, columnspan=6, sticky="nsew", padx=5, pady=5)
         self.chat_display.configure(state="disabled")
+        try:
+            self.chat_display._textbox.configure(yscrollcommand=self._on_chat_scroll)
+        except AttributeError:
+            pass
 
-        Client.chat_display = self.chat_display
+        Client.ui_queue = queue.SimpleQueue()
 
         self.message_entry = ctk.CTkEntry(self, placeholder_text="Type your message...", font=("Roboto", 14))
         self.message_entry.grid(row=28, rowspan=2, column=2, columnspan=5, sticky="ew", padx=5, pady=5)
@@ -1855,35 +1938,148 @@ class ChatView(BaseView):
         self.send_button = ctk.CTkButton(self, text="Send", font=("Roboto", 14), command=self.send_message)
         self.send_button.grid(row=28, rowspan=2, column=7, sticky="ew", padx=5, pady=5)
 
+    def process_incoming_messages(self) -> None:
+        """
+        Displays messages received by the client thread since the last tick with a single insert,
+        the textbox is only touched from the Tk main loop. A conversation opened by on_user_click
+        is shown once the messages received before the click are saved. Messages received meanwhile
+        are appended after it, unless the writer has already saved them into the shown page.
+        :return: None
+        """
+        results = []
+        if Client.ui_queue is not None:
+            while True:
+                try:
+                    result = Client.ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if result["sender"] == self.selected_user:
+                    results.append(result)
+        if self.pending_flush is not None:
+            self.pending_results.extend(results)
+            results = []
+            if self.pending_flush.is_set():
+                self.pending_flush = None
+                self._show_conversation()
+                newest_id = self.newest_message_id
+                results = [
+                    result
+                    for result in self.pending_results
+                    if newest_id is None or result.get("id") is None or result["id"] > newest_id
+                ]
+                self.pending_results = []
+        lines = [f"{result["name"]}: {result["msg"]}\n" for result in results]
+        if lines and self.chat_display is not None:
+            self.chat_display.configure(state="normal")
+            self.chat_display.insert("end", "".join(lines))
+            self.chat_display.configure(state="disabled")
+        self.ui_tick_id = self.after(self.ui_tick_ms, self.process_incoming_messages)
+
+    def _on_chat_scroll(self, first: str, last: str) -> None:
+        """
+        This method is called when the chat history view moves, an older page of the conversation
+        is prepended when the scrollable history reaches its top.
+        :param first: Fraction of the text above the view
+        :param last: Fraction of the text up to the end of the view
+        :return: None
+        """
+        if self.chat_display is None:
+            return
+        self.chat_display._y_scrollbar.set(first, last)
+        scrollable = float(first) > 0.0 or float(last) < 1.0
+        if self.has_older_messages and not self.loading_older and scrollable and float(first) <= 0.0:
+            self.loading_older = True
+            self.after_idle(self.load_older_messages)
+
+    def destroy(self) -> None:
+        """
+        Stops displaying incoming messages and destroys the view.
+        :return: None
+        """
+        if self.ui_tick_id is not None:
+            self.after_cancel(self.ui_tick_id)
+            self.ui_tick_id = None
+        Client.ui_queue = None
+        super().destroy()
+
     def on_user_click(self, uuid: str) -> None:
         """
-        Handles user button click.
+        Handles user button click. Messages received so far are saved by the writer in the background,
+        the most recent page of the conversation is shown by process_incoming_messages once they are.
         :param uuid: The uuid of the clicked user.
         :return: None
         """
-        Db.dequeue_messages()
+        if Client.ui_queue is not None:
+            while True:
+                try:
+                    Client.ui_queue.get_nowait()
+                except queue.Empty:
+                    break
         self.selected_user = uuid
+        self.oldest_message_id = None
+        self.newest_message_id = None
+        self.has_older_messages = False
+        self.pending_results = []
+        self.pending_flush = None
         if self.chat_display is not None:
-            users = Db.fetch_users()
-            if users is None:
-                raise RuntimeError("No users found!")
+            self.chat_display.configure(state="normal")
+            self.chat_display.delete("1.0", "end")
+            if str(uuid) not in self.users:
+                self.chat_display.insert("end", "No such user\n")
+            self.chat_display.configure(state="disabled")
+        if str(uuid) in self.users:
+            self.pending_flush = Db.request_message_flush()
 
-            user = next((row for row in users if row[2] == str(uuid)), None)
+    def _show_conversation(self) -> None:
+        """
+        Shows the most recent page of the selected conversation.
+        :return: None
+        """
+        if self.chat_display is None:
+            return
+        self.chat_display.configure(state="normal")
+        self.chat_display.delete("1.0", "end")
+        self.chat_display.insert("end", self._fetch_message_page())
+        self.chat_display.configure(state="disabled")
+        self.chat_display.see("end")
 
-            if user is not None:
-                self.chat_display.configure(state="normal")
-                self.chat_display.delete("1.0", "end")
-                msgs = Db.fetch_messages() or []
-                for msg in msgs:
-                    if msg[2] == str(Session.uuid) and msg[3] == uuid:
-                        self.chat_display.insert("end", f"You: {msg[1]}\n")
-                    elif msg[2] == uuid and msg[3] == str(Session.uuid):
-                        self.chat_display.insert("end", f"{user[1]}: {msg[1]}\n")
-                self.chat_display.configure(state="disabled")
-            else:
-                self.chat_display.configure(state="normal")
-                self.chat_display.insert("end", "No such user\n")
-                self.chat_display.configure(state="disabled")
+    def load_older_messages(self) -> None:
+        """
+        Prepends the page of messages preceding the oldest displayed one, keeping the view in place.
+        :return: None
+        """
+        self.loading_older = False
+        if self.chat_display is None or self.selected_user is None or not self.has_older_messages:
+            return
+        text = self._fetch_message_page()
+        if not text:
+            return
+        self.chat_display.configure(state="normal")
+        self.chat_display.insert("1.0", text)
+        self.chat_display.configure(state="disabled")
+        prepended_lines = text.count("\n")
+        self.chat_display.yview(f"{prepended_lines + 1}.0")
+
+    def _fetch_message_page(self) -> str:
+        """
+        Fetches the page of messages preceding the oldest displayed one and formats it.
+        :return: Text of the page
+        """
+        user_name = self.users.get(str(self.selected_user), "")
+        msgs = (
+            Db.fetch_conversation(
+                str(Session.uuid), str(self.selected_user), before_id=self.oldest_message_id, limit=self.page_size
+            )
+            or []
+        )
+        self.has_older_messages = len(msgs) == self.page_size
+        if msgs:
+            if self.oldest_message_id is None:
+                self.newest_message_id = msgs[-1][0]
+            self.oldest_message_id = msgs[0][0]
+        return "".join(
+            f"You: {msg[1]}\n" if msg[2] == str(Session.uuid) else f"{user_name}: {msg[1]}\n" for msg in msgs
+        )
 
     def send_message(self) -> None:
         """
@@ -2156,8 +2352,10 @@ class LoginRegisterView(ctk.CTkFrame):
         if Auth.login_user(username, password):
             self.feedback_label.configure(text="Login successful!", text_color="green")
             self.after(500, self.on_success)
-            Client.thread.start()
-            Server.thread.start()
+            Db.start_message_writer()
+            MaintenanceJob.start()
+            Server.start()
+            Client.start()
         else:
             self.feedback_label.configure(text="Wrong login or password!")
 
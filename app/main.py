@@ -5,17 +5,22 @@ File contains a function call that runs the entire project
 from app.backend.chat import Client, Server
 from app.frontend.main_window import AppGUI
 from app.backend.database import Db
+from app.backend.maintenance import MaintenanceJob
 
 
 def on_close(app: AppGUI) -> None:
     """
-    Function which runs on close and manages the closing order
+    Function which runs on close and manages the closing order.
+    Timers of the window are cancelled first, then chat stops, so the message writer still drains
+    everything received before it is closed.
     :app: AppGUI
     :return: Nothing, only runs application
     """
-    Db.close()
+    app.close_app()
+    MaintenanceJob.stop()
     Client.stop()
     Server.stop()
+    Db.close()
     app.destroy()
 
 
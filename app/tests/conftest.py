@@ -0,0 +1,21 @@
+"""
+File contains fixtures shared by the tests.
+"""
+
+import pytest
+
+from app.backend.database import Db
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """
+    Fixture that points Db at a temporary database file and restores the original path afterwards.
+    :param tmp_path: pytest temporary directory.
+    :return: yields path of the temporary database.
+    """
+    original_path = Db.db_path
+    db_path = str(tmp_path / "test.sqlite3")
+    Db.configure(db_path)
+    yield db_path
+    Db.configure(original_path)
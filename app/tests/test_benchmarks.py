@@ -0,0 +1,32 @@
+"""
+File contains smoke tests for benchmark scripts.
+"""
+
+from app.benchmarks import bench_chat, bench_message_writer, bench_models
+
+
+def test_bench_models_run() -> None:
+    """
+    Tests that model loading benchmark runs on a small data set.
+    :return: Nothing, only provides test.
+    """
+    results = bench_models.run(50)
+    assert {"notes", "notifications", "grades"} <= results.keys()
+    assert all(seconds >= 0 and megabytes >= 0 for seconds, megabytes in results.values())
+
+
+def test_bench_chat_run() -> None:
+    """
+    Tests that chat load test delivers every message with a few simulated clients.
+    :return: Nothing, only provides test.
+    """
+    results = bench_chat.run(clients=5, messages=3)
+    assert results["received"] == 15
+
+
+def test_bench_message_writer_run() -> None:
+    """
+    Tests that message writer benchmark saves the whole burst.
+    :return: Nothing, only provides test.
+    """
+    assert bench_message_writer.run(200)["saved"] == 200
@@ -0,0 +1,326 @@
+"""
+File contains tests for chat module.
+"""
+
+import asyncio
+import json
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from typing import Iterator
+
+import pytest
+import websockets
+
+from app.backend.chat import Client, MessageLog, Server
+from app.backend.session import Session
+
+
+def _payload(sender: str, recipient: str, msg: str) -> bytes:
+    """
+    Builds a chat payload like make_payload does, for an arbitrary sender.
+    :param sender: uuid of the sender.
+    :param recipient: uuid of the recipient.
+    :param msg: message text.
+    :return: Encoded payload.
+    """
+    return json.dumps({"name": sender, "sender": sender, "recipient": recipient, "msg": msg}).encode("utf-8")
+
+
+def _free_port() -> int:
+    """
+    Finds a free local port.
+    :return: Port number.
+    """
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(port: int) -> threading.Thread:
+    """
+    Starts the chat server on a port in a background thread and waits until it accepts connections.
+    :param port: port to listen on.
+    :return: Thread running the server.
+    """
+    Server.port = port
+    thread = threading.Thread(target=Server.run, daemon=True)
+    thread.start()
+    for _ in range(100):
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.1):
+                break
+        except OSError:
+            time.sleep(0.02)
+    return thread
+
+
+def _stop_server(thread: threading.Thread) -> None:
+    """
+    Stops the chat server started by _start_server.
+    :param thread: thread running the server.
+    :return: Nothing.
+    """
+    Server.stop()
+    thread.join(timeout=5)
+    Server.subscribers.clear()
+
+
+@pytest.fixture
+def chat_server(tmp_path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """
+    Runs the chat server on a free port in a background thread, with a message log in a temporary directory.
+    :param tmp_path: pytest temporary directory.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: Url of the running server.
+    """
+    port = _free_port()
+    monkeypatch.setattr(Server, "port", port)
+    monkeypatch.setattr(Server, "log_path", str(tmp_path / "server.sqlite3"))
+    monkeypatch.setattr(Server, "mailboxes", {})
+    thread = _start_server(port)
+    yield f"ws://localhost:{port}"
+    _stop_server(thread)
+
+
+def test_server_pushes_to_subscriber(chat_server: str) -> None:
+    """
+    Tests that a message reaches a subscribed recipient without any polling.
+    :param chat_server: url of the running server.
+    :return: Nothing, only provides test.
+    """
+
+    async def scenario() -> list:
+        async with websockets.connect(chat_server) as receiver, websockets.connect(chat_server) as sender:
+            await receiver.send(_payload("B", "-1", "subscribe"))
+            await asyncio.sleep(0.05)
+            await sender.send(_payload("A", "B", "hello"))
+            return json.loads(await asyncio.wait_for(receiver.recv(), timeout=1.0))
+
+    batch = asyncio.run(scenario())
+    assert [message["msg"] for message in batch] == ["hello"]
+
+
+def test_server_drains_offline_messages_in_one_batch(chat_server: str) -> None:
+    """
+    Tests that messages queued for an offline recipient are delivered in one batch when it subscribes.
+    :param chat_server: url of the running server.
+    :return: Nothing, only provides test.
+    """
+
+    async def scenario() -> list:
+        async with websockets.connect(chat_server) as sender:
+            for i in range(20):
+                await sender.send(_payload("A", "C", f"msg {i}"))
+            await asyncio.sleep(0.05)
+        async with websockets.connect(chat_server) as receiver:
+            await receiver.send(_payload("C", "-1", "subscribe"))
+            return json.loads(await asyncio.wait_for(receiver.recv(), timeout=1.0))
+
+    batch = asyncio.run(scenario())
+    assert [message["msg"] for message in batch] == [f"msg {i}" for i in range(20)]
+
+
+def test_client_reuses_one_connection(chat_server: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that the client loop thread sends and receives over a single connection, hands received
+    messages to the UI queue and stops cleanly.
+    :param chat_server: url of the running server.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: Nothing, only provides test.
+    """
+    monkeypatch.setattr(Client, "url", chat_server)
+    monkeypatch.setattr(Client, "msg_queue", queue.Queue())
+    monkeypatch.setattr(Client, "last_seq", 0)
+    monkeypatch.setattr(Client, "ui_queue", queue.SimpleQueue())
+    monkeypatch.setattr(Session, "uuid", "D")
+    monkeypatch.setattr(Session, "username", "D")
+
+    Client.start()
+    try:
+        futures = [Client.send("D", f"msg {i}") for i in range(3)]
+        for future in futures:
+            future.result(timeout=5)
+        for _ in range(100):
+            if Client.msg_queue.qsize() == 3:
+                break
+            time.sleep(0.02)
+        assert len(Server.clients) == 1
+    finally:
+        Client.stop()
+
+    assert Client.thread is not None and not Client.thread.is_alive()
+    assert [Client.msg_queue.get_nowait()["msg"] for _ in range(3)] == ["msg 0", "msg 1", "msg 2"]
+    assert Client.ui_queue is not None and Client.ui_queue.qsize() == 3
+
+
+def test_client_send_fails_without_server(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that a send returns a future which fails when no server can be reached.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: Nothing, only provides test.
+    """
+    monkeypatch.setattr(Client, "url", f"ws://localhost:{_free_port()}")
+    monkeypatch.setattr(Client, "send_timeout", 0.2)
+    Client.start()
+    try:
+        with pytest.raises(TimeoutError):
+            Client.send("D", "lost").result(timeout=5)
+    finally:
+        Client.stop()
+
+
+def test_parse_batch_skips_malformed_messages(capsys: pytest.CaptureFixture) -> None:
+    """
+    Tests that malformed frames and messages are reported and skipped instead of raising.
+    :param capsys: pytest output capture fixture.
+    :return: Nothing, only provides test.
+    """
+    good = {"name": "A", "sender": "A", "recipient": "B", "msg": "hi", "seq": 1}
+    assert Client.parse_batch(b"not json") == []
+    assert Client.parse_batch(b"{}") == []
+    assert Client.parse_batch(json.dumps([good, {"sender": "A"}, "text", {**good, "seq": "2"}])) == [good]
+    assert len(capsys.readouterr().out.splitlines()) == 5
+
+
+def test_client_survives_malformed_frame(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that the client keeps its loop and connection alive after the server pushes a malformed frame.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: Nothing, only provides test.
+    """
+    port = _free_port()
+    stop = threading.Event()
+
+    async def handler(ws) -> None:
+        await ws.recv()
+        await ws.send(b"not json")
+        await ws.send(json.dumps([{"sender": "A"}]).encode("utf-8"))
+        await ws.send(json.dumps([{"name": "A", "sender": "A", "recipient": "D", "msg": "ok"}]).encode("utf-8"))
+        await asyncio.to_thread(stop.wait)
+
+    async def serve() -> None:
+        async with websockets.serve(handler, "localhost", port):
+            await asyncio.to_thread(stop.wait)
+
+    server = threading.Thread(target=asyncio.run, args=(serve(),), daemon=True)
+    server.start()
+    monkeypatch.setattr(Client, "url", f"ws://localhost:{port}")
+    monkeypatch.setattr(Client, "msg_queue", queue.Queue())
+    monkeypatch.setattr(Client, "last_seq", 0)
+    monkeypatch.setattr(Client, "ui_queue", None)
+    Client.start()
+    try:
+        assert Client.msg_queue.get(timeout=5)["msg"] == "ok"
+        assert Client.thread is not None and Client.thread.is_alive()
+        assert Client.connection is not None
+    finally:
+        stop.set()
+        Client.stop()
+        server.join(timeout=5)
+
+
+def test_mailbox_cap_drops_oldest(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that a full mailbox keeps only the newest messages and counts dropped ones.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: Nothing, only provides test.
+    """
+    monkeypatch.setattr(Server, "mailboxes", {})
+    monkeypatch.setattr(Server, "mailbox_size", 3)
+    monkeypatch.setattr(Server, "dropped_messages", 0)
+    for i in range(5):
+        Server.enqueue("E", {"msg": i})
+
+    assert isinstance(Server.mailboxes["E"], deque)
+    assert Server.dropped_messages == 2
+    assert [message["msg"] for message in Server.drain("E")] == [2, 3, 4]
+    assert "E" not in Server.mailboxes
+
+
+def test_mailbox_drain_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that drain takes at most limit messages and keeps the rest queued.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: Nothing, only provides test.
+    """
+    monkeypatch.setattr(Server, "mailboxes", {})
+    for i in range(5):
+        Server.enqueue("F", {"msg": i})
+
+    assert [message["msg"] for message in Server.drain("F", 2)] == [0, 1]
+    assert [message["msg"] for message in Server.drain("F", 2)] == [2, 3]
+    assert [message["msg"] for message in Server.drain("F", 2)] == [4]
+    assert Server.drain("F", 2) == []
+
+
+def test_message_log_reads_after_cursor(tmp_path) -> None:
+    """
+    Tests that the message log numbers messages and reads them per recipient after a sequence number.
+    :param tmp_path: pytest temporary directory.
+    :return: Nothing, only provides test.
+    """
+    log = MessageLog(str(tmp_path / "log.sqlite3"))
+    seqs = [log.append("G" if i % 2 else "H", {"msg": i}) for i in range(6)]
+    assert seqs == sorted(seqs)
+
+    assert [message["msg"] for message in log.read_after("G", 0)] == [1, 3, 5]
+    assert [message["msg"] for message in log.read_after("G", seqs[1])] == [3, 5]
+    assert [message["msg"] for message in log.read_after("G", 0, limit=2)] == [1, 3]
+    assert log.cursor("G") == 0
+    log.ack("G", seqs[3])
+    log.ack("G", seqs[1])
+    assert log.cursor("G") == seqs[3]
+    log.close()
+
+
+def test_server_delivers_logged_messages_after_restart(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that messages for an offline recipient survive a server restart and that acknowledged
+    messages are not delivered again.
+    :param tmp_path: pytest temporary directory.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: Nothing, only provides test.
+    """
+    port = _free_port()
+    chat_server = f"ws://localhost:{port}"
+    monkeypatch.setattr(Server, "port", port)
+    monkeypatch.setattr(Server, "log_path", str(tmp_path / "server.sqlite3"))
+
+    async def send_all() -> None:
+        async with websockets.connect(chat_server) as sender:
+            for i in range(3):
+                await sender.send(_payload("A", "K", f"msg {i}"))
+            await asyncio.sleep(0.05)
+
+    async def subscribe(after: int = 0, ack: bool = False) -> list:
+        async with websockets.connect(chat_server) as receiver:
+            await receiver.send(json.dumps({"sender": "K", "recipient": "-1", "msg": "subscribe", "after": after}))
+            try:
+                batch = json.loads(await asyncio.wait_for(receiver.recv(), timeout=0.3))
+            except asyncio.TimeoutError:
+                return []
+            if ack:
+                await receiver.send(
+                    json.dumps({"sender": "K", "recipient": "-1", "msg": "ack", "seq": batch[-1]["seq"]})
+                )
+                await asyncio.sleep(0.05)
+            return batch
+
+    thread = _start_server(port)
+    asyncio.run(send_all())
+    _stop_server(thread)
+
+    thread = _start_server(port)
+    try:
+        batch = asyncio.run(subscribe())
+        assert [message["msg"] for message in batch] == ["msg 0", "msg 1", "msg 2"]
+        assert [message["msg"] for message in asyncio.run(subscribe(after=batch[0]["seq"], ack=True))] == [
+            "msg 1",
+            "msg 2",
+        ]
+        assert asyncio.run(subscribe()) == []
+    finally:
+        _stop_server(thread)
@@ -0,0 +1,563 @@
+"""
+File contains tests for database file.
+"""
+
+import queue
+import sqlite3
+import threading
+import pytest
+
+from datetime import datetime
+
+from app.backend.chat import Client
+from app.backend.database import Db
+
+
+def test_configure_creates_schema(temp_db) -> None:
+    """
+    Tests that the first connection to a new database file creates all tables.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    tables = {row[0] for row in Db.get_connection().execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"grades", "notes", "events", "messages", "users", "notifications", "subjects"} <= tables
+
+
+def test_connection_uses_wal_journal(temp_db) -> None:
+    """
+    Tests that pooled connections run in WAL journal mode.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    assert Db.get_connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_connection_is_reused_within_thread(temp_db) -> None:
+    """
+    Tests that the same thread always gets the same connection.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    assert Db.get_connection() is Db.get_connection()
+
+
+def test_each_thread_gets_own_connection(temp_db) -> None:
+    """
+    Tests that worker threads get separate connections and can read data written by another thread.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    assert Db.insert_subject("Math", 5)
+    main_conn = Db.get_connection()
+    results: dict[int, tuple] = {}
+
+    def worker(index: int) -> None:
+        conn = Db.get_connection()
+        results[index] = (conn is main_conn, Db.fetch_subjects())
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4
+    for same_conn, subjects in results.values():
+        assert same_conn is False
+        assert subjects == [(1, "Math", 5)]
+
+
+def test_close_connections_reopens_on_next_query(temp_db) -> None:
+    """
+    Tests that closing the pool does not break later queries.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    old_conn = Db.get_connection()
+    Db.close_connections()
+    assert Db.get_connection() is not old_conn
+    assert Db.fetch_subjects() == []
+
+
+def _count_from_other_thread(table: str) -> int:
+    """
+    Helper counting committed rows of a table through another thread's connection.
+    :param table: table name.
+    :return: number of committed rows.
+    """
+    result: list[int] = []
+    thread = threading.Thread(
+        target=lambda: result.append(Db.get_connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+    )
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_transaction_defers_commit_of_per_row_methods(temp_db) -> None:
+    """
+    Tests that per-row methods called inside a transaction are only visible after the batch is committed.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    with Db.transaction():
+        assert Db.insert_subject("Math", 5)
+        assert Db.insert_subject("Physics", 4)
+        assert _count_from_other_thread("subjects") == 0
+    assert _count_from_other_thread("subjects") == 2
+
+
+def test_transaction_rolls_back_on_error(temp_db) -> None:
+    """
+    Tests that an exception inside a transaction discards every write of the batch.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    with pytest.raises(RuntimeError):
+        with Db.transaction():
+            Db.insert_subject("Math", 5)
+            raise RuntimeError("abort")
+    assert Db.fetch_subjects() == []
+
+
+def test_nested_transaction_joins_outer(temp_db) -> None:
+    """
+    Tests that a nested transaction does not commit before the outermost one finishes.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    with Db.transaction():
+        with Db.transaction():
+            Db.insert_subject("Math", 5)
+        assert _count_from_other_thread("subjects") == 0
+    assert _count_from_other_thread("subjects") == 1
+
+
+def test_bulk_inserts(temp_db) -> None:
+    """
+    Tests executemany based bulk insert methods.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    assert Db.insert_subjects_bulk([("Math", 5), ("Physics", 4)])
+    assert Db.insert_grades_bulk([(4.0, 1.0, 1, 1, 1, 1), (5.0, 2.0, 2, 1, 2, 1), (3.0, 1.0, 1, 1, 2, 1)])
+    assert Db.insert_notes_bulk([("T", "C", "2025-01-01 10:00", 1, "2025-01-01 00:00:00", "red")] * 3)
+    assert Db.insert_notifications_bulk([("1", "Msg", 1, 0, "2025-01-01 00:00:00")] * 2)
+
+    assert len(Db.fetch_subjects() or []) == 2
+    assert sorted(Db.fetch_grades() or []) == [
+        (3.0, "Physics", 4, 1.0, 1, 3),
+        (4.0, "Math", 5, 1.0, 1, 1),
+        (5.0, "Physics", 4, 2.0, 2, 2),
+    ]
+    assert len(Db.fetch_notes() or []) == 3
+    assert len(Db.fetch_notifications() or []) == 2
+
+
+def test_bulk_insert_failure_is_atomic(temp_db) -> None:
+    """
+    Tests that a failing row aborts the whole bulk insert.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    rows: list = [(4.0, 1.0, 1, 1, 1, 1), (None, 1.0, 1, 1, 1, 1)]
+    assert Db.insert_grades_bulk(rows) is False
+    assert Db.fetch_grades_id() == []
+
+
+def test_migrations_set_user_version(temp_db) -> None:
+    """
+    Tests that a new database is migrated to the newest schema version.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    version = Db.get_connection().execute("PRAGMA user_version").fetchone()[0]
+    assert version == len(Db.migrations)
+
+
+def test_migrations_are_applied_once(temp_db) -> None:
+    """
+    Tests that migrate does nothing for an up-to-date database.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    calls: list[int] = []
+    original = Db.migrations
+    conn = Db.get_connection()
+    try:
+        Db.migrations = original + (lambda cursor: calls.append(1),)
+        assert Db.migrate(conn) == len(original) + 1
+        assert Db.migrate(conn) == len(original) + 1
+    finally:
+        Db.migrations = original
+    assert calls == [1]
+
+
+def test_connection_closed_when_thread_exits(temp_db) -> None:
+    """
+    Tests that the connection of a finished thread is removed from the pool and closed.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    connections: list[sqlite3.Connection] = []
+    thread = threading.Thread(target=lambda: connections.append(Db.get_connection()))
+    thread.start()
+    thread.join()
+
+    assert connections and connections[0] not in Db._pool
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+
+
+def test_migration_upgrades_legacy_messages_table(tmp_path) -> None:
+    """
+    Tests that a database created by the old schema gets the uuid based messages layout.
+    :param tmp_path: pytest temporary directory.
+    :return: Nothing, only provides test.
+    """
+    conn = sqlite3.connect(str(tmp_path / "legacy.sqlite3"))
+    conn.execute(
+        'CREATE TABLE "messages" ("id" INTEGER NOT NULL, "content" TEXT NOT NULL, '
+        '"user_id" INTEGER NOT NULL, "incoming" INTEGER NOT NULL, PRIMARY KEY("id"))'
+    )
+    conn.execute(
+        'CREATE TABLE "users" ("id" INTEGER NOT NULL, "name" TEXT NOT NULL, "uuid" TEXT NOT NULL, PRIMARY KEY("id"))'
+    )
+    conn.execute("INSERT INTO messages VALUES (1, 'Hi', 7, 1)")
+    conn.commit()
+
+    assert Db.migrate(conn) == len(Db.migrations)
+    assert conn.execute("SELECT id, content, user_uuid, recipient_uuid FROM messages").fetchall() == [
+        (1, "Hi", "7", None)
+    ]
+    assert "password" in [col[1] for col in conn.execute("PRAGMA table_info(users)")]
+    conn.close()
+
+
+def test_startup_enables_incremental_vacuum(tmp_path) -> None:
+    """
+    Tests that opening an existing database switches it to incremental auto vacuum once, at startup.
+    :param tmp_path: pytest temporary directory.
+    :return: Nothing, only provides test.
+    """
+    db_path = str(tmp_path / "legacy.sqlite3")
+    conn = sqlite3.connect(db_path)
+    conn.execute('CREATE TABLE "notes" ("id" INTEGER NOT NULL, PRIMARY KEY("id"))')
+    conn.commit()
+    conn.close()
+
+    original_path = Db.db_path
+    Db.configure(db_path)
+    try:
+        assert Db.get_connection().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    finally:
+        Db.configure(original_path)
+
+
+def test_compact_refuses_inside_transaction(temp_db) -> None:
+    """
+    Tests that compaction neither commits nor breaks an open transaction of the calling thread.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    with pytest.raises(RuntimeError):
+        with Db.transaction():
+            Db.insert_notification("1", "kept out", 1, 0, "2025-01-01 10:00:00")
+            assert Db.compact() is False
+            assert Db.get_connection().in_transaction
+            raise RuntimeError("rollback")
+    assert Db.fetch_notifications() == []
+    assert Db.compact() is True
+
+
+@pytest.mark.parametrize(
+    "query,params",
+    [
+        ("SELECT * FROM users WHERE name = ?", ("User",)),
+        ("SELECT * FROM grades WHERE subject_id = ?", (1,)),
+        ("SELECT * FROM notes WHERE associated_date BETWEEN ? AND ?", ("2025-01-01", "2025-02-01")),
+        ("SELECT * FROM notifications WHERE is_read = ? AND associated_time <= ?", (0, "2025-01-01")),
+        ("SELECT * FROM messages WHERE user_uuid = ? AND recipient_uuid = ?", ("a", "b")),
+    ],
+)
+def test_lookups_use_indexes(temp_db, query: str, params: tuple) -> None:
+    """
+    Tests that common lookups are answered with index searches instead of full table scans.
+    :param temp_db: temporary database path.
+    :param query: query to explain.
+    :param params: query parameters.
+    :return: Nothing, only provides test.
+    """
+    plan = " ".join(str(row[-1]) for row in Db.get_connection().execute(f"EXPLAIN QUERY PLAN {query}", params))
+    assert "USING INDEX" in plan or "USING COVERING INDEX" in plan
+
+
+def test_fetch_notes_filters(temp_db) -> None:
+    """
+    Tests user, date range and paging filters of fetch_notes.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_notes_bulk(
+        [
+            ("Jan", "C", "2025-01-01 10:00", 1, datetime(2025, 1, 15), "red"),
+            ("Feb", "C", "2025-01-01 10:00", 1, datetime(2025, 2, 1), "red"),
+            ("Feb other", "C", "2025-01-01 10:00", 2, datetime(2025, 2, 3), "red"),
+            ("Mar", "C", "2025-01-01 10:00", 1, datetime(2025, 3, 1), "red"),
+        ]
+    )
+    february = Db.fetch_notes(date_from=datetime(2025, 2, 1), date_to=datetime(2025, 3, 1)) or []
+    assert [n[1] for n in february] == ["Feb", "Feb other"]
+    user_notes = Db.fetch_notes(user_id=1) or []
+    assert [n[1] for n in user_notes] == ["Jan", "Feb", "Mar"]
+    page = Db.fetch_notes(user_id=1, limit=1, offset=1) or []
+    assert [n[1] for n in page] == ["Feb"]
+    first = Db.fetch_notes(limit=2) or []
+    assert [n[1] for n in first] == ["Jan", "Feb"]
+    following = Db.fetch_notes(after_id=first[-1][0], limit=2) or []
+    assert [n[1] for n in following] == ["Feb other", "Mar"]
+
+
+def test_fetch_messages_conversation(temp_db) -> None:
+    """
+    Tests that fetch_messages returns only the conversation of two users in both directions.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_message("a->b", "a", "b")
+    Db.insert_message("b->a", "b", "a")
+    Db.insert_message("a->c", "a", "c")
+    Db.insert_message("c->b", "c", "b")
+    conversation = Db.fetch_messages(user_uuid="a", peer_uuid="b") or []
+    assert [m[1] for m in conversation] == ["a->b", "b->a"]
+    assert [m[1] for m in Db.fetch_messages(user_uuid="a") or []] == ["a->b", "b->a", "a->c"]
+    assert [m[1] for m in Db.fetch_messages(user_uuid="a", limit=1) or []] == ["a->b"]
+    assert len(Db.fetch_messages() or []) == 4
+
+
+def test_fetch_notifications_filters(temp_db) -> None:
+    """
+    Tests read state, type and due time filters of fetch_notifications.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_notifications_bulk(
+        [
+            ("1", "A", 1, 0, "2025-01-01 10:00:00"),
+            ("1", "B", 2, 1, "2025-01-02 10:00:00"),
+            ("1", "C", 2, 0, "2025-01-03 10:00:00"),
+        ]
+    )
+    assert [n[2] for n in Db.fetch_notifications(is_read=False) or []] == ["A", "C"]
+    assert [n[2] for n in Db.fetch_notifications(notification_type=2) or []] == ["B", "C"]
+    assert [n[2] for n in Db.fetch_notifications(is_read=False, due_before=datetime(2025, 1, 2)) or []] == ["A"]
+
+
+def test_fetch_grades_filters(temp_db) -> None:
+    """
+    Tests subject and user filters of fetch_grades.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_subjects_bulk([("Math", 5), ("Physics", 4)])
+    Db.insert_grades_bulk([(4.0, 1.0, 1, 1, 1, 1), (5.0, 2.0, 2, 1, 2, 1), (3.0, 1.0, 1, 1, 2, 2)])
+    assert Db.fetch_grades(subject_id=2) == [(5.0, "Physics", 4, 2.0, 2, 2), (3.0, "Physics", 4, 1.0, 1, 3)]
+    assert Db.fetch_grades(user_id=2) == [(3.0, "Physics", 4, 1.0, 1, 3)]
+
+
+def test_fetch_user_by_uuid(temp_db) -> None:
+    """
+    Tests fetching a user by uuid.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_users("User", "uuid-1", "hash")
+    assert Db.fetch_user_by_uuid("uuid-1") == (1, "User", "uuid-1", "hash")
+    assert Db.fetch_user_by_uuid("missing") is None
+
+
+@pytest.fixture
+def message_queue(monkeypatch: pytest.MonkeyPatch) -> queue.Queue:
+    """
+    Fixture that gives Client a fresh bounded message queue.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: queue used by Client.
+    """
+    msg_queue: queue.Queue = queue.Queue(maxsize=100)
+    monkeypatch.setattr(Client, "msg_queue", msg_queue)
+    return msg_queue
+
+
+def _received(count: int) -> list[dict]:
+    """
+    Builds messages shaped like the ones received by Client.
+    :param count: number of messages.
+    :return: list of messages.
+    """
+    return [{"name": "A", "sender": "A", "recipient": "B", "msg": f"msg {i}", "seq": i + 1} for i in range(count)]
+
+
+def test_dequeue_messages_without_writer(temp_db, message_queue) -> None:
+    """
+    Tests that dequeue_messages saves queued messages in order when no writer is running.
+    :param temp_db: temporary database path.
+    :param message_queue: Client message queue.
+    :return: Nothing, only provides test.
+    """
+    for message in _received(5):
+        message_queue.put(message)
+    Db.dequeue_messages()
+    assert message_queue.empty()
+    assert [row[1] for row in Db.fetch_messages() or []] == [f"msg {i}" for i in range(5)]
+
+
+def test_insert_received_messages_sets_row_ids(temp_db) -> None:
+    """
+    Tests that saved messages are given the ids of their rows.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_message("sent", "B", "A")
+    received = _received(3)
+    assert Db.insert_received_messages(received)
+    assert [result["id"] for result in received] == [row[0] for row in (Db.fetch_messages() or [])[1:]]
+
+
+def test_request_message_flush_does_not_wait(temp_db, message_queue) -> None:
+    """
+    Tests that requesting a flush returns at once with an event the writer sets after saving earlier messages.
+    :param temp_db: temporary database path.
+    :param message_queue: Client message queue.
+    :return: Nothing, only provides test.
+    """
+    for message in _received(3):
+        message_queue.put(message)
+    Db.start_message_writer()
+    try:
+        flushed = Db.request_message_flush()
+        assert flushed.wait(5)
+        assert [row[1] for row in Db.fetch_messages() or []] == [f"msg {i}" for i in range(3)]
+    finally:
+        Db.stop_message_writer()
+
+    assert Db.request_message_flush().is_set()
+
+
+def test_message_writer_saves_batches(temp_db, message_queue, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that the background writer saves more messages than fit into the bounded queue,
+    in order and in batches, and that dequeue_messages waits for it.
+    :param temp_db: temporary database path.
+    :param message_queue: Client message queue.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: Nothing, only provides test.
+    """
+    monkeypatch.setattr(Db, "message_batch_size", 40)
+    batches: list[int] = []
+    insert_received_messages = Db.insert_received_messages
+
+    def recording_insert(results: list[dict]) -> bool:
+        batches.append(len(results))
+        return insert_received_messages(results)
+
+    monkeypatch.setattr(Db, "insert_received_messages", recording_insert)
+
+    Db.start_message_writer()
+    try:
+        for message in _received(500):
+            message_queue.put(message)
+        Db.dequeue_messages()
+        assert [row[1] for row in Db.fetch_messages() or []] == [f"msg {i}" for i in range(500)]
+        assert sum(batches) == 500 and max(batches) <= 40
+    finally:
+        Db.stop_message_writer()
+    assert Db._writer_thread is None
+
+
+def test_fetch_conversation_pages(temp_db) -> None:
+    """
+    Tests keyset pagination of fetch_conversation in both directions of a conversation.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_messages_bulk(
+        [(f"m{i}", "a" if i % 2 else "b", "b" if i % 2 else "a") for i in range(10)] + [("other", "a", "c")]
+    )
+    newest = Db.fetch_conversation("a", "b", limit=4) or []
+    assert [m[1] for m in newest] == ["m6", "m7", "m8", "m9"]
+    older = Db.fetch_conversation("b", "a", before_id=newest[0][0], limit=4) or []
+    assert [m[1] for m in older] == ["m2", "m3", "m4", "m5"]
+    oldest = Db.fetch_conversation("a", "b", before_id=older[0][0], limit=4) or []
+    assert [m[1] for m in oldest] == ["m0", "m1"]
+    assert [m[1] for m in Db.fetch_conversation("a", "c") or []] == ["other"]
+
+
+def test_insert_returns_row_id(temp_db) -> None:
+    """
+    Tests that single row inserts return ids of the new rows and None on failure.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    assert Db.insert_subject("Math", 5) == 1
+    assert Db.insert_subject("Physics", 4) == 2
+    note_id = Db.insert_note("T", "C", "2025-01-01 10:00", 1, datetime(2025, 1, 1), "red")
+    assert [n[0] for n in Db.fetch_notes() or []] == [note_id]
+    notification_id = Db.insert_notification("1", "Msg", 1, 0, "2025-01-01 10:00:00")
+    assert [n[0] for n in Db.fetch_notifications() or []] == [notification_id]
+
+    Db.get_connection().execute("DROP TABLE subjects")
+    assert Db.insert_subject("Chemistry", 3) is None
+
+
+def test_insert_notifications_returning_ids(temp_db) -> None:
+    """
+    Tests that bulk inserted notifications get their ids returned in input order.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_notification("1", "First", 1, 0, "2025-01-01 10:00:00")
+    ids = Db.insert_notifications_returning_ids([("1", f"Msg {i}", 2, 0, "2025-01-02 10:00:00") for i in range(5)])
+    assert ids is not None
+    rows = Db.fetch_notifications(notification_type=2) or []
+    assert [(row[0], row[2]) for row in rows] == [(i, f"Msg {n}") for n, i in enumerate(ids)]
+    assert Db.insert_notifications_returning_ids([]) == []
+
+
+def test_bulk_notification_statements(temp_db) -> None:
+    """
+    Tests set based marking and deleting of notifications.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_notifications_bulk(
+        [
+            ("1", "A", 1, 0, "2025-01-01 10:00:00"),
+            ("1", "B", 2, 0, "2025-01-02 10:00:00"),
+            ("1", "C", 2, 1, "2025-01-03 10:00:00"),
+            ("1", "D", 1, 0, "2025-01-04 10:00:00"),
+        ]
+    )
+    assert Db.mark_notifications_read(notification_type=2) == 1
+    assert Db.mark_notifications_read(notification_ids=[1, 2]) == 1
+    assert [n[2] for n in Db.fetch_notifications(is_read=False) or []] == ["D"]
+
+    assert Db.delete_notifications(is_read=True, older_than="2025-01-03 10:00:00") == 2
+    assert [n[2] for n in Db.fetch_notifications() or []] == ["C", "D"]
+    assert Db.delete_notifications() is None
+    assert Db.mark_notifications_read() == 1
+    assert Db.fetch_notifications(is_read=False) == []
+
+
+def test_notification_ids_filter_is_not_limited_by_variables(temp_db) -> None:
+    """
+    Tests that the ids filter passes any number of ids as a single parameter and matches rows stored
+    with unpadded dates, which text comparisons on associated_time would miss.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    ids = Db.insert_notifications_returning_ids([("1", f"M{i}", 1, 1, "2025-1-5 10:00:00") for i in range(40_000)])
+    assert ids is not None
+    assert Db.delete_notifications(older_than="2025-03-01 00:00:00") == 0
+    assert Db.delete_notifications(notification_ids=ids[::2]) == 20_000
+    assert Db.mark_notifications_read(notification_ids=ids) == 0
+    assert len(Db.fetch_notifications() or []) == 20_000
@@ -11,6 +11,18 @@ from app.backend.database import Db
 from app.backend.grade_monitor import Grade, GradeMonitor, GradeType, Subject, initiate_grade_monitor
 
 
+@pytest.fixture(autouse=True, params=GradeMonitor.backends)
+def statistics_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """
+    Runs every test with each statistics backend of GradeMonitor.
+    :param request: pytest request holding the backend name.
+    :param monkeypatch: pytest monkeypatch fixture.
+    :return: Name of the backend used.
+    """
+    monkeypatch.setattr(GradeMonitor, "default_backend", request.param)
+    return request.param
+
+
 @pytest.fixture
 def sample_grades() -> list[tuple[float, str, int, float, int, int]]:
     """
@@ -262,3 +274,130 @@ def test_initiate_grade_monitor_type_error() -> None:
         assert monitor is None
         monitor = initiate_grade_monitor()
         assert monitor is None
+
+
+def _assert_same_statistics(monitor: GradeMonitor, expected: GradeMonitor) -> None:
+    """
+    Helper comparing statistics of an incrementally updated monitor with a freshly built one.
+    :param monitor: incrementally updated monitor.
+    :param expected: monitor built from scratch.
+    :return: Nothing, only asserts.
+    """
+    assert sorted(s.name for s in monitor.subject_table) == sorted(s.name for s in expected.subject_table)
+    for subject in expected.subject_table:
+        assert monitor.calculate_subject_average(subject.name) == pytest.approx(
+            expected.calculate_subject_average(subject.name)
+        )
+        actual_types = monitor.calculate_subject_type_average(subject.name)
+        expected_types = expected.calculate_subject_type_average(subject.name)
+        assert actual_types.keys() == expected_types.keys()
+        for tp, (average, weight) in expected_types.items():
+            assert actual_types[tp][0] == pytest.approx(average)
+            assert actual_types[tp][1] == weight
+    assert monitor.calculate_total_grade_average() == pytest.approx(expected.calculate_total_grade_average())
+    assert monitor.grade_counts() == expected.grade_counts()
+
+
+def test_add_grade_updates_averages(sample_grades) -> None:
+    """
+    Tests that add_grade gives the same statistics as rebuilding the monitor.
+    :param sample_grades: sample grades data for testing.
+    :return: Nothing, only provides test.
+    """
+    monitor = GradeMonitor(sample_grades)
+    monitor.add_grade(4, 3.0, "Math", 5, 1.0, 2)
+    monitor.add_grade(5, 5.0, "Biology", 2, 1.0, 3)
+    expected = GradeMonitor(sample_grades + [(3.0, "Math", 5, 1.0, 2, 4), (5.0, "Biology", 2, 1.0, 3, 5)])
+    _assert_same_statistics(monitor, expected)
+    assert GradeType.CW in monitor.subjects["Biology"].grade_types
+
+
+def test_update_grade_updates_averages(sample_grades) -> None:
+    """
+    Tests that update_grade gives the same statistics as rebuilding the monitor.
+    :param sample_grades: sample grades data for testing.
+    :return: Nothing, only provides test.
+    """
+    monitor = GradeMonitor(sample_grades)
+    monitor.update_grade(1, value=2.0, weight=3.0)
+    monitor.update_grade(3, grade_type=1)
+    expected = GradeMonitor(
+        [
+            (4.0, "Math", 5, 1, 2, 0),
+            (2.0, "Math", 5, 3, 1, 1),
+            (3.0, "Physics", 4, 1, 1, 2),
+            (4.0, "Physics", 4, 2, 1, 3),
+        ]
+    )
+    _assert_same_statistics(monitor, expected)
+    assert monitor.update_grade(99, value=5.0) is None
+
+
+def test_remove_grade_updates_averages(sample_grades) -> None:
+    """
+    Tests that remove_grade gives the same statistics as rebuilding the monitor
+    and drops subjects left without grades.
+    :param sample_grades: sample grades data for testing.
+    :return: Nothing, only provides test.
+    """
+    monitor = GradeMonitor(sample_grades)
+    removed = monitor.remove_grade(0)
+    assert removed is not None and removed.value == 4.0
+    _assert_same_statistics(monitor, GradeMonitor(sample_grades[1:]))
+    assert monitor.subjects["Math"].grade_types == [GradeType.WYK]
+
+    monitor.remove_grade(2)
+    monitor.remove_grade(3)
+    assert [s.name for s in monitor.subject_table] == ["Math"]
+    assert monitor.remove_grade(2) is None
+
+
+@pytest.mark.parametrize("ignore_ects", [False, True])
+def test_numpy_backend_matches_object_backend(ignore_ects: bool) -> None:
+    """
+    Tests that the numpy backend gives exactly the same results as the object backend on random data.
+    :param ignore_ects: whether the monitors ignore ects values.
+    :return: Nothing, only provides test.
+    """
+    rng = np.random.default_rng(6)
+    values = [2.0, 3.0, 3.5, 4.0, 4.5, 5.0]
+    grades = []
+    for grade_id in range(500):
+        subject_number = int(rng.integers(12))
+        grades.append(
+            (
+                float(rng.choice(values)),
+                f"Subject {subject_number}",
+                subject_number % 7 + 1,
+                float(rng.integers(1, 4)),
+                int(rng.integers(1, 5)),
+                grade_id,
+            )
+        )
+    reference = GradeMonitor(grades, ignore_ects, backend="object")
+    monitor = GradeMonitor(grades, ignore_ects, backend="numpy")
+
+    assert monitor.subjects_averages() == reference.subjects_averages()
+    assert monitor.calculate_total_grade_average() == reference.calculate_total_grade_average()
+    for subject in reference.subject_table:
+        assert monitor.calculate_subject_type_average(subject.name) == pytest.approx(
+            reference.calculate_subject_type_average(subject.name)
+        )
+        assert list(monitor.calculate_subject_type_average(subject.name)) == list(
+            reference.calculate_subject_type_average(subject.name)
+        )
+    assert monitor.grade_counts() == reference.grade_counts()
+    assert monitor.grade_counts(["Subject 1", "Subject 2"]) == reference.grade_counts(["Subject 1", "Subject 2"])
+
+    monitor.remove_grade(0)
+    reference.remove_grade(0)
+    assert monitor.subjects_averages() == reference.subjects_averages()
+
+
+def test_unknown_backend() -> None:
+    """
+    Tests that an unknown statistics backend is rejected.
+    :return: Nothing, only provides test.
+    """
+    with pytest.raises(ValueError):
+        GradeMonitor([], backend="gpu")
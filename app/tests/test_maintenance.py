@@ -0,0 +1,106 @@
+"""
+File contains tests for maintenance file.
+"""
+
+import queue
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import MagicMock
+
+from app.backend.database import Db
+from app.backend.maintenance import MaintenanceJob, RetentionPolicy
+from app.backend.notifications import NotificationManager
+
+
+@pytest.fixture
+def maintenance_state(monkeypatch):
+    """
+    Fixture that isolates class level state of MaintenanceJob.
+    :return: yields nothing
+    """
+    monkeypatch.setattr(MaintenanceJob, "policy", RetentionPolicy())
+    monkeypatch.setattr(MaintenanceJob, "last_run", None)
+    monkeypatch.setattr(MaintenanceJob, "last_activity", time.monotonic())
+    monkeypatch.setattr(MaintenanceJob, "notification_cutoffs", None)
+    yield
+
+
+def test_retention_policy_cutoff() -> None:
+    """
+    Tests the cutoff date of read notifications and disabling it.
+    :return: Nothing, only provides test.
+    """
+    now = datetime(2026, 4, 1, 12, 0)
+    assert RetentionPolicy(read_notification_days=30).notifications_cutoff(now) == datetime(2026, 3, 2, 12, 0)
+    assert RetentionPolicy(read_notification_days=None).notifications_cutoff(now) is None
+
+
+def test_prune_messages_keeps_newest_per_conversation(temp_db) -> None:
+    """
+    Tests that pruning keeps the newest messages of each conversation regardless of direction.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    Db.insert_messages_bulk([(f"ab{i}", "a", "b") if i % 2 else (f"ba{i}", "b", "a") for i in range(6)])
+    Db.insert_messages_bulk([(f"ac{i}", "a", "c") for i in range(2)])
+
+    assert Db.prune_messages(3) == 3
+    assert [m[1] for m in Db.fetch_messages() or []] == ["ab3", "ba4", "ab5", "ac0", "ac1"]
+
+
+def test_maintenance_run_once(temp_db, maintenance_state) -> None:
+    """
+    Tests that a maintenance run applies the retention policy and compacts the database.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    old = (datetime.now() - timedelta(days=200)).strftime("%Y-%m-%d %H:%M:%S")
+    recent = (datetime.now() - timedelta(days=2)).strftime("%Y-%m-%d %H:%M:%S")
+    Db.insert_notifications_bulk(
+        [("1", "old read", 1, 1, old), ("1", "old unread", 1, 0, old), ("1", "recent read", 1, 1, recent)]
+    )
+    Db.insert_messages_bulk([(f"m{i}", "a", "b") for i in range(5)])
+    MaintenanceJob.policy = RetentionPolicy(read_notification_days=90, messages_per_conversation=2)
+
+    assert MaintenanceJob.run_once() == {"notifications": 1, "messages": 3}
+    assert [n[2] for n in Db.fetch_notifications() or []] == ["old unread", "recent read"]
+    assert [m[1] for m in Db.fetch_messages() or []] == ["m3", "m4"]
+    assert MaintenanceJob.last_run is not None
+
+
+def test_maintenance_hands_notification_cutoff_to_queue(temp_db, maintenance_state) -> None:
+    """
+    Tests that with a cutoff queue set the job leaves deleting read notifications to the notification manager.
+    :param temp_db: temporary database path.
+    :return: Nothing, only provides test.
+    """
+    old = (datetime.now() - timedelta(days=200)).strftime("%Y-%m-%d %H:%M:%S")
+    Db.insert_notifications_bulk([("1", "old read", 1, 1, old)])
+    MaintenanceJob.notification_cutoffs = queue.SimpleQueue()
+    manager = NotificationManager(Db.fetch_notifications() or [], MagicMock())
+
+    assert MaintenanceJob.run_once()["notifications"] == 0
+    assert [n[2] for n in Db.fetch_notifications() or []] == ["old read"]
+
+    assert manager.delete_read_older_than(MaintenanceJob.notification_cutoffs.get_nowait()) == 1
+    assert manager.notifications == []
+    assert Db.fetch_notifications() == []
+
+
+def test_maintenance_waits_for_idle_and_interval(maintenance_state) -> None:
+    """
+    Tests that maintenance is due only after the user is idle and the interval since the last run has passed.
+    :return: Nothing, only provides test.
+    """
+    MaintenanceJob.note_activity()
+    assert MaintenanceJob.is_due() is False
+
+    MaintenanceJob.last_activity = time.monotonic() - MaintenanceJob.idle_after
+    assert MaintenanceJob.is_due() is True
+
+    MaintenanceJob.last_run = time.monotonic()
+    assert MaintenanceJob.is_due() is False
+    MaintenanceJob.last_run = time.monotonic() - MaintenanceJob.interval
+    assert MaintenanceJob.is_due() is True
@@ -7,7 +7,7 @@ from unittest.mock import patch
 from datetime import datetime
 
 from app.backend.database import Db
-from app.backend.notes import Note, NoteManager, initiate_note_manager
+from app.backend.notes import Note, NoteCache, NoteManager, initiate_note_manager
 
 
 def test_note_creation_defaults() -> None:
@@ -134,3 +134,93 @@ def test_note_colors_cycling(note_id) -> None:
     colors = ["#ada132", "#2d7523", "#1e6a6e"]
     note = Note(id=note_id, user_id=0, title="T", content="C")
     assert note.color == colors[note_id % len(colors)]
+
+
+def test_note_from_rows_keeps_stored_fields() -> None:
+    """
+    Tests that Note.from_rows keeps creation date from the database and parses the associated date.
+    :return: Nothing, only provides test.
+    """
+    rows = [
+        (1, "A", "a", "2025-01-01 10:00", 1, "2025-02-03 04:05:06", "#111111"),
+        (2, "B", "b", "2025-01-02 11:00", 1, "2025-2-3 04:05:06", ""),
+    ]
+    notes = Note.from_rows(rows)
+    assert [note.created_at for note in notes] == ["2025-01-01 10:00", "2025-01-02 11:00"]
+    assert notes[0].associated_date == datetime(2025, 2, 3, 4, 5, 6)
+    assert notes[1].associated_date == datetime(2025, 2, 3, 4, 5, 6)
+    assert notes[1].color == Note.default_colors[2 % len(Note.default_colors)]
+    with pytest.raises(AttributeError):
+        notes[0].extra = 1  # type: ignore[attr-defined]
+
+
+@pytest.fixture
+def empty_note_cache():
+    """
+    Fixture that clears NoteCache before and after a test.
+    :return: yields nothing
+    """
+    NoteCache.invalidate()
+    yield
+    NoteCache.invalidate()
+
+
+def test_note_cache_reads_month_once(mock_fetch_notes, empty_note_cache) -> None:
+    """
+    Tests that NoteCache queries a month by date range once, indexes it by day and serves repeated reads from memory.
+    :return: Nothing, only provides test.
+    """
+    mock_fetch_notes.return_value = [
+        (1, "A", "a", "2025-01-01 10:00", 1, "2025-12-03 10:00:00", ""),
+        (2, "B", "b", "2025-01-01 10:00", 1, "2025-12-31 23:59:59", ""),
+        (3, "C", "c", "2025-01-01 10:00", 1, "2025-12-03 08:00:00", ""),
+    ]
+    days = NoteCache.get_month(2025, 12)
+    assert {day: [note.id for note in notes] for day, notes in days.items()} == {3: [1, 3], 31: [2]}
+    mock_fetch_notes.assert_called_once_with(date_from=datetime(2025, 12, 1), date_to=datetime(2026, 1, 1))
+
+    assert [note.id for note in NoteCache.get_notes(2025, 12)] == [1, 3, 2]
+    assert mock_fetch_notes.call_count == 1
+
+
+def test_note_cache_invalidate(mock_fetch_notes, empty_note_cache) -> None:
+    """
+    Tests that invalidating a month or the whole cache makes the next read query the database again.
+    :return: Nothing, only provides test.
+    """
+    mock_fetch_notes.return_value = []
+    NoteCache.get_month(2025, 1)
+    NoteCache.get_month(2025, 2)
+    NoteCache.invalidate(2025, 1)
+    NoteCache.get_month(2025, 1)
+    NoteCache.get_month(2025, 2)
+    assert mock_fetch_notes.call_count == 3
+
+    NoteCache.invalidate()
+    NoteCache.get_month(2025, 2)
+    assert mock_fetch_notes.call_count == 4
+
+
+def test_note_cache_does_not_keep_failed_reads(mock_fetch_notes, empty_note_cache) -> None:
+    """
+    Tests that a failed database read returns no notes and is not cached.
+    :return: Nothing, only provides test.
+    """
+    mock_fetch_notes.return_value = None
+    assert NoteCache.get_month(2025, 5) == {}
+    assert (2025, 5) not in NoteCache.months
+
+
+def test_note_cache_add(mock_fetch_notes, empty_note_cache) -> None:
+    """
+    Tests that a new note is added to its cached month and ignored when the month is not cached.
+    :return: Nothing, only provides test.
+    """
+    mock_fetch_notes.return_value = []
+    NoteCache.get_month(2025, 3)
+    NoteCache.add(Note(5, 1, "T", "C", "red", datetime(2025, 3, 9)))
+    NoteCache.add(Note(6, 1, "T", "C", "red", datetime(2025, 4, 9)))
+
+    assert [note.id for note in NoteCache.get_month(2025, 3)[9]] == [5]
+    assert (2025, 4) not in NoteCache.months
+    assert mock_fetch_notes.call_count == 1
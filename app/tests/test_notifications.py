@@ -2,8 +2,10 @@
 File contains tests for notifications module.
 """
 
+import heapq
 import pytest
 from unittest.mock import patch
+from datetime import datetime, timedelta
 
 from app.backend.notifications import (
     Notification,
@@ -28,6 +30,25 @@ class DummyApp:
         return None
 
 
+class TimerApp:
+    """
+    Dummy application recording timers armed by NotificationManager.
+    """
+
+    def __init__(self) -> None:
+        self.timers: dict[str | None, int] = {}
+        self.counter = 0
+
+    def after(self, ms, _func):
+        self.counter += 1
+        timer_id = f"after#{self.counter}"
+        self.timers[timer_id] = ms
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+
 def test_mark_as_read() -> None:
     """
     Tests the mark_as_read method of Notification.
@@ -122,3 +143,376 @@ def test_initiate_notification_manager_returns_manager() -> None:
     assert isinstance(mgr, NotificationManager)
     assert len(mgr.notifications) == 2
     assert all(isinstance(n, Notification) for n in mgr.notifications)
+
+
+def test_notification_from_rows_invalid_date() -> None:
+    """
+    Tests that Notification.from_rows falls back to a default time for invalid dates.
+    :return: Nothing, only provides test.
+    """
+    notifications = Notification.from_rows(
+        [
+            (1, "1", "A", 1, 0, "2025-12-04 12:00:00"),
+            (2, "1", "B", 2, 1, "not a date"),
+        ]
+    )
+    assert notifications[0].associated_time == datetime(2025, 12, 4, 12)
+    assert notifications[1].associated_time == Notification.fallback_time
+    assert notifications[1].is_read is True
+
+
+def _timer_rows() -> list[tuple[int, str, str, int, int, str]]:
+    """
+    Provides notification rows with one due, one future and one read notification.
+    :return: List of notification rows.
+    """
+    due = (datetime.now() - timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M:%S")
+    later = (datetime.now() + timedelta(seconds=30)).strftime("%Y-%m-%d %H:%M:%S")
+    return [
+        (1, "1", "due", 1, 0, due),
+        (2, "1", "later", 1, 0, later),
+        (3, "1", "read", 1, 1, due),
+    ]
+
+
+def test_scheduler_arms_single_timer_for_next_notification() -> None:
+    """
+    Tests that due notifications are shown and one timer is armed for the next one.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    with patch.object(NotificationManager, "show_notification", return_value=True) as show:
+        with patch.object(Db, "mark_notifications_read") as update:
+            mgr = NotificationManager(_timer_rows(), app)
+
+    assert [call.args[0].id for call in show.call_args_list] == [1]
+    update.assert_called_once_with(notification_ids=[1])
+    assert mgr.notifications[0].is_read is True
+    assert len(app.timers) == 1
+    assert 0 < app.timers[mgr.check_id] <= 30_001
+
+
+def test_scheduler_without_pending_notifications_is_idle() -> None:
+    """
+    Tests that no timer is armed when nothing is scheduled and that stop_checking prevents re-arming.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    mgr = NotificationManager([(3, "1", "read", 1, 1, "2025-12-04 12:00:00")], app)
+    assert app.timers == {}
+
+    mgr.stop_checking()
+    mgr.schedule_notification(Notification(4, "1", "new", 1, False, datetime.now() + timedelta(hours=1)))
+    assert app.timers == {}
+
+
+def test_scheduler_rearms_on_add_and_delete() -> None:
+    """
+    Tests that adding an earlier notification and deleting the next one re-arm the timer.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    with patch.object(NotificationManager, "show_notification", return_value=True):
+        with patch.object(Db, "mark_notifications_read"):
+            mgr = NotificationManager(_timer_rows()[1:], app)
+    assert 0 < app.timers[mgr.check_id] <= 30_001
+
+    sooner = Notification(4, "1", "sooner", 1, False, datetime.now() + timedelta(seconds=5))
+    mgr.register(sooner)
+    mgr.schedule_notification(sooner)
+    assert len(app.timers) == 1
+    assert app.timers[mgr.check_id] <= 5_001
+
+    with patch.object(Db, "delete_notification"):
+        mgr.delete_notification(4)
+    assert len(app.timers) == 1
+    assert 5_001 < app.timers[mgr.check_id] <= 30_001
+
+    with patch.object(Db, "delete_notification"):
+        mgr.delete_notification(2)
+    assert app.timers == {}
+
+
+def test_due_notifications_wait_while_popup_is_busy() -> None:
+    """
+    Tests that a due notification waits in the pop-up queue without polling while a popup is displayed.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    with patch.object(NotificationManager, "show_notification", return_value=False):
+        mgr = NotificationManager(_timer_rows(), app)
+
+    assert mgr.notifications[0].is_read is False
+    assert [notification.id for notification in mgr.pending_popups] == [1]
+    assert len(app.timers) == 1
+    assert 0 < app.timers[mgr.check_id] <= 30_001
+
+
+def _advance_schedule(mgr: NotificationManager, seconds: float) -> None:
+    """
+    Moves every scheduled notification closer to now, as if the given time had passed.
+    :param mgr: Notification manager
+    :param seconds: Number of seconds
+    :return: Nothing.
+    """
+    mgr.schedule = [(due - timedelta(seconds=seconds), order, n) for due, order, n in mgr.schedule]
+    heapq.heapify(mgr.schedule)
+
+
+def test_deleted_notification_stays_cancelled_when_id_is_reused() -> None:
+    """
+    Tests that a new notification reusing the id of a deleted one neither revives the deleted one
+    nor gets marked read in its place.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    soon = (datetime.now() + timedelta(seconds=1)).strftime("%Y-%m-%d %H:%M:%S")
+    later = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d %H:%M:%S")
+    mgr = NotificationManager([(1, "1", "A", 1, 0, soon), (2, "1", "B", 1, 0, soon)], app)
+    with patch.object(Db, "delete_notification"), patch.object(Db, "insert_notification", return_value=2):
+        mgr.delete_notification(2)
+        reused = mgr.add_notification("C", 1, later)
+
+    _advance_schedule(mgr, 2)
+    with patch.object(NotificationManager, "show_notification", return_value=True) as show:
+        with patch.object(Db, "mark_notifications_read") as update:
+            mgr.check_notifications()
+
+    assert [call.args[0].message for call in show.call_args_list] == ["A"]
+    update.assert_called_once_with(notification_ids=[1])
+    assert reused is not None and not reused.is_read
+    assert [entry[2] for entry in mgr.schedule] == [reused]
+    assert 0 < app.timers[mgr.check_id] <= mgr.max_wait_ms
+
+
+def test_bulk_add_does_not_revive_deleted_notification() -> None:
+    """
+    Tests that notifications added in bulk with reused ids leave the deleted ones cancelled.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    soon = (datetime.now() + timedelta(seconds=1)).strftime("%Y-%m-%d %H:%M:%S")
+    later = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d %H:%M:%S")
+    mgr = NotificationManager([(1, "1", "A", 1, 0, soon), (2, "1", "B", 1, 0, soon)], app)
+    with patch.object(Db, "delete_notification"), patch.object(
+        Db, "insert_notifications_returning_ids", return_value=[2, 3]
+    ):
+        mgr.delete_notification(2)
+        added = mgr.add_notifications([("C", 1, later), ("D", 1, later)])
+
+    _advance_schedule(mgr, 2)
+    with patch.object(NotificationManager, "show_notification", return_value=True) as show:
+        with patch.object(Db, "mark_notifications_read") as update:
+            mgr.check_notifications()
+
+    assert [call.args[0].message for call in show.call_args_list] == ["A"]
+    update.assert_called_once_with(notification_ids=[1])
+    assert sorted(entry[2].message for entry in mgr.schedule) == ["C", "D"]
+    assert not any(notification.is_read for notification in added)
+
+
+def _due_rows(count: int) -> list[tuple[int, str, str, int, int, str]]:
+    """
+    Provides rows of notifications which are all due.
+    :param count: Number of rows
+    :return: List of notification rows.
+    """
+    due = (datetime.now() - timedelta(days=2)).strftime("%Y-%m-%d %H:%M:%S")
+    return [(i, "1", f"reminder {i}", 2, 0, due) for i in range(1, count + 1)]
+
+
+def test_many_due_notifications_are_batched() -> None:
+    """
+    Tests that hundreds of due notifications are shown as one summary popup and marked read in one pass.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    with patch.object(NotificationManager, "show_popup", return_value=True) as show:
+        with patch.object(Db, "mark_notifications_read") as update:
+            mgr = NotificationManager(_due_rows(300), app)
+
+    show.assert_called_once()
+    text = show.call_args.args[0]
+    assert text.splitlines()[0] == "300 reminders due"
+    assert text.splitlines()[-1] == f"and {300 - mgr.batch_preview} more"
+    update.assert_called_once_with(notification_ids=list(range(1, 301)))
+    assert all(notification.is_read for notification in mgr.notifications)
+    assert not mgr.pending_popups
+    assert app.timers == {}
+
+
+def test_popups_are_rate_limited() -> None:
+    """
+    Tests that a popup following the previous one too soon is delayed and shown by the rate limiting timer.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    with patch.object(NotificationManager, "show_popup", return_value=True) as show:
+        with patch.object(Db, "mark_notifications_read"):
+            mgr = NotificationManager(_due_rows(1), app)
+            assert show.call_count == 1
+
+            following = Notification(2, "1", "next", 1, False, datetime.now())
+            mgr.register(following)
+            mgr.pending_popups.append(following)
+            mgr.display_pending()
+            assert show.call_count == 1
+            assert 0 < app.timers[mgr.popup_id] <= mgr.min_popup_interval_ms + 1
+
+            mgr.last_popup_time = None
+            mgr._popup_timer()
+            assert show.call_count == 2
+            assert mgr.popup_id is None
+            assert mgr.notifications[0].is_read is True
+
+
+def test_pending_popups_skip_deleted_and_read() -> None:
+    """
+    Tests that queued notifications deleted or read before display are not shown.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    with patch.object(NotificationManager, "show_popup", return_value=False):
+        mgr = NotificationManager(_due_rows(3), app)
+    assert len(mgr.pending_popups) == 3
+
+    with patch.object(Db, "delete_notification"), patch.object(Db, "mark_notifications_read"):
+        mgr.delete_notification(1)
+        mgr.mark_as_read(2)
+        with patch.object(NotificationManager, "show_notification", return_value=True) as show:
+            mgr.display_pending()
+
+    assert [call.args[0].id for call in show.call_args_list] == [3]
+
+
+def test_batch_skips_deleted_notification_with_reused_id() -> None:
+    """
+    Tests that a deleted notification whose id is reused by a new one is not part of the next batch.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    soon = (datetime.now() + timedelta(seconds=1)).strftime("%Y-%m-%d %H:%M:%S")
+    later = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d %H:%M:%S")
+    rows = [(1, "1", "first", 1, 0, soon), (2, "1", "second", 1, 0, soon), (3, "1", "DELETED reminder", 1, 0, soon)]
+    mgr = NotificationManager(rows, app)
+    with patch.object(Db, "delete_notification"), patch.object(Db, "insert_notification", return_value=3):
+        mgr.delete_notification(3)
+        reused = mgr.add_notification("reused", 1, later)
+
+    _advance_schedule(mgr, 2)
+    with patch.object(NotificationManager, "show_popup", return_value=True) as show:
+        with patch.object(Db, "mark_notifications_read") as update:
+            mgr.check_notifications()
+
+    assert show.call_args.args[0] == "2 reminders due\n- first\n- second"
+    update.assert_called_once_with(notification_ids=[1, 2])
+    assert reused is not None and mgr.unread == {3: reused}
+
+
+def test_notification_indexes() -> None:
+    """
+    Tests that lookups and filters use the id, type and unread indexes and stay consistent after changes.
+    :return: Nothing, only provides test.
+    """
+    rows = [
+        (1, "1", "a", NotificationType.INFO.value, 0, "2025-12-04 12:00:00"),
+        (2, "1", "b", NotificationType.ALERT.value, 0, "2025-12-04 12:00:00"),
+        (3, "1", "c", NotificationType.INFO.value, 1, "2025-12-04 12:00:00"),
+        (4, "1", "d", NotificationType.INFO.value, 0, "2025-12-04 12:00:00"),
+    ]
+    with patch.object(NotificationManager, "check_notifications"):
+        mgr = NotificationManager(rows, DummyApp())
+
+    found = mgr.get_notification(3)
+    assert found is not None and found.message == "c"
+    assert mgr.get_notification(99) is None
+    assert [n.id for n in mgr.get_notifications(NotificationType.INFO)] == [1, 3, 4]
+    assert [n.id for n in mgr.get_notifications(NotificationType.INFO, unread_only=True)] == [1, 4]
+    assert [n.id for n in mgr.get_notifications(unread_only=True)] == [1, 2, 4]
+
+    with patch.object(Db, "mark_notifications_read"), patch.object(Db, "delete_notification") as delete:
+        mgr.mark_as_read(4)
+        mgr.delete_notification(1)
+        mgr.delete_notification(99)
+
+    delete.assert_called_once_with(1)
+    assert [n.id for n in mgr.notifications] == [2, 3, 4]
+    assert [n.id for n in mgr.get_notifications(NotificationType.INFO)] == [3, 4]
+    assert [n.id for n in mgr.get_unread_notifications()] == [2]
+    assert mgr.get_notifications(NotificationType.WARNING) == []
+
+
+def test_add_notification_does_not_refetch() -> None:
+    """
+    Tests that add_notification builds the notification from the inserted row id without reading the table.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    mgr = NotificationManager([], app)
+    later = (datetime.now() + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S")
+    with patch.object(Db, "insert_notification", return_value=7), patch.object(Db, "fetch_notifications") as fetch:
+        added = mgr.add_notification("hello", NotificationType.REMINDER.value, later)
+
+    fetch.assert_not_called()
+    assert added is not None and added.id == 7
+    assert mgr.get_notification(7) is added
+    assert added.associated_time == datetime.strptime(later, "%Y-%m-%d %H:%M:%S")
+    assert len(app.timers) == 1
+
+    with patch.object(Db, "insert_notification", return_value=None):
+        assert mgr.add_notification("lost", 1, later) is None
+    assert len(mgr.notifications) == 1
+
+
+def test_add_notifications_in_bulk() -> None:
+    """
+    Tests that add_notifications saves all notifications at once and schedules them with a single timer.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    mgr = NotificationManager([], app)
+    times = [(datetime.now() + timedelta(minutes=m)).strftime("%Y-%m-%d %H:%M:%S") for m in (30, 10, 20)]
+    with patch.object(Db, "insert_notifications_returning_ids", return_value=[11, 12, 13]) as insert:
+        added = mgr.add_notifications([(f"reminder {i}", 2, time) for i, time in enumerate(times)])
+
+    insert.assert_called_once_with([("1", f"reminder {i}", 2, 0, time) for i, time in enumerate(times)])
+    assert [n.id for n in added] == [11, 12, 13]
+    assert [n.id for n in mgr.get_unread_notifications()] == [11, 12, 13]
+    assert mgr.schedule[0][2].id == 12
+    assert len(app.timers) == 1
+    assert app.timers[mgr.check_id] == mgr.max_wait_ms
+
+
+def test_mark_all_read_and_delete_read_older_than() -> None:
+    """
+    Tests that bulk operations run one database statement each and update the manager indexes and schedule.
+    :return: Nothing, only provides test.
+    """
+    app = TimerApp()
+    soon = (datetime.now() + timedelta(minutes=5)).strftime("%Y-%m-%d %H:%M:%S")
+    later = (datetime.now() + timedelta(minutes=50)).strftime("%Y-%m-%d %H:%M:%S")
+    rows = [
+        (1, "1", "old read", NotificationType.INFO.value, 1, "2025-01-01 10:00:00"),
+        (2, "1", "new read", NotificationType.INFO.value, 1, "2025-06-01 10:00:00"),
+        (3, "1", "soon", NotificationType.ALERT.value, 0, soon),
+        (4, "1", "later", NotificationType.INFO.value, 0, later),
+    ]
+    mgr = NotificationManager(rows, app)
+    assert mgr.schedule[0][2].id == 3
+
+    with patch.object(Db, "mark_notifications_read", return_value=1) as mark:
+        assert mgr.mark_all_read(NotificationType.ALERT) == 1
+        assert mgr.mark_all_read(NotificationType.WARNING) == 0
+    mark.assert_called_once_with(notification_ids=[3])
+    assert [n.id for n in mgr.get_unread_notifications()] == [4]
+    assert mgr.schedule[0][2].id == 4
+    assert len(app.timers) == 1
+
+    with patch.object(Db, "delete_notifications", return_value=1) as delete:
+        assert mgr.delete_read_older_than(datetime(2025, 3, 1)) == 1
+    delete.assert_called_once_with(notification_ids=[1])
+    assert [n.id for n in mgr.notifications] == [2, 3, 4]
+
+    with patch.object(Db, "mark_notifications_read", return_value=None):
+        assert mgr.mark_all_read() == 0
+    assert [n.id for n in mgr.get_unread_notifications()] == [4]
@@ -0,0 +1,69 @@
+"""
+File contains tests for theme file.
+"""
+
+import pytest
+
+from app.backend.theme import (
+    CHART_COLORS,
+    FALLBACK_NOTE_COLOR,
+    NOTE_COLORS,
+    chart_colors,
+    darken_color,
+    note_color,
+    note_palette,
+)
+
+
+@pytest.mark.parametrize("color_name", list(NOTE_COLORS))
+def test_note_color_known_names(color_name) -> None:
+    """
+    Tests that every palette color name maps to its hex code.
+    :param color_name: Name of the tested color
+    :return: Nothing, only provides test.
+    """
+    assert note_color(color_name) == NOTE_COLORS[color_name]
+
+
+@pytest.mark.parametrize("color_name", ["white", "", "#2d7523"])
+def test_note_color_fallback(color_name) -> None:
+    """
+    Tests that unknown color names fall back to the default note color.
+    :param color_name: Name of the tested color
+    :return: Nothing, only provides test.
+    """
+    assert note_color(color_name) == FALLBACK_NOTE_COLOR
+
+
+def test_darken_color() -> None:
+    """
+    Tests darkening and lightening of hex colors.
+    :return: Nothing, only provides test.
+    """
+    assert darken_color("#FF6B6B") == "#cc5555"
+    assert darken_color("646464", 0.5) == "#323232"
+    assert darken_color("#646464", 1.5) == "#969696"
+
+
+def test_note_palette_is_memoized() -> None:
+    """
+    Tests that note palette returns foreground and hover colors and reuses computed results.
+    :return: Nothing, only provides test.
+    """
+    note_palette.cache_clear()
+    assert note_palette("blue") == (NOTE_COLORS["blue"], darken_color(NOTE_COLORS["blue"]))
+    assert note_palette("blue") is note_palette("blue")
+    assert note_palette.cache_info().hits == 2
+
+
+@pytest.mark.parametrize(
+    "theme, expected", [("dark", CHART_COLORS["dark"]), ("light", CHART_COLORS["light"]), ("x", CHART_COLORS["light"])]
+)
+def test_chart_colors(theme, expected) -> None:
+    """
+    Tests chart colors of each theme.
+    :param theme: Tested theme
+    :param expected: Expected background and text colors
+    :return: Nothing, only provides test.
+    """
+    assert chart_colors(theme) == expected
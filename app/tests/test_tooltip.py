@@ -0,0 +1,102 @@
+"""
+File contains tests for tooltip file.
+"""
+
+import pytest
+
+from app.backend.tooltip import Tooltip, TooltipManager
+
+
+class DummyWidget:
+    """
+    Class imitates the part of a widget used by Tooltip, scheduled callbacks are only recorded.
+    """
+
+    def __init__(self) -> None:
+        self.bindings: dict[str, list] = {}
+        self.timers: dict[str, object] = {}
+        self.timer_counter = 0
+
+    def bind(self, sequence: str, func) -> None:
+        self.bindings.setdefault(sequence, []).append(func)
+
+    def after(self, delay: float, func) -> str:
+        self.timer_counter += 1
+        timer_id = f"after#{self.timer_counter}"
+        self.timers[timer_id] = func
+        return timer_id
+
+    def after_cancel(self, timer_id: str) -> None:
+        self.timers.pop(timer_id, None)
+
+
+@pytest.fixture
+def shown_tooltips(monkeypatch):
+    """
+    Fixture that replaces the shared tooltip window with a list of shown tooltips.
+    :return: yields the list of shown tooltips
+    """
+    shown: list[Tooltip] = []
+
+    def show(tooltip: Tooltip) -> None:
+        shown.append(tooltip)
+        TooltipManager.owner = tooltip
+
+    monkeypatch.setattr(TooltipManager, "show", staticmethod(show))
+    monkeypatch.setattr(TooltipManager, "owner", None)
+    yield shown
+
+
+def test_tooltip_merges_entries(shown_tooltips) -> None:
+    """
+    Tests that one tooltip holds every entry of a widget and skips empty texts.
+    :return: Nothing, only provides test.
+    """
+    widget = DummyWidget()
+    tooltip = Tooltip(widget, "first", "#111111")
+    assert tooltip.entries == [("first", "#111111")]
+    assert len(widget.bindings["<Enter>"]) == 1
+
+    tooltip.set_entries([("a", "#aaaaaa"), ("", "#000000"), ("b", "#bbbbbb")])
+    assert tooltip.entries == [("a", "#aaaaaa"), ("b", "#bbbbbb")]
+    assert tooltip.text == "a"
+    assert tooltip.color == "#aaaaaa"
+
+    tooltip.configure(text="c")
+    assert tooltip.entries == [("c", "#aaaaaa")]
+
+
+def test_tooltip_show_and_hide(shown_tooltips) -> None:
+    """
+    Tests that hovering shows the tooltip after a delay through the shared window and leaving hides it.
+    :return: Nothing, only provides test.
+    """
+    widget = DummyWidget()
+    tooltip = Tooltip(widget, "note")
+    tooltip.on_enter()
+    tooltip.on_enter()
+    assert len(widget.timers) == 1
+
+    next(iter(widget.timers.values()))()  # type: ignore[operator]
+    assert shown_tooltips == [tooltip]
+    assert TooltipManager.owner is tooltip
+
+    other = Tooltip(DummyWidget(), "other")
+    other.on_leave()
+    assert TooltipManager.owner is tooltip
+
+    tooltip.on_leave()
+    assert TooltipManager.owner is None
+    assert tooltip.after_id is None
+
+
+def test_disabled_tooltip_is_not_scheduled(shown_tooltips) -> None:
+    """
+    Tests that a tooltip without text does not schedule showing on hover.
+    :return: Nothing, only provides test.
+    """
+    widget = DummyWidget()
+    tooltip = Tooltip(widget, "")
+    tooltip.on_enter()
+    assert widget.timers == {}
+    assert shown_tooltips == []